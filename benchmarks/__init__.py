@@ -0,0 +1,6 @@
+"""bq2dbtのベンチマーク。
+
+ネットワークに接続せず、合成データセットを返す偽のBigQuery/Lineage APIクライアントで
+`import_views` 全体の処理時間、API呼び出し回数、メモリ使用量を計測します。
+実行方法は `python -m benchmarks.run --help` を参照してください。
+"""
@@ -0,0 +1,720 @@
+"""BigQueryとLineage APIのローカルエミュレーター。
+
+メタデータスナップショット（`bq2dbt snapshot` で保存したファイル）を読み込み、
+bq2dbtが使用するエンドポイントのみを提供します。
+
+- BigQuery (HTTP/REST): jobs.insert、jobs.query、jobs.get、jobs.getQueryResults
+  （INFORMATION_SCHEMAへのクエリのみ）、tables.get、tables.list
+- Lineage (gRPC): SearchLinks
+
+実際の google-cloud-bigquery と datacatalog_lineage_v1 のクライアントを
+接続先の上書き（環境変数 BQ2DBT_BIGQUERY_API_ENDPOINT、BQ2DBT_LINEAGE_API_ENDPOINT）で
+このエミュレーターに向けることで、コネクションプール、リトライ、並列実行を含めた
+負荷試験をネットワークに接続せずに行えます。
+
+使い方:
+    uv run python -m benchmarks.emulator --fixture snapshot.json.gz
+    export BQ2DBT_BIGQUERY_API_ENDPOINT=http://127.0.0.1:9050
+    export BQ2DBT_LINEAGE_API_ENDPOINT=127.0.0.1:9060
+    uv run bq2dbt import views --project-id <project> --dataset <dataset> ...
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import click
+import grpc
+from google.cloud.datacatalog_lineage_v1 import (
+    EntityReference,
+    Link,
+    SearchLinksRequest,
+    SearchLinksResponse,
+)
+
+from bq2dbt.converter.bigquery import ColumnSchema, DatasetCatalog
+from bq2dbt.converter.snapshot import MetadataSnapshot, load_snapshot
+
+# INFORMATION_SCHEMAへのクエリの参照先 (例: `project.dataset.INFORMATION_SCHEMA.TABLES`)
+_INFORMATION_SCHEMA_PATTERN = re.compile(r"`([^`]+)\.INFORMATION_SCHEMA\.(\w+)`")
+
+# INFORMATION_SCHEMAのビュー -> 返すカラム（全てSTRING型）
+_INFORMATION_SCHEMA_COLUMNS = {
+    "TABLES": ("table_schema", "table_name", "table_type"),
+    "VIEWS": ("table_schema", "table_name", "view_definition"),
+    "COLUMN_FIELD_PATHS": (
+        "table_schema",
+        "table_name",
+        "field_path",
+        "data_type",
+        "description",
+        "is_nullable",
+    ),
+    "TABLE_OPTIONS": ("table_schema", "table_name", "option_name", "option_value"),
+}
+
+# INFORMATION_SCHEMA.TABLESのテーブルタイプ -> tables.get / tables.list APIのテーブルタイプ
+_API_TABLE_TYPES = {
+    "BASE TABLE": "TABLE",
+    "MATERIALIZED VIEW": "MATERIALIZED_VIEW",
+}
+
+_LINEAGE_SERVICE = "google.cloud.datacatalog.lineage.v1.Lineage"
+
+# 1ページあたりの件数の既定値
+DEFAULT_QUERY_PAGE_SIZE = 10000
+DEFAULT_TABLES_PAGE_SIZE = 1000
+DEFAULT_LINKS_PAGE_SIZE = 100
+
+_Rows = List[Tuple[Optional[str], ...]]
+
+
+def _children(columns: List[ColumnSchema], path: str) -> List[ColumnSchema]:
+    """フィールドパスの直下の子フィールドを返します。"""
+    depth = path.count(".") + 1
+    return [
+        column
+        for column in columns
+        if column["name"].startswith(f"{path}.") and column["name"].count(".") == depth
+    ]
+
+
+def _googlesql_type(columns: List[ColumnSchema], column: ColumnSchema) -> str:
+    """カラム情報をCOLUMN_FIELD_PATHSのデータ型 (例: "ARRAY<STRUCT<a STRING>>") に戻します。"""
+    data_type = column["type"]
+    if data_type == "RECORD":
+        fields = ", ".join(
+            f"{child['name'].rsplit('.', 1)[-1]} {_googlesql_type(columns, child)}"
+            for child in _children(columns, column["name"])
+        )
+        data_type = f"STRUCT<{fields}>"
+    if column["mode"] == "REPEATED":
+        data_type = f"ARRAY<{data_type}>"
+    return data_type
+
+
+def _schema_fields(columns: List[ColumnSchema], parent: str = "") -> List[Dict]:
+    """カラム情報をtables.get APIのスキーマ (TableFieldSchema) に戻します。"""
+    depth = parent.count(".") + 1 if parent else 0
+    fields = []
+    for column in columns:
+        name = column["name"]
+        if name.count(".") != depth or (parent and not name.startswith(f"{parent}.")):
+            continue
+        field: Dict[str, Any] = {
+            "name": name.rsplit(".", 1)[-1],
+            "type": column["type"],
+            "mode": column["mode"] or "NULLABLE",
+        }
+        if column["description"]:
+            field["description"] = column["description"]
+        if column["type"] == "RECORD":
+            field["fields"] = _schema_fields(columns, name)
+        fields.append(field)
+    return fields
+
+
+def _information_schema_rows(catalog: DatasetCatalog) -> Dict[str, _Rows]:
+    """データセットカタログからINFORMATION_SCHEMAの各ビューの行を作成します。"""
+    dataset_id = catalog.dataset_id
+    rows: Dict[str, _Rows] = {name: [] for name in _INFORMATION_SCHEMA_COLUMNS}
+    for table_name, table_type in catalog.table_types.items():
+        rows["TABLES"].append((dataset_id, table_name, table_type))
+    for table_name, definition in catalog.view_definitions.items():
+        rows["VIEWS"].append((dataset_id, table_name, definition))
+    for table_name, columns in catalog.schemas.items():
+        for column in columns:
+            rows["COLUMN_FIELD_PATHS"].append(
+                (
+                    dataset_id,
+                    table_name,
+                    column["name"],
+                    _googlesql_type(columns, column),
+                    column["description"] or None,
+                    "NO" if column["mode"] == "REQUIRED" else "YES",
+                )
+            )
+    for table_name, description in catalog.descriptions.items():
+        rows["TABLE_OPTIONS"].append(
+            (
+                dataset_id,
+                table_name,
+                "description",
+                json.dumps(description, ensure_ascii=False),
+            )
+        )
+    for table_name, labels in catalog.labels.items():
+        value = ", ".join(
+            f"STRUCT({json.dumps(k, ensure_ascii=False)}, "
+            f"{json.dumps(v, ensure_ascii=False)})"
+            for k, v in labels.items()
+        )
+        rows["TABLE_OPTIONS"].append((dataset_id, table_name, "labels", f"[{value}]"))
+    return rows
+
+
+def _table_resource(catalog: DatasetCatalog, table_name: str) -> Dict[str, Any]:
+    """データセットカタログからtables.get APIのテーブルリソースを作成します。"""
+    table_type = catalog.table_types[table_name]
+    resource: Dict[str, Any] = {
+        "kind": "bigquery#table",
+        "id": f"{catalog.project_id}:{catalog.dataset_id}.{table_name}",
+        "tableReference": {
+            "projectId": catalog.project_id,
+            "datasetId": catalog.dataset_id,
+            "tableId": table_name,
+        },
+        "type": _API_TABLE_TYPES.get(table_type, table_type),
+        "schema": {"fields": _schema_fields(catalog.schemas.get(table_name, []))},
+    }
+    if table_name in catalog.view_definitions:
+        resource["view"] = {
+            "query": catalog.view_definitions[table_name],
+            "useLegacySql": False,
+        }
+    if table_name in catalog.descriptions:
+        resource["description"] = catalog.descriptions[table_name]
+    if table_name in catalog.labels:
+        resource["labels"] = catalog.labels[table_name]
+    if table_name in catalog.modified:
+        modified = datetime.fromisoformat(catalog.modified[table_name])
+        resource["lastModifiedTime"] = str(int(modified.timestamp() * 1000))
+    return resource
+
+
+class _ApiError(Exception):
+    """BigQuery APIのエラー応答。"""
+
+    def __init__(self, status: int, reason: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.message = message
+
+
+class Emulator:
+    """スナップショットのメタデータを返すBigQuery/Lineage APIのエミュレーター。
+
+    ポートに0を指定すると空いているポートを使います。
+    with文で使うと、ブロックの間だけサーバーを起動します。
+    """
+
+    def __init__(
+        self,
+        snapshot: MetadataSnapshot,
+        host: str = "127.0.0.1",
+        bigquery_port: int = 0,
+        lineage_port: int = 0,
+        latency: float = 0.0,
+        query_latency: float = 0.0,
+        fail_every: int = 0,
+        query_page_size: int = DEFAULT_QUERY_PAGE_SIZE,
+        lineage_workers: int = 16,
+    ):
+        """エミュレーターを初期化します。
+
+        Args:
+            snapshot: 返すメタデータのスナップショット
+            host: 待ち受けるホスト
+            bigquery_port: BigQuery APIのポート
+            lineage_port: Lineage APIのポート
+            latency: リクエストごとの遅延（秒）
+            query_latency: クエリジョブの実行時間として追加する遅延（秒）
+            fail_every: APIごとにN件に1件、一時的なエラー（HTTP 503 / UNAVAILABLE）を返す（0は無効）
+            query_page_size: getQueryResultsの1ページあたりの最大行数
+            lineage_workers: Lineage APIのリクエストを処理するスレッド数
+        """
+        self.host = host
+        self.latency = latency
+        self.query_latency = query_latency
+        self.fail_every = fail_every
+        self.query_page_size = query_page_size
+        self._bigquery_port = bigquery_port
+        self._lineage_port = lineage_port
+        self._lineage_workers = lineage_workers
+
+        self._catalogs: Dict[Tuple[str, str], DatasetCatalog] = {
+            (catalog.project_id, catalog.dataset_id): catalog
+            for catalog in snapshot.catalogs
+        }
+        # (プロジェクトID, データセットID, INFORMATION_SCHEMAのビュー名) -> 行
+        self._rows: Dict[Tuple[str, str, str], _Rows] = {}
+        for catalog in snapshot.catalogs:
+            for view, rows in _information_schema_rows(catalog).items():
+                self._rows[(catalog.project_id, catalog.dataset_id, view)] = rows
+        self._lineage = snapshot.lineage
+
+        # ジョブID -> (INFORMATION_SCHEMAのビュー名, 結果の行)
+        self._jobs: Dict[str, Tuple[str, _Rows]] = {}
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._http_server: Optional[ThreadingHTTPServer] = None
+        self._grpc_server: Optional[grpc.Server] = None
+
+    @property
+    def bigquery_endpoint(self) -> str:
+        """BigQuery APIの接続先 (例: http://127.0.0.1:9050)。"""
+        return f"http://{self.host}:{self._bigquery_port}"
+
+    @property
+    def lineage_endpoint(self) -> str:
+        """Lineage APIの接続先 (例: 127.0.0.1:9060)。"""
+        return f"{self.host}:{self._lineage_port}"
+
+    def stats(self) -> Dict[str, int]:
+        """API名 -> リクエスト数 を名前順で返します（エラー応答を含む）。"""
+        with self._lock:
+            return dict(sorted(self._counts.items()))
+
+    def start(self) -> None:
+        """BigQueryとLineage APIのサーバーを起動します。"""
+        emulator = self
+
+        class Handler(_BigQueryHandler):
+            pass
+
+        Handler.emulator = emulator
+        self._http_server = ThreadingHTTPServer(
+            (self.host, self._bigquery_port), Handler
+        )
+        self._http_server.daemon_threads = True
+        self._bigquery_port = self._http_server.server_address[1]
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+
+        self._grpc_server = grpc.server(
+            ThreadPoolExecutor(max_workers=self._lineage_workers)
+        )
+        self._grpc_server.add_generic_rpc_handlers(
+            (
+                grpc.method_handlers_generic_handler(
+                    _LINEAGE_SERVICE,
+                    {
+                        "SearchLinks": grpc.unary_unary_rpc_method_handler(
+                            self._search_links,
+                            request_deserializer=SearchLinksRequest.deserialize,
+                            response_serializer=SearchLinksResponse.serialize,
+                        )
+                    },
+                ),
+            )
+        )
+        self._lineage_port = self._grpc_server.add_insecure_port(
+            f"{self.host}:{self._lineage_port}"
+        )
+        self._grpc_server.start()
+
+    def stop(self) -> None:
+        """サーバーを停止します。"""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._grpc_server is not None:
+            self._grpc_server.stop(grace=None)
+            self._grpc_server = None
+
+    def __enter__(self) -> "Emulator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _begin(self, api: str) -> bool:
+        """リクエストを記録して遅延を入れ、一時的なエラーを返すかどうかを決めます。"""
+        with self._lock:
+            self._counts[api] += 1
+            count = self._counts[api]
+        time.sleep(self.latency)
+        return bool(self.fail_every) and count % self.fail_every == 0
+
+    # --- BigQuery ---------------------------------------------------------
+
+    def run_query(self, query: str, parameters: List[Dict[str, Any]]) -> str:
+        """INFORMATION_SCHEMAへのクエリを実行し、ジョブIDを返します。
+
+        クエリの条件は解釈しません（呼び出し側で絞り込み直すため）。
+        リージョン単位のクエリは、@datasets パラメーターがあればそのデータセットのみ返します。
+
+        Args:
+            query: SQL
+            parameters: クエリパラメーター（REST APIの形式）
+
+        Returns:
+            ジョブID
+
+        Raises:
+            _ApiError: INFORMATION_SCHEMA以外へのクエリの場合
+        """
+        match = _INFORMATION_SCHEMA_PATTERN.search(query)
+        if match is None or match.group(2) not in _INFORMATION_SCHEMA_COLUMNS:
+            raise _ApiError(400, "invalidQuery", "エミュレーターが対応していないクエリです")
+        project_id, _, dataset_id = match.group(1).partition(".")
+        view = match.group(2)
+        time.sleep(self.query_latency)
+
+        if dataset_id.startswith("region-"):
+            dataset_ids = None
+            for parameter in parameters:
+                if parameter.get("name") == "datasets":
+                    values = parameter["parameterValue"].get("arrayValues", [])
+                    dataset_ids = {value["value"] for value in values}
+            rows = [
+                row
+                for (project, dataset, name), view_rows in self._rows.items()
+                if project == project_id
+                and name == view
+                and (dataset_ids is None or dataset in dataset_ids)
+                for row in view_rows
+            ]
+        else:
+            rows = self._rows.get((project_id, dataset_id, view), [])
+
+        job_id = f"emulator_{uuid.uuid4().hex}"
+        with self._lock:
+            self._jobs[job_id] = (view, rows)
+        return job_id
+
+    def query_results(
+        self, project_id: str, job_id: str, start: int, max_results: Optional[int]
+    ) -> Dict[str, Any]:
+        """ジョブの結果の1ページをgetQueryResultsの形式で返します。"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise _ApiError(404, "notFound", f"Not found: Job {project_id}:{job_id}")
+        view, rows = job
+        size = min(max_results or self.query_page_size, self.query_page_size)
+        page = rows[start : start + size]
+        response: Dict[str, Any] = {
+            "kind": "bigquery#getQueryResultsResponse",
+            "jobReference": {"projectId": project_id, "jobId": job_id},
+            "jobComplete": True,
+            "totalRows": str(len(rows)),
+            "schema": {
+                "fields": [
+                    {"name": name, "type": "STRING", "mode": "NULLABLE"}
+                    for name in _INFORMATION_SCHEMA_COLUMNS[view]
+                ]
+            },
+            "rows": [{"f": [{"v": value} for value in row]} for row in page],
+            "totalBytesProcessed": str(self._bytes(rows)),
+            "cacheHit": False,
+        }
+        if start + size < len(rows):
+            response["pageToken"] = str(start + size)
+        return response
+
+    def job_resource(
+        self, project_id: str, job_id: str, configuration: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """完了したクエリジョブのリソースを返します。"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise _ApiError(404, "notFound", f"Not found: Job {project_id}:{job_id}")
+        now = str(int(time.time() * 1000))
+        return {
+            "kind": "bigquery#job",
+            "id": f"{project_id}:{job_id}",
+            "jobReference": {"projectId": project_id, "jobId": job_id},
+            "configuration": configuration or {"query": {}},
+            "status": {"state": "DONE"},
+            "statistics": {
+                "creationTime": now,
+                "startTime": now,
+                "endTime": now,
+                "query": {
+                    "totalBytesProcessed": str(self._bytes(job[1])),
+                    "statementType": "SELECT",
+                },
+            },
+        }
+
+    def table(self, project_id: str, dataset_id: str, table_id: str) -> Dict:
+        """tables.get APIのテーブルリソースを返します。"""
+        catalog = self._catalogs.get((project_id, dataset_id))
+        if catalog is None or table_id not in catalog.table_types:
+            raise _ApiError(
+                404,
+                "notFound",
+                f"Not found: Table {project_id}:{dataset_id}.{table_id}",
+            )
+        return _table_resource(catalog, table_id)
+
+    def tables(
+        self, project_id: str, dataset_id: str, start: int, max_results: Optional[int]
+    ) -> Dict[str, Any]:
+        """tables.list APIの1ページを返します。"""
+        catalog = self._catalogs.get((project_id, dataset_id))
+        if catalog is None:
+            raise _ApiError(
+                404, "notFound", f"Not found: Dataset {project_id}:{dataset_id}"
+            )
+        names = list(catalog.table_types)
+        size = max_results or DEFAULT_TABLES_PAGE_SIZE
+        response: Dict[str, Any] = {
+            "kind": "bigquery#tableList",
+            "totalItems": len(names),
+            "tables": [
+                {
+                    "kind": "bigquery#table",
+                    "id": f"{project_id}:{dataset_id}.{name}",
+                    "tableReference": {
+                        "projectId": project_id,
+                        "datasetId": dataset_id,
+                        "tableId": name,
+                    },
+                    "type": _API_TABLE_TYPES.get(
+                        catalog.table_types[name], catalog.table_types[name]
+                    ),
+                }
+                for name in names[start : start + size]
+            ],
+        }
+        if start + size < len(names):
+            response["nextPageToken"] = str(start + size)
+        return response
+
+    @staticmethod
+    def _bytes(rows: _Rows) -> int:
+        """結果の行の大きさ（処理したバイト数の代わりに使う）を返します。"""
+        return sum(len(value or "") for row in rows for value in row)
+
+    # --- Lineage ----------------------------------------------------------
+
+    def _search_links(
+        self, request: SearchLinksRequest, context: grpc.ServicerContext
+    ) -> SearchLinksResponse:
+        """ターゲットを参照元とするリンクの1ページを返します。"""
+        if self._begin("lineage.search_links"):
+            context.abort(grpc.StatusCode.UNAVAILABLE, "エミュレーターの一時的なエラー")
+
+        target = request.target.fully_qualified_name
+        sources = self._lineage.get(target[len("bigquery:") :], [])
+        start = int(request.page_token or 0)
+        size = request.page_size or DEFAULT_LINKS_PAGE_SIZE
+        links = [
+            Link(
+                name=f"{request.parent}/links/{start + i}",
+                source=EntityReference(fully_qualified_name=f"bigquery:{source}"),
+                target=EntityReference(fully_qualified_name=target),
+            )
+            for i, source in enumerate(sources[start : start + size])
+        ]
+        next_page_token = str(start + size) if start + size < len(sources) else ""
+        return SearchLinksResponse(links=links, next_page_token=next_page_token)
+
+
+class _BigQueryHandler(BaseHTTPRequestHandler):
+    """BigQuery REST APIのリクエストを処理するハンドラー。"""
+
+    emulator: Emulator
+    protocol_version = "HTTP/1.1"
+
+    _ROUTES = (
+        ("POST", re.compile(r"/projects/([^/]+)/jobs"), "jobs.insert"),
+        ("POST", re.compile(r"/projects/([^/]+)/queries"), "jobs.query"),
+        ("GET", re.compile(r"/projects/([^/]+)/jobs/([^/]+)"), "jobs.get"),
+        (
+            "GET",
+            re.compile(r"/projects/([^/]+)/queries/([^/]+)"),
+            "jobs.getQueryResults",
+        ),
+        (
+            "GET",
+            re.compile(r"/projects/([^/]+)/datasets/([^/]+)/tables"),
+            "tables.list",
+        ),
+        (
+            "GET",
+            re.compile(r"/projects/([^/]+)/datasets/([^/]+)/tables/([^/]+)"),
+            "tables.get",
+        ),
+    )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """リクエストごとのログは出力しません。"""
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        if method == "GET" and url.path == "/_emulator/stats":
+            self._send(200, self.emulator.stats())
+            return
+
+        path = url.path.removeprefix("/bigquery/v2")
+        for route_method, pattern, api in self._ROUTES:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                break
+        else:
+            self._send_error(_ApiError(404, "notFound", f"Not found: {url.path}"))
+            return
+
+        if self.emulator._begin(f"bigquery.{api}"):
+            self._send_error(
+                _ApiError(503, "backendError", "エミュレーターの一時的なエラー")
+            )
+            return
+        try:
+            self._send(200, self._handle(api, match.groups(), query, body))
+        except _ApiError as e:
+            self._send_error(e)
+
+    def _handle(
+        self,
+        api: str,
+        args: Tuple[str, ...],
+        query: Dict[str, str],
+        body: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        emulator = self.emulator
+        max_results = int(query["maxResults"]) if "maxResults" in query else None
+        start = int(query.get("pageToken") or query.get("startIndex") or 0)
+
+        if api == "jobs.insert":
+            config = body.get("configuration", {})
+            job_id = emulator.run_query(
+                config.get("query", {}).get("query", ""),
+                config.get("query", {}).get("queryParameters", []),
+            )
+            return emulator.job_resource(args[0], job_id, config)
+        if api == "jobs.query":
+            job_id = emulator.run_query(
+                body.get("query", ""), body.get("queryParameters", [])
+            )
+            response = emulator.query_results(
+                args[0], job_id, 0, body.get("maxResults")
+            )
+            response["kind"] = "bigquery#queryResponse"
+            return response
+        if api == "jobs.get":
+            return emulator.job_resource(args[0], args[1], {})
+        if api == "jobs.getQueryResults":
+            return emulator.query_results(args[0], args[1], start, max_results)
+        if api == "tables.list":
+            return emulator.tables(args[0], args[1], start, max_results)
+        return emulator.table(*args)
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, error: _ApiError) -> None:
+        self._send(
+            error.status,
+            {
+                "error": {
+                    "code": error.status,
+                    "message": error.message,
+                    "errors": [{"reason": error.reason, "message": error.message}],
+                }
+            },
+        )
+
+
+@click.command()
+@click.option(
+    "--fixture",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="返すメタデータのスナップショットファイル（bq2dbt snapshot で作成）",
+)
+@click.option(
+    "--host",
+    default="127.0.0.1",
+    show_default=True,
+    help="待ち受けるホスト",
+)
+@click.option(
+    "--bigquery-port",
+    type=int,
+    default=9050,
+    show_default=True,
+    help="BigQuery APIのポート",
+)
+@click.option(
+    "--lineage-port",
+    type=int,
+    default=9060,
+    show_default=True,
+    help="Lineage APIのポート",
+)
+@click.option(
+    "--latency-ms",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="リクエストごとの遅延（ミリ秒）",
+)
+@click.option(
+    "--query-latency-ms",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="クエリジョブの実行時間として追加する遅延（ミリ秒）",
+)
+@click.option(
+    "--fail-every",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="APIごとにN件に1件、一時的なエラーを返す（リトライの計測用、0は無効）",
+)
+def main(
+    fixture: Path,
+    host: str,
+    bigquery_port: int,
+    lineage_port: int,
+    latency_ms: float,
+    query_latency_ms: float,
+    fail_every: int,
+) -> None:
+    """スナップショットのメタデータを返すBigQuery/Lineage APIのエミュレーターを起動します。"""
+    emulator = Emulator(
+        load_snapshot(fixture),
+        host=host,
+        bigquery_port=bigquery_port,
+        lineage_port=lineage_port,
+        latency=latency_ms / 1000,
+        query_latency=query_latency_ms / 1000,
+        fail_every=fail_every,
+    )
+    with emulator:
+        click.echo(f"BigQuery API: {emulator.bigquery_endpoint}")
+        click.echo(f"Lineage API:  {emulator.lineage_endpoint}")
+        click.echo("Ctrl-Cで停止します")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    for api, count in emulator.stats().items():
+        click.echo(f"{api}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""ベンチマーク用の偽のBigQuery/Lineage APIクライアントモジュール。
+
+google-cloud-bigqueryとLineage APIのクライアントの代わりに合成データセットを返します。
+`BigQueryClient` と `LineageClient` はそのまま使い、内部で作成するAPIクライアントのみを
+差し替えるため、INFORMATION_SCHEMAの結果の解析や依存関係の解決を含めた
+本来の処理を計測できます。呼び出しごとに指定した遅延を入れ、回数を記録します。
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+from google.api_core.exceptions import NotFound
+
+from benchmarks.synthetic import (
+    SyntheticColumn,
+    SyntheticDataset,
+    SyntheticTable,
+    iter_field_paths,
+)
+from bq2dbt.converter.bigquery import BigQueryClient
+from bq2dbt.converter.lineage import LineageClient
+
+# INFORMATION_SCHEMAへのクエリの参照先 (例: `project.dataset.INFORMATION_SCHEMA.TABLES`)
+_INFORMATION_SCHEMA_PATTERN = re.compile(r"`([^`]+)\.INFORMATION_SCHEMA\.(\w+)`")
+
+# tables.list / tables.get APIのテーブルタイプ
+_API_TABLE_TYPES = {"BASE TABLE": "TABLE"}
+
+# Lineage APIのsearch_linksの1ページあたりのリンク数
+SEARCH_LINKS_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Latency:
+    """API呼び出しごとに入れる遅延（秒）。
+
+    Attributes:
+        query: クエリジョブ1回あたり
+        list_tables: tables.list 1回あたり
+        get_table: tables.get 1回あたり
+        search_links: search_linksの1ページあたり
+    """
+
+    query: float = 0.0
+    list_tables: float = 0.0
+    get_table: float = 0.0
+    search_links: float = 0.0
+
+    @classmethod
+    def scaled(cls, milliseconds: float) -> "Latency":
+        """クエリジョブを基準に、実際のAPIの比率で遅延を設定します。
+
+        Args:
+            milliseconds: tables.get 1回あたりの遅延（ミリ秒）
+
+        Returns:
+            遅延の設定
+        """
+        seconds = milliseconds / 1000
+        return cls(
+            query=seconds * 10,
+            list_tables=seconds,
+            get_table=seconds,
+            search_links=seconds * 2,
+        )
+
+
+class ApiCallCounter:
+    """API呼び出しの回数を記録するカウンター（スレッドセーフ）。"""
+
+    def __init__(self) -> None:
+        """カウンターを初期化します。"""
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, count: int = 1) -> None:
+        """呼び出し回数を加算します。
+
+        Args:
+            name: API名
+            count: 加算する回数
+        """
+        with self._lock:
+            self._counts[name] += count
+
+    def snapshot(self) -> Dict[str, int]:
+        """API名 -> 呼び出し回数 を名前順で返します。"""
+        with self._lock:
+            return dict(sorted(self._counts.items()))
+
+
+class _Row(dict):
+    """クエリ結果の行（google.cloud.bigquery.Rowと同様に属性でも参照できる）。"""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def _schema_field(column: SyntheticColumn) -> SimpleNamespace:
+    """カラムを google.cloud.bigquery.SchemaField と同じ属性を持つ値に変換します。"""
+    return SimpleNamespace(
+        name=column.name,
+        field_type="RECORD" if column.fields else column.data_type,
+        description=column.description,
+        mode="NULLABLE",
+        fields=tuple(_schema_field(child) for child in column.fields),
+    )
+
+
+class FakeBigQueryApi:
+    """google.cloud.bigquery.Client の代わりに合成データセットを返すクライアント。
+
+    INFORMATION_SCHEMA（データセット単位・リージョン単位）へのクエリ、
+    tables.list、tables.get に対応します。クエリの条件は解釈せず、
+    参照先のINFORMATION_SCHEMAのビューの全行を返します。
+    """
+
+    def __init__(
+        self,
+        datasets: List[SyntheticDataset],
+        latency: Latency,
+        calls: ApiCallCounter,
+    ):
+        """クライアントを初期化し、返す行をあらかじめ作成します。
+
+        Args:
+            datasets: 合成データセットのリスト
+            latency: API呼び出しごとの遅延
+            calls: 呼び出し回数の記録先
+        """
+        self.latency = latency
+        self.calls = calls
+        self._datasets = {
+            (dataset.project_id, dataset.dataset_id): dataset for dataset in datasets
+        }
+        # (プロジェクトID, データセットID, INFORMATION_SCHEMAのビュー名) -> 行
+        self._rows: Dict[Tuple[str, str, str], List[_Row]] = {}
+        for dataset in datasets:
+            for view, rows in self._information_schema(dataset).items():
+                self._rows[(dataset.project_id, dataset.dataset_id, view)] = rows
+
+    def _information_schema(self, dataset: SyntheticDataset) -> Dict[str, List[_Row]]:
+        """データセットのINFORMATION_SCHEMAの各ビューの行を作成します。"""
+        schema = dataset.dataset_id
+        rows: Dict[str, List[_Row]] = {
+            "TABLES": [],
+            "VIEWS": [],
+            "COLUMN_FIELD_PATHS": [],
+            "TABLE_OPTIONS": [],
+        }
+        for table in dataset.tables.values():
+            base = {"table_schema": schema, "table_name": table.name}
+            rows["TABLES"].append(_Row(base, table_type=table.table_type))
+            if table.description:
+                rows["TABLE_OPTIONS"].append(
+                    _Row(
+                        base,
+                        option_name="description",
+                        option_value=json.dumps(table.description, ensure_ascii=False),
+                    )
+                )
+            if table.table_type != "VIEW":
+                continue
+            rows["VIEWS"].append(_Row(base, view_definition=table.view_query))
+            for column in table.columns:
+                for path, field in iter_field_paths(column):
+                    rows["COLUMN_FIELD_PATHS"].append(
+                        _Row(
+                            base,
+                            field_path=path,
+                            data_type=field.data_type,
+                            description=field.description,
+                            is_nullable="YES",
+                        )
+                    )
+        return rows
+
+    def query(
+        self, query: str, location: Optional[str] = None, job_config: Any = None
+    ) -> List[_Row]:
+        """INFORMATION_SCHEMAへのクエリの結果を返します。
+
+        Args:
+            query: SQL
+            location: ロケーション（使用しない）
+            job_config: クエリの設定（リージョン単位のクエリのデータセットの絞り込みに使用）
+
+        Returns:
+            クエリ結果の行のリスト
+
+        Raises:
+            ValueError: INFORMATION_SCHEMA以外へのクエリの場合
+        """
+        self.calls.add("bigquery.query")
+        time.sleep(self.latency.query)
+
+        match = _INFORMATION_SCHEMA_PATTERN.search(query)
+        if match is None:
+            raise ValueError(f"対応していないクエリです: {query}")
+        project_id, _, dataset_id = match.group(1).partition(".")
+        view = match.group(2)
+
+        if not dataset_id.startswith("region-"):
+            return self._rows.get((project_id, dataset_id, view), [])
+
+        # リージョン単位のクエリはプロジェクト内の全データセットの行を返す
+        dataset_ids = None
+        for parameter in getattr(job_config, "query_parameters", None) or ():
+            if parameter.name == "datasets":
+                dataset_ids = set(parameter.values)
+        rows = []
+        for (project, dataset, name), view_rows in self._rows.items():
+            if project != project_id or name != view:
+                continue
+            if dataset_ids is None or dataset in dataset_ids:
+                rows.extend(view_rows)
+        return rows
+
+    def list_tables(self, dataset_ref: str) -> List[SimpleNamespace]:
+        """tables.list APIの結果を返します。
+
+        Args:
+            dataset_ref: "project.dataset" 形式のデータセット
+
+        Returns:
+            table_id、table_type を持つ値のリスト
+        """
+        self.calls.add("bigquery.list_tables")
+        time.sleep(self.latency.list_tables)
+
+        project_id, _, dataset_id = str(dataset_ref).partition(".")
+        dataset = self._datasets.get((project_id, dataset_id))
+        if dataset is None:
+            raise NotFound(f"Not found: Dataset {dataset_ref}")
+        return [
+            SimpleNamespace(
+                table_id=table.name,
+                table_type=_API_TABLE_TYPES.get(table.table_type, table.table_type),
+            )
+            for table in dataset.tables.values()
+        ]
+
+    def get_table(self, table_ref: Any) -> SimpleNamespace:
+        """tables.get APIの結果を返します。
+
+        Args:
+            table_ref: "project.dataset.table" 形式のテーブル
+
+        Returns:
+            google.cloud.bigquery.Table と同じ属性を持つ値
+
+        Raises:
+            NotFound: テーブルが存在しない場合
+        """
+        self.calls.add("bigquery.get_table")
+        time.sleep(self.latency.get_table)
+
+        project_id, dataset_id, table_name = str(table_ref).split(".")
+        dataset = self._datasets.get((project_id, dataset_id))
+        table: Optional[SyntheticTable] = (
+            dataset.tables.get(table_name) if dataset is not None else None
+        )
+        if table is None:
+            raise NotFound(f"Not found: Table {table_ref}")
+        return SimpleNamespace(
+            table_type=_API_TABLE_TYPES.get(table.table_type, table.table_type),
+            view_query=table.view_query or None,
+            schema=[_schema_field(column) for column in table.columns],
+            description=table.description,
+            labels={},
+            modified=None,
+        )
+
+
+class FakeLineageApi:
+    """Lineage APIのクライアントの代わりに合成データセットの依存関係を返すクライアント。"""
+
+    def __init__(
+        self,
+        datasets: List[SyntheticDataset],
+        latency: Latency,
+        calls: ApiCallCounter,
+    ):
+        """クライアントを初期化します。
+
+        Args:
+            datasets: 合成データセットのリスト
+            latency: API呼び出しごとの遅延
+            calls: 呼び出し回数の記録先
+        """
+        self.latency = latency
+        self.calls = calls
+        self._lineage: Dict[str, List[str]] = {}
+        for dataset in datasets:
+            self._lineage.update(dataset.lineage)
+
+    def search_links(self, request: Any, retry: Any = None) -> SimpleNamespace:
+        """ターゲットを参照元とするリンクを、SearchLinksPager と同じ形で返します。
+
+        Args:
+            request: SearchLinksRequest
+            retry: リトライの設定（使用しない）
+
+        Returns:
+            ページごとに遅延を入れて取得する pages を持つ値
+        """
+        self.calls.add("lineage.search_links")
+        target = request.target.fully_qualified_name[len("bigquery:") :]
+        sources = self._lineage.get(target, [])
+        return SimpleNamespace(pages=self._pages(sources))
+
+    def _pages(self, sources: List[str]) -> Iterator[SimpleNamespace]:
+        """リンクをページ単位で返します（空の結果も1ページとして扱います）。"""
+        for start in range(0, max(len(sources), 1), SEARCH_LINKS_PAGE_SIZE):
+            self.calls.add("lineage.search_links_pages")
+            time.sleep(self.latency.search_links)
+            links = []
+            for source in sources[start : start + SEARCH_LINKS_PAGE_SIZE]:
+                entity = SimpleNamespace(fully_qualified_name=f"bigquery:{source}")
+                links.append(SimpleNamespace(source=entity))
+            yield SimpleNamespace(links=links)
+
+
+@dataclass
+class FakeBackend:
+    """偽のAPIクライアントと呼び出し回数の記録。
+
+    Attributes:
+        bigquery: 偽のBigQuery APIクライアント
+        lineage: 偽のLineage APIクライアント
+        calls: 呼び出し回数の記録
+    """
+
+    bigquery: FakeBigQueryApi
+    lineage: FakeLineageApi
+    calls: ApiCallCounter
+
+
+@contextmanager
+def fake_backend(
+    datasets: List[SyntheticDataset], latency: Latency = Latency()
+) -> Iterator[FakeBackend]:
+    """BigQueryClient と LineageClient が偽のAPIクライアントを使うようにします。
+
+    Args:
+        datasets: 合成データセットのリスト
+        latency: API呼び出しごとの遅延
+
+    Yields:
+        偽のAPIクライアントと呼び出し回数の記録
+    """
+    calls = ApiCallCounter()
+    backend = FakeBackend(
+        FakeBigQueryApi(datasets, latency, calls),
+        FakeLineageApi(datasets, latency, calls),
+        calls,
+    )
+    with patch.object(
+        BigQueryClient, "_create_client", lambda self: backend.bigquery
+    ), patch.object(LineageClient, "_create_client", lambda self: backend.lineage):
+        yield backend
@@ -0,0 +1,406 @@
+"""import_views のベンチマークを実行し、保存したベースラインと比較します。
+
+使い方:
+    uv run python -m benchmarks.run                    # 100/1000/10000ビューで計測して比較
+    uv run python -m benchmarks.run --sizes 100,1000   # 計測するビュー数を指定
+    uv run python -m benchmarks.run --update-baseline  # 計測結果をベースラインとして保存
+    uv run python -m benchmarks.run --backend emulator # ローカルのエミュレーターに接続して計測
+
+API呼び出し回数は決定的なため、ベースラインより1回でも増えた場合は退行とみなします。
+処理時間とピークメモリは --tolerance の割合を超えて増えた場合に退行とみなします。
+退行がある場合は終了コード1で終了します。
+"""
+
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.emulator import Emulator
+from benchmarks.fakes import Latency, fake_backend
+from benchmarks.synthetic import (
+    MIXED,
+    TOPOLOGIES,
+    SyntheticDataset,
+    generate_dataset,
+    to_snapshot,
+)
+from bq2dbt.converter import bigquery, lineage
+from bq2dbt.converter.bigquery import MetadataSource
+from bq2dbt.converter.dependency import DependencyBackend
+from bq2dbt.converter.generator import ConflictPolicy
+
+# ベースラインの保存先
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+DEFAULT_SIZES = "100,1000,10000"
+
+# APIの差し替え方
+# - fake: APIクライアントをプロセス内の偽のクライアントに差し替える
+# - emulator: 実際のクライアントをローカルのエミュレーター（HTTP/gRPC）に接続する
+BACKENDS = ("fake", "emulator")
+
+
+@dataclass
+class BenchmarkResult:
+    """1つのシナリオの計測結果。
+
+    Attributes:
+        views: ビューの数
+        wall_time: import_views 全体の処理時間（秒）
+        peak_memory: import_views 実行中のピークメモリ（バイト、tracemallocで計測）
+        models: 生成されたSQLモデルの数
+        api_calls: API名 -> 呼び出し回数
+    """
+
+    views: int
+    wall_time: float
+    peak_memory: int
+    models: int
+    api_calls: Dict[str, int] = field(default_factory=dict)
+
+
+@contextmanager
+def _backend(
+    name: str, dataset: SyntheticDataset, latency: Latency
+) -> Iterator[Callable[[], Dict[str, int]]]:
+    """APIを差し替え、API呼び出し回数を返す関数を渡します。
+
+    Args:
+        name: APIの差し替え方（"fake" または "emulator"）
+        dataset: 合成データセット
+        latency: API呼び出しごとの遅延
+
+    Yields:
+        API名 -> 呼び出し回数 を返す関数
+    """
+    if name == "fake":
+        with fake_backend([dataset], latency) as backend:
+            yield backend.calls.snapshot
+        return
+
+    emulator = Emulator(
+        to_snapshot(dataset),
+        latency=latency.get_table,
+        query_latency=latency.query,
+    )
+    with emulator, patch.dict(
+        os.environ,
+        {
+            bigquery.API_ENDPOINT_ENV: emulator.bigquery_endpoint,
+            lineage.API_ENDPOINT_ENV: emulator.lineage_endpoint,
+        },
+    ):
+        yield emulator.stats
+
+
+def run_scenario(
+    view_count: int,
+    topology: str,
+    latency: Latency,
+    settings: Dict[str, Any],
+    backend: str = "fake",
+) -> BenchmarkResult:
+    """合成データセットに対して import_views を1回実行し、計測します。
+
+    Args:
+        view_count: ビューの数
+        topology: 依存関係の形
+        latency: API呼び出しごとの遅延
+        settings: import_views に渡す実行条件
+        backend: APIの差し替え方（"fake" または "emulator"）
+
+    Returns:
+        計測結果
+    """
+    # 計測対象の読み込みを済ませてから計測を始める
+    from bq2dbt.converter.importer import import_views
+
+    dataset = generate_dataset(view_count, topology)
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+
+    with tempfile.TemporaryDirectory() as tmp, _backend(
+        backend, dataset, latency
+    ) as api_calls, open(os.devnull, "w") as devnull:
+        output_dir = Path(tmp) / "models"
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            with redirect_stdout(devnull):
+                import_views(
+                    project_id=dataset.project_id,
+                    dataset=dataset.dataset_id,
+                    output_dir=output_dir,
+                    naming_preset="full",
+                    non_interactive=True,
+                    include_dependencies=True,
+                    on_conflict=ConflictPolicy.OVERWRITE.value,
+                    lineage_cache_ttl=0,
+                    **settings,
+                )
+            wall_time = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            # import_views が追加したログハンドラーを外し、次の計測に持ち越さない
+            for handler in root_logger.handlers[len(handlers) :]:
+                root_logger.removeHandler(handler)
+                handler.close()
+
+        models = len(list(output_dir.glob("*.sql")))
+        return BenchmarkResult(
+            views=view_count,
+            wall_time=wall_time,
+            peak_memory=peak_memory,
+            models=models,
+            api_calls=api_calls(),
+        )
+
+
+def compare(
+    name: str,
+    result: BenchmarkResult,
+    baseline: Optional[Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """計測結果をベースラインと比較し、退行の一覧を返します。
+
+    Args:
+        name: シナリオ名
+        result: 計測結果
+        baseline: ベースラインの計測結果（ない場合はNone）
+        tolerance: 処理時間とピークメモリの許容する増加の割合
+
+    Returns:
+        退行の説明のリスト
+    """
+    if baseline is None:
+        return []
+
+    regressions = []
+    for api, count in result.api_calls.items():
+        expected = baseline["api_calls"].get(api, 0)
+        if count > expected:
+            regressions.append(f"{name}: {api} の呼び出しが増えました ({expected} -> {count})")
+    if result.models != baseline["models"]:
+        regressions.append(
+            f"{name}: 生成されたモデル数が変わりました ({baseline['models']} -> {result.models})"
+        )
+    if result.wall_time > baseline["wall_time"] * (1 + tolerance):
+        regressions.append(
+            f"{name}: 処理時間が増えました "
+            f"({baseline['wall_time']:.2f}秒 -> {result.wall_time:.2f}秒)"
+        )
+    if result.peak_memory > baseline["peak_memory"] * (1 + tolerance):
+        regressions.append(
+            f"{name}: ピークメモリが増えました "
+            f"({_mib(baseline['peak_memory'])} -> {_mib(result.peak_memory)})"
+        )
+    return regressions
+
+
+def _mib(size: int) -> str:
+    """バイト数をMiB単位の文字列に変換します。"""
+    return f"{size / 1024 / 1024:.1f}MiB"
+
+
+def _change(value: float, baseline: Optional[float]) -> str:
+    """ベースラインからの変化の割合を文字列に変換します。"""
+    if not baseline:
+        return "-"
+    return f"{(value - baseline) / baseline:+.0%}"
+
+
+def display_results(
+    results: Dict[str, BenchmarkResult],
+    baseline: Dict[str, Any],
+    console: Console,
+) -> None:
+    """計測結果とベースラインからの変化を表示します。
+
+    Args:
+        results: シナリオ名 -> 計測結果
+        baseline: シナリオ名 -> ベースラインの計測結果
+        console: コンソールオブジェクト
+    """
+    table = Table(title="ベンチマーク結果")
+    table.add_column("シナリオ", style="cyan", no_wrap=True)
+    table.add_column("処理時間(秒)", justify="right")
+    table.add_column("変化", justify="right")
+    table.add_column("ピークメモリ", justify="right")
+    table.add_column("変化", justify="right")
+    table.add_column("API呼び出し", justify="right")
+    table.add_column("ベースライン", justify="right")
+    for name, result in results.items():
+        expected = baseline.get(name)
+        table.add_row(
+            name,
+            f"{result.wall_time:.2f}",
+            _change(result.wall_time, expected and expected["wall_time"]),
+            _mib(result.peak_memory),
+            _change(result.peak_memory, expected and expected["peak_memory"]),
+            str(sum(result.api_calls.values())),
+            str(sum(expected["api_calls"].values())) if expected else "-",
+        )
+    console.print(table)
+
+    for name, result in results.items():
+        calls = ", ".join(f"{api}={count}" for api, count in result.api_calls.items())
+        console.print(f"{name}: {calls}")
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default=DEFAULT_SIZES,
+    show_default=True,
+    help="計測するビュー数（カンマ区切り）",
+)
+@click.option(
+    "--topology",
+    type=click.Choice([MIXED, *TOPOLOGIES]),
+    default=MIXED,
+    show_default=True,
+    help="ビュー間の依存関係の形",
+)
+@click.option(
+    "--latency-ms",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="tables.get 1回あたりの遅延（ミリ秒）。クエリジョブはその10倍、search_linksのページは2倍",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    default="fake",
+    show_default=True,
+    help="APIの差し替え方（emulatorは実際のクライアントでローカルのHTTP/gRPCサーバーに接続）",
+)
+@click.option(
+    "--metadata-source",
+    type=click.Choice([m.value for m in MetadataSource]),
+    default=MetadataSource.INFORMATION_SCHEMA.value,
+    show_default=True,
+    help="メタデータの取得方法",
+)
+@click.option(
+    "--dependency-backend",
+    type=click.Choice([b.value for b in DependencyBackend]),
+    default=DependencyBackend.LINEAGE.value,
+    show_default=True,
+    help="依存関係の解析方法",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="ビュー変換とLineage APIの呼び出しの並列数",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=BASELINE_PATH,
+    show_default=True,
+    help="ベースラインのファイル",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    help="計測結果をベースラインとして保存",
+)
+@click.option(
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=0.25,
+    show_default=True,
+    help="処理時間とピークメモリの許容する増加の割合",
+)
+def main(
+    sizes: str,
+    topology: str,
+    latency_ms: float,
+    backend: str,
+    metadata_source: str,
+    dependency_backend: str,
+    jobs: int,
+    baseline_path: Path,
+    update_baseline: bool,
+    tolerance: float,
+) -> None:
+    """合成データセットで import_views を計測し、ベースラインと比較します。"""
+    console = Console(highlight=False)
+    settings = {
+        "metadata_source": metadata_source,
+        "dependency_backend": dependency_backend,
+        "jobs": jobs,
+        "lineage_concurrency": jobs,
+    }
+    conditions = {"topology": topology, "latency_ms": latency_ms, **settings}
+    if backend != "fake":
+        # 既存のベースラインと比較できるよう、既定の fake の場合は条件に含めない
+        conditions["backend"] = backend
+
+    baseline: Dict[str, Any] = {}
+    if baseline_path.exists():
+        saved = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if saved.get("conditions") == conditions:
+            baseline = saved["scenarios"]
+        elif not update_baseline:
+            console.print(
+                "[bold yellow]警告:[/] ベースラインの計測条件が異なるため比較しません "
+                f"({saved.get('conditions')})"
+            )
+
+    results: Dict[str, BenchmarkResult] = {}
+    regressions: List[str] = []
+    for size in [int(s) for s in sizes.split(",") if s.strip()]:
+        name = f"{topology}-{size}"
+        with console.status(f"{name} を計測中..."):
+            result = run_scenario(
+                size, topology, Latency.scaled(latency_ms), settings, backend
+            )
+        results[name] = result
+        regressions.extend(compare(name, result, baseline.get(name), tolerance))
+
+    display_results(results, baseline, console)
+
+    if update_baseline:
+        scenarios = dict(baseline)
+        scenarios.update({name: asdict(result) for name, result in results.items()})
+        data = {
+            "conditions": conditions,
+            "python": platform.python_version(),
+            "scenarios": scenarios,
+        }
+        baseline_path.write_text(
+            json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        console.print(f"ベースラインを保存しました: {baseline_path}")
+        return
+
+    if regressions:
+        console.print("[bold red]退行が見つかりました:[/]")
+        for regression in regressions:
+            console.print(f"  - {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
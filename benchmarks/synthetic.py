@@ -0,0 +1,317 @@
+"""ベンチマーク用の合成データセットを生成するモジュール。
+
+指定した数のビューと、ビューが参照するテーブルを決定的に生成します。
+ビュー間の依存関係は次の形から選べます。
+
+- chain: 各ビューが直前のビューを参照する（深い依存関係）
+- fan_in: 1つのビューがグループ内の他の全てのビューを参照する
+- fan_out: グループ内の全てのビューが1つのビューを参照する
+- diamond: A <- B, C <- D の菱形の依存関係
+- mixed: ビューを4等分し、上記の4つの形をそれぞれに適用する
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+from bq2dbt.converter.bigquery import DatasetCatalog
+from bq2dbt.converter.snapshot import MetadataSnapshot
+
+TOPOLOGIES = ("chain", "fan_in", "fan_out", "diamond")
+MIXED = "mixed"
+
+# ビューのカラムの型（順番に割り当てる）
+_COLUMN_TYPES = ("STRING", "INT64", "FLOAT64", "TIMESTAMP", "BOOL", "DATE")
+
+
+@dataclass(frozen=True)
+class SyntheticColumn:
+    """合成テーブルのカラム。
+
+    Attributes:
+        name: カラム名
+        data_type: GoogleSQLのデータ型（STRUCTは "STRUCT<...>" の形式）
+        description: カラムの説明
+        fields: STRUCT型の子フィールド
+    """
+
+    name: str
+    data_type: str
+    description: str = ""
+    fields: Tuple["SyntheticColumn", ...] = ()
+
+
+@dataclass
+class SyntheticTable:
+    """合成データセットのテーブルまたはビュー。
+
+    Attributes:
+        name: テーブル名
+        table_type: "VIEW" または "BASE TABLE"
+        columns: カラムのリスト
+        view_query: ビューのSQL定義（テーブルの場合は空文字列）
+        description: テーブルの説明
+    """
+
+    name: str
+    table_type: str
+    columns: List[SyntheticColumn]
+    view_query: str = ""
+    description: str = ""
+
+
+@dataclass
+class SyntheticDataset:
+    """合成データセット。
+
+    Attributes:
+        project_id: プロジェクトID
+        dataset_id: データセットID
+        tables: テーブル名 -> テーブル（ビューを含む、生成順）
+        lineage: ビューの完全修飾名 -> 依存先の完全修飾名のリスト
+    """
+
+    project_id: str
+    dataset_id: str
+    tables: Dict[str, SyntheticTable] = field(default_factory=dict)
+    lineage: Dict[str, List[str]] = field(default_factory=dict)
+
+    def fully_qualified_name(self, table_name: str) -> str:
+        """テーブルの完全修飾名を返します。"""
+        return f"{self.project_id}.{self.dataset_id}.{table_name}"
+
+    @property
+    def views(self) -> List[str]:
+        """ビュー名のリスト（生成順）。"""
+        return [
+            table.name for table in self.tables.values() if table.table_type == "VIEW"
+        ]
+
+
+def iter_field_paths(
+    column: SyntheticColumn, prefix: str = ""
+) -> Iterator[Tuple[str, SyntheticColumn]]:
+    """カラムとその子フィールドを (フィールドパス, カラム) の深さ優先の順に返します。
+
+    Args:
+        column: カラム
+        prefix: 親フィールドのパス
+
+    Yields:
+        (フィールドパス, カラムまたは子フィールド)
+    """
+    path = f"{prefix}{column.name}"
+    yield path, column
+    for child in column.fields:
+        yield from iter_field_paths(child, f"{path}.")
+
+
+def to_snapshot(
+    dataset: SyntheticDataset, location: str = "asia-northeast1"
+) -> MetadataSnapshot:
+    """合成データセットをメタデータスナップショットに変換します。
+
+    ローカルのエミュレーターやオフラインのインポートの入力に使います。
+
+    Args:
+        dataset: 合成データセット
+        location: スナップショットのロケーション
+
+    Returns:
+        メタデータスナップショット
+    """
+    catalog = DatasetCatalog(dataset.project_id, dataset.dataset_id)
+    for table in dataset.tables.values():
+        catalog.table_types[table.name] = table.table_type
+        if table.description:
+            catalog.descriptions[table.name] = table.description
+        if table.table_type != "VIEW":
+            continue
+        catalog.view_definitions[table.name] = table.view_query
+        catalog.schemas[table.name] = [
+            {
+                "name": path,
+                "type": "RECORD" if field.fields else field.data_type,
+                "description": field.description,
+                "mode": "NULLABLE",
+            }
+            for column in table.columns
+            for path, field in iter_field_paths(column)
+        ]
+    return MetadataSnapshot(
+        project_id=dataset.project_id,
+        location=location,
+        dataset_id=dataset.dataset_id,
+        views=dataset.views,
+        catalogs=[catalog],
+        lineage={view: list(deps) for view, deps in dataset.lineage.items()},
+        max_depth=3,
+    )
+
+
+def _dependencies(topology: str, count: int, fan_width: int) -> List[List[int]]:
+    """ビューごとの依存先のビュー番号を返します（空のリストは元テーブルを参照）。
+
+    Args:
+        topology: 依存関係の形
+        count: ビューの数
+        fan_width: fan_in、fan_outの1グループあたりの参照数
+
+    Returns:
+        ビュー番号 -> 依存先のビュー番号のリスト
+    """
+    deps: List[List[int]] = [[] for _ in range(count)]
+    if topology == "chain":
+        for i in range(1, count):
+            deps[i] = [i - 1]
+    elif topology == "fan_in":
+        # グループの最後のビューがグループ内の他のビューを全て参照する
+        for start in range(0, count, fan_width + 1):
+            last = min(start + fan_width, count - 1)
+            deps[last] = list(range(start, last))
+    elif topology == "fan_out":
+        # グループの最初のビューをグループ内の他のビューが全て参照する
+        for start in range(0, count, fan_width + 1):
+            for i in range(start + 1, min(start + fan_width + 1, count)):
+                deps[i] = [start]
+    elif topology == "diamond":
+        for start in range(0, count - 3, 4):
+            deps[start + 1] = [start]
+            deps[start + 2] = [start]
+            deps[start + 3] = [start + 1, start + 2]
+    else:
+        raise ValueError(f"不明な依存関係の形です: {topology}")
+    return deps
+
+
+def _columns(column_count: int) -> List[SyntheticColumn]:
+    """ビューのカラムを生成します（先頭はid、末尾はSTRUCT型のカラム）。"""
+    columns = [SyntheticColumn("id", "INT64", "主キー")]
+    for i in range(column_count):
+        data_type = _COLUMN_TYPES[i % len(_COLUMN_TYPES)]
+        columns.append(SyntheticColumn(f"col_{i:03d}", data_type, f"カラム{i}"))
+    columns.append(
+        SyntheticColumn(
+            "attributes",
+            "STRUCT<source STRING, score FLOAT64>",
+            "付加情報",
+            fields=(
+                SyntheticColumn("source", "STRING", "取得元"),
+                SyntheticColumn("score", "FLOAT64", "スコア"),
+            ),
+        )
+    )
+    return columns
+
+
+def _view_query(
+    dataset: SyntheticDataset,
+    view_name: str,
+    sources: List[str],
+    columns: List[SyntheticColumn],
+    definition_size: int,
+) -> str:
+    """ビューのSQL定義を生成します。
+
+    Args:
+        dataset: 合成データセット
+        view_name: ビュー名
+        sources: 参照するテーブル名のリスト
+        columns: ビューのカラム
+        definition_size: SQL定義の最小の文字数（コメントで埋める）
+
+    Returns:
+        SQL定義
+    """
+    select = ",\n".join(f"  t0.{column.name}" for column in columns)
+    joins = "".join(
+        f"\nLEFT JOIN `{dataset.fully_qualified_name(source)}` AS t{i} USING (id)"
+        for i, source in enumerate(sources[1:], 1)
+    )
+    body = (
+        f"SELECT\n{select}\n"
+        f"FROM `{dataset.fully_qualified_name(sources[0])}` AS t0{joins}\n"
+    )
+    header = f"-- {view_name}\n"
+    padding = []
+    size = len(header) + len(body)
+    line = 0
+    while size < definition_size:
+        comment = f"-- 変換ロジックの説明 {line:05d}: " + "x" * 60 + "\n"
+        padding.append(comment)
+        size += len(comment)
+        line += 1
+    return header + "".join(padding) + body
+
+
+def generate_dataset(
+    view_count: int,
+    topology: str = MIXED,
+    project_id: str = "bench-project",
+    dataset_id: str = "bench_dataset",
+    column_count: int = 30,
+    definition_size: int = 4000,
+    fan_width: int = 10,
+) -> SyntheticDataset:
+    """合成データセットを生成します。
+
+    同じ引数からは常に同じデータセットを生成します。
+
+    Args:
+        view_count: ビューの数
+        topology: 依存関係の形（"chain", "fan_in", "fan_out", "diamond", "mixed"）
+        project_id: プロジェクトID
+        dataset_id: データセットID
+        column_count: ビューごとのカラム数（idとSTRUCT型のカラムを除く）
+        definition_size: ビューのSQL定義の最小の文字数
+        fan_width: fan_in、fan_outの1グループあたりの参照数
+
+    Returns:
+        合成データセット
+
+    Raises:
+        ValueError: 依存関係の形が不明な場合
+    """
+    if topology == MIXED:
+        parts = [
+            (name, view_count // len(TOPOLOGIES) + (i < view_count % len(TOPOLOGIES)))
+            for i, name in enumerate(TOPOLOGIES)
+        ]
+    elif topology in TOPOLOGIES:
+        parts = [(topology, view_count)]
+    else:
+        raise ValueError(f"不明な依存関係の形です: {topology}")
+
+    dataset = SyntheticDataset(project_id, dataset_id)
+    columns = _columns(column_count)
+
+    # 元テーブル（依存先のないビューが参照する）
+    base_count = max(1, view_count // 10)
+    base_tables = [f"raw_{i:05d}" for i in range(base_count)]
+    for name in base_tables:
+        dataset.tables[name] = SyntheticTable(
+            name, "BASE TABLE", columns, description=f"元テーブル {name}"
+        )
+
+    offset = 0
+    for part, count in parts:
+        names = [f"v_{part}_{i:05d}" for i in range(count)]
+        for i, deps in enumerate(_dependencies(part, count, fan_width)):
+            if deps:
+                sources = [names[dep] for dep in deps]
+            else:
+                sources = [base_tables[(offset + i) % base_count]]
+            dataset.tables[names[i]] = SyntheticTable(
+                names[i],
+                "VIEW",
+                columns,
+                view_query=_view_query(
+                    dataset, names[i], sources, columns, definition_size
+                ),
+                description=f"合成ビュー {names[i]}",
+            )
+            dataset.lineage[dataset.fully_qualified_name(names[i])] = [
+                dataset.fully_qualified_name(source) for source in sources
+            ]
+        offset += count
+
+    return dataset
@@ -7,8 +7,10 @@ import click
 from rich.console import Console
 
 from bq2dbt import __version__
+from bq2dbt.commands.cache import cache_cmd
 from bq2dbt.commands.importer import import_cmd
 from bq2dbt.commands.logs import logs_cmd
+from bq2dbt.commands.snapshot import snapshot_cmd
 
 # コンソール設定
 console = Console()
@@ -31,6 +33,8 @@ def cli(ctx: click.Context, verbose: bool) -> None:
 # サブコマンドの登録
 cli.add_command(import_cmd)
 cli.add_command(logs_cmd)
+cli.add_command(cache_cmd)
+cli.add_command(snapshot_cmd)
 
 
 def main() -> int:
@@ -0,0 +1,41 @@
+"""キャッシュ管理コマンドモジュール。"""
+
+from typing import Optional
+
+import click
+from rich.console import Console
+
+from bq2dbt.utils.cache import LineageCache
+
+
+@click.group(name="cache")
+def cache_cmd() -> None:
+    """キャッシュ関連のコマンド。
+
+    Lineage APIの取得結果などのローカルキャッシュを管理します。
+    """
+    pass
+
+
+@cache_cmd.command(name="purge")
+@click.option(
+    "--expired-only",
+    is_flag=True,
+    help="期限切れのエントリのみ削除する",
+)
+@click.option(
+    "--ttl",
+    type=click.IntRange(min=0),
+    default=None,
+    help="期限切れの判定に使用する有効期間（秒、--expired-only使用時）",
+)
+def purge_cache(expired_only: bool, ttl: Optional[int]) -> None:
+    """Lineageキャッシュを削除する。"""
+    console = Console()
+    cache = LineageCache() if ttl is None else LineageCache(ttl=ttl)
+    try:
+        deleted = cache.purge(expired_only=expired_only)
+    finally:
+        cache.close()
+
+    console.print(f"Lineageキャッシュから{deleted}件のエントリを削除しました: {cache.path}")
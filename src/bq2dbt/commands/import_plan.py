@@ -0,0 +1,287 @@
+"""インポート計画の作成と実行のコマンド"""
+from pathlib import Path
+from typing import Optional, Tuple
+
+import click
+
+from bq2dbt.converter.bigquery import MetadataSource
+from bq2dbt.converter.dependency import DependencyBackend
+from bq2dbt.converter.generator import ConflictPolicy, WriteMode
+from bq2dbt.utils.cache import DEFAULT_LINEAGE_CACHE_TTL
+from bq2dbt.utils.naming import NamingPreset
+
+
+def parse_shard(
+    ctx: click.Context, param: click.Parameter, value: str
+) -> Tuple[int, int]:
+    """`--shard i/n` の値を (分割の番号, 分割数) に変換します。"""
+    index, _, count = value.partition("/")
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        raise click.BadParameter("i/n の形式で指定してください (例: 1/4)")
+    if shard[1] < 1 or not 1 <= shard[0] <= shard[1]:
+        raise click.BadParameter(f"1 <= i <= n を満たす必要があります: {value}")
+    return shard
+
+
+@click.command(name="plan")
+@click.option(
+    "--project-id",
+    required=True,
+    help="BigQueryプロジェクトID",
+)
+@click.option(
+    "--dataset",
+    help="インポート対象のBigQueryデータセット",
+)
+@click.option(
+    "--datasets",
+    help="インポート対象の複数のBigQueryデータセット（カンマ区切り、--datasetの代わりに指定）",
+)
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="dbtモデルの出力先ディレクトリ",
+)
+@click.option(
+    "--output",
+    "plan_file",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="計画の保存先ファイル（例: plan.json）",
+)
+@click.option(
+    "--naming-preset",
+    type=click.Choice([p.value for p in NamingPreset]),
+    default=NamingPreset.FULL.value,
+    help="モデル命名規則のプリセット full: dataset__table.sql, table_only: table.sql, dataset_without_postfix: dm_dataset.table -> dataset__table.sql",
+)
+@click.option(
+    "--include-views",
+    help="インポート対象のビュー名パターン（カンマ区切り）",
+)
+@click.option(
+    "--exclude-views",
+    help="インポート対象から除外するビュー名パターン（カンマ区切り）",
+)
+@click.option(
+    "--non-interactive",
+    is_flag=True,
+    help="インタラクティブな確認をスキップ",
+)
+@click.option(
+    "--on-conflict",
+    type=click.Choice([p.value for p in ConflictPolicy]),
+    default=ConflictPolicy.ASK.value,
+    help="既存ファイルがあるビューの扱い ask: 一覧を表示してまとめて選択（--non-interactive時は上書き）, overwrite: すべて上書き, skip: すべてスキップ, changed: 内容が変わったファイルのみ上書き",
+)
+@click.option(
+    "--write-mode",
+    type=click.Choice([m.value for m in WriteMode]),
+    default=WriteMode.ALWAYS.value,
+    help="モデルファイルの書き込み方法 always: 常に書き込む, changed: 内容が変わった場合のみ書き込む",
+)
+@click.option(
+    "--yml-prefix",
+    help="YAMLモデルの接頭辞(e.g. '_' -> _model_name.yml)",
+)
+@click.option(
+    "--include-dependencies",
+    is_flag=True,
+    help="依存関係にあるビューも含めてインポート",
+)
+@click.option(
+    "--location",
+    default="asia-northeast1",
+    help="BigQueryのロケーション",
+)
+@click.option(
+    "--debug",
+    is_flag=True,
+    help="デバッグモードを有効化",
+)
+@click.option(
+    "--max-depth",
+    type=int,
+    default=3,
+    help="依存関係の最大深度（--include-dependencies使用時）",
+)
+@click.option(
+    "--dependency-backend",
+    type=click.Choice([b.value for b in DependencyBackend]),
+    default=DependencyBackend.LINEAGE.value,
+    help="依存関係の解析方法 lineage: Lineage API, sql: ビュー定義のSQLを解析, hybrid: ビューはSQL解析、テーブル等はLineage API",
+)
+@click.option(
+    "--lineage-concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    help="依存関係解析でLineage APIを並列に呼び出す最大数（--include-dependencies使用時）",
+)
+@click.option(
+    "--lineage-cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_LINEAGE_CACHE_TTL,
+    show_default=True,
+    help="Lineageキャッシュの有効期間（秒）。0を指定するとキャッシュを使用しない",
+)
+@click.option(
+    "--refresh-lineage",
+    is_flag=True,
+    help="Lineageキャッシュを使わずにAPIから依存関係を取得し直す",
+)
+@click.option(
+    "--metadata-source",
+    type=click.Choice([m.value for m in MetadataSource]),
+    default=MetadataSource.INFORMATION_SCHEMA.value,
+    help="メタデータの取得方法 information-schema: INFORMATION_SCHEMAへのクエリ（データセット単位）, api: tables.list/tables.get API, region: リージョン単位のINFORMATION_SCHEMAへのクエリ",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    help="BigQuery APIのHTTPのコネクションプールのサイズ（省略時は並列数に合わせる）",
+)
+def plan_cmd(
+    project_id: str,
+    dataset: Optional[str],
+    datasets: Optional[str],
+    output_dir: str,
+    plan_file: str,
+    naming_preset: str,
+    include_views: Optional[str],
+    exclude_views: Optional[str],
+    non_interactive: bool,
+    on_conflict: str,
+    write_mode: str,
+    yml_prefix: Optional[str],
+    include_dependencies: bool,
+    location: str,
+    debug: bool,
+    max_depth: int,
+    dependency_backend: str,
+    lineage_concurrency: int,
+    lineage_cache_ttl: int,
+    refresh_lineage: bool,
+    metadata_source: str,
+    pool_size: Optional[int],
+) -> None:
+    """インポート計画を作成します。
+
+    ビュー一覧の取得、フィルタリング、依存関係の解決、既存ファイルの確認を行い、
+    結果をJSONファイルに保存します。`bq2dbt import apply` で実行できます。
+    """
+    if dataset and datasets:
+        raise click.UsageError("--dataset と --datasets は同時に指定できません")
+    if not (dataset or datasets):
+        raise click.UsageError("--dataset または --datasets を指定してください")
+
+    dataset_list = (
+        [d.strip() for d in datasets.split(",") if d.strip()] if datasets else None
+    )
+
+    # BigQuery/Lineageクライアントの読み込みはコマンド実行時まで遅延させる
+    from bq2dbt.converter.importer import plan_import
+
+    plan_import(
+        project_id=project_id,
+        dataset=dataset,
+        output_dir=Path(output_dir),
+        plan_file=Path(plan_file),
+        naming_preset=naming_preset,
+        include_views=include_views.split(",") if include_views else None,
+        exclude_views=exclude_views.split(",") if exclude_views else None,
+        non_interactive=non_interactive,
+        on_conflict=on_conflict,
+        yml_prefix=yml_prefix,
+        include_dependencies=include_dependencies,
+        write_mode=write_mode,
+        location=location,
+        debug=debug,
+        max_depth=max_depth,
+        lineage_concurrency=lineage_concurrency,
+        lineage_cache_ttl=lineage_cache_ttl,
+        refresh_lineage=refresh_lineage,
+        dependency_backend=dependency_backend,
+        metadata_source=metadata_source,
+        datasets=dataset_list,
+        pool_size=pool_size,
+    )
+
+
+@click.command(name="apply")
+@click.argument("plan_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--sql-template",
+    type=click.Path(exists=True, dir_okay=False),
+    help="SQLモデル用のJinja2テンプレートファイル",
+)
+@click.option(
+    "--yml-template",
+    type=click.Path(exists=True, dir_okay=False),
+    help="YAMLモデル用のJinja2テンプレートファイル",
+)
+@click.option(
+    "--template-cache",
+    is_flag=True,
+    help="コンパイル済みテンプレートを ~/.bq2dbt/cache/jinja に保存して再利用",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="実際にファイルを作成せずに実行",
+)
+@click.option(
+    "--shard",
+    default="1/1",
+    callback=parse_shard,
+    help="計画のビューをn個に分割し、i番目のみを実行（i/n の形式、例: 2/4）",
+)
+@click.option(
+    "--debug",
+    is_flag=True,
+    help="デバッグモードを有効化",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="ビュー変換の並列数",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    help="BigQuery APIのHTTPのコネクションプールのサイズ（省略時は並列数に合わせる）",
+)
+def apply_cmd(
+    plan_file: str,
+    sql_template: Optional[str],
+    yml_template: Optional[str],
+    template_cache: bool,
+    dry_run: bool,
+    shard: Tuple[int, int],
+    debug: bool,
+    jobs: int,
+    pool_size: Optional[int],
+) -> None:
+    """保存したインポート計画を実行します。
+
+    ビュー一覧の取得や依存関係の解決は行わず、計画に含まれるビューの
+    メタデータの取得、レンダリング、書き込みのみを行います。
+    """
+    # BigQuery/Lineageクライアントの読み込みはコマンド実行時まで遅延させる
+    from bq2dbt.converter.importer import apply_import_plan
+
+    apply_import_plan(
+        Path(plan_file),
+        sql_template=sql_template,
+        yml_template=yml_template,
+        template_cache=template_cache,
+        dry_run=dry_run,
+        debug=debug,
+        jobs=jobs,
+        shard=shard,
+        pool_size=pool_size,
+    )
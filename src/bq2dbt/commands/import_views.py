@@ -1,24 +1,31 @@
 """BigQueryビューをdbtモデルにインポートするコマンド"""
+import logging
 from pathlib import Path
 from typing import Optional
 
 import click
 from rich.console import Console
 
-from bq2dbt.converter.importer import import_views as import_views_func
+from bq2dbt.converter.bigquery import MetadataSource
+from bq2dbt.converter.dependency import DependencyBackend
+from bq2dbt.converter.generator import ConflictPolicy, WriteMode
+from bq2dbt.utils.cache import DEFAULT_LINEAGE_CACHE_TTL
 from bq2dbt.utils.naming import NamingPreset
+from bq2dbt.utils.profiling import profiler
 
 
 @click.command(name="views")
 @click.option(
     "--project-id",
-    required=True,
-    help="BigQueryプロジェクトID",
+    help="BigQueryプロジェクトID（--from-snapshot使用時は省略可）",
 )
 @click.option(
     "--dataset",
-    required=True,
-    help="インポート対象のBigQueryデータセット",
+    help="インポート対象のBigQueryデータセット（--from-snapshot使用時は省略可）",
+)
+@click.option(
+    "--datasets",
+    help="インポート対象の複数のBigQueryデータセット（カンマ区切り、--datasetの代わりに指定）",
 )
 @click.option(
     "--output-dir",
@@ -50,6 +57,12 @@ from bq2dbt.utils.naming import NamingPreset
     is_flag=True,
     help="インタラクティブな確認をスキップ",
 )
+@click.option(
+    "--on-conflict",
+    type=click.Choice([p.value for p in ConflictPolicy]),
+    default=ConflictPolicy.ASK.value,
+    help="既存ファイルがあるビューの扱い ask: 変換前に一覧を表示してまとめて選択（--non-interactive時は上書き）, overwrite: すべて上書き, skip: すべてスキップ, changed: 内容が変わったファイルのみ上書き",
+)
 @click.option(
     "--sql-template",
     type=click.Path(exists=True, dir_okay=False),
@@ -60,6 +73,17 @@ from bq2dbt.utils.naming import NamingPreset
     type=click.Path(exists=True, dir_okay=False),
     help="YAMLモデル用のJinja2テンプレートファイル",
 )
+@click.option(
+    "--template-cache",
+    is_flag=True,
+    help="コンパイル済みテンプレートを ~/.bq2dbt/cache/jinja に保存して再利用",
+)
+@click.option(
+    "--write-mode",
+    type=click.Choice([m.value for m in WriteMode]),
+    default=WriteMode.ALWAYS.value,
+    help="モデルファイルの書き込み方法 always: 常に書き込む, changed: 内容が変わった場合のみ書き込む（更新日時を維持し、dbtの部分パースを有効に保つ）",
+)
 @click.option(
     "--yml-prefix",
     help="YAMLモデルの接頭辞(e.g. '_' -> _model_name.yml)",
@@ -85,24 +109,101 @@ from bq2dbt.utils.naming import NamingPreset
     default=3,
     help="依存関係の最大深度（--include-dependencies使用時）",
 )
+@click.option(
+    "--dependency-backend",
+    type=click.Choice([b.value for b in DependencyBackend]),
+    default=DependencyBackend.LINEAGE.value,
+    help="依存関係の解析方法 lineage: Lineage API, sql: ビュー定義のSQLを解析（API呼び出しなし）, hybrid: ビューはSQL解析、テーブル等はLineage API",
+)
+@click.option(
+    "--lineage-concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    help="依存関係解析でLineage APIを並列に呼び出す最大数（--include-dependencies使用時）",
+)
+@click.option(
+    "--lineage-cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_LINEAGE_CACHE_TTL,
+    show_default=True,
+    help="Lineageキャッシュの有効期間（秒）。0を指定するとキャッシュを使用しない",
+)
+@click.option(
+    "--refresh-lineage",
+    is_flag=True,
+    help="Lineageキャッシュを使わずにAPIから依存関係を取得し直す",
+)
+@click.option(
+    "--metadata-source",
+    type=click.Choice([m.value for m in MetadataSource]),
+    default=MetadataSource.INFORMATION_SCHEMA.value,
+    help="メタデータの取得方法 information-schema: INFORMATION_SCHEMAへのクエリ（データセット単位）, api: tables.list/tables.get API（クエリジョブを作成しない）, region: リージョン単位のINFORMATION_SCHEMAへのクエリ（依存先を含む全データセットを1回で取得）",
+)
+@click.option(
+    "--from-snapshot",
+    type=click.Path(exists=True, dir_okay=False),
+    help="`bq2dbt snapshot` で保存したファイルからメタデータを読み込む（ネットワークに接続しない）",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="ビュー一覧の取得から書き込みまでをストリーミングで実行（確認プロンプトなし、--include-dependenciesとは併用不可）",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="同じ条件で中断したインポートを ~/.bq2dbt/checkpoints のチェックポイントから再開（依存関係の解決を省略し、完了済みのビューをスキップ）",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="段階ごとの処理時間とAPI呼び出しのレイテンシを計測し、集計表を表示してログと同じ場所にJSONレポートを保存",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="ビュー変換の並列数",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    help="BigQuery APIのHTTPのコネクションプールのサイズ（省略時は並列数に合わせる）",
+)
 @click.pass_context
 def import_views(
     ctx: click.Context,
-    project_id: str,
-    dataset: str,
+    project_id: Optional[str],
+    dataset: Optional[str],
+    datasets: Optional[str],
     output_dir: str,
     naming_preset: str,
     dry_run: bool,
     include_views: Optional[str],
     exclude_views: Optional[str],
     non_interactive: bool,
+    on_conflict: str,
     sql_template: Optional[str],
     yml_template: Optional[str],
+    template_cache: bool,
+    write_mode: str,
     yml_prefix: Optional[str],
     include_dependencies: bool,
     location: str,
     debug: bool,
     max_depth: int,
+    dependency_backend: str,
+    lineage_concurrency: int,
+    lineage_cache_ttl: int,
+    refresh_lineage: bool,
+    metadata_source: str,
+    from_snapshot: Optional[str],
+    stream: bool,
+    resume: bool,
+    profile: bool,
+    jobs: int,
+    pool_size: Optional[int],
 ) -> None:
     """BigQueryビューをdbtモデルにインポートします。
 
@@ -111,6 +212,26 @@ def import_views(
     verbose = ctx.obj.get("VERBOSE", False)
     console = Console(highlight=False)
 
+    if dataset and datasets:
+        raise click.UsageError("--dataset と --datasets は同時に指定できません")
+    if from_snapshot and datasets:
+        raise click.UsageError("--from-snapshot と --datasets は同時に指定できません")
+    if stream and include_dependencies:
+        raise click.UsageError("--stream と --include-dependencies は同時に指定できません")
+    if stream and resume:
+        raise click.UsageError("--stream と --resume は同時に指定できません")
+    if dry_run and resume:
+        raise click.UsageError("--dry-run と --resume は同時に指定できません")
+    if not from_snapshot and not (project_id and (dataset or datasets)):
+        raise click.UsageError(
+            "--project-id と --dataset を指定してください（--from-snapshot 使用時は省略可）"
+        )
+
+    # datasetsをリストに変換
+    dataset_list = (
+        [d.strip() for d in datasets.split(",") if d.strip()] if datasets else None
+    )
+
     # include_viewsとexclude_viewsをリストに変換
     include_patterns = include_views.split(",") if include_views else None
     exclude_patterns = exclude_views.split(",") if exclude_views else None
@@ -118,21 +239,46 @@ def import_views(
     # 出力ディレクトリをPathオブジェクトに変換
     output_path = Path(output_dir)
 
+    # BigQuery/Lineageクライアントの読み込みはコマンド実行時まで遅延させる
+    from bq2dbt.converter.importer import import_views as import_views_func
+    from bq2dbt.converter.importer import report_profile
+
+    if profile:
+        profiler.enable()
+
     # 実際のインポート処理を実行
-    import_views_func(
-        project_id=project_id,
-        dataset=dataset,
-        output_dir=output_path,
-        naming_preset=naming_preset,
-        dry_run=dry_run,
-        include_views=include_patterns,
-        exclude_views=exclude_patterns,
-        non_interactive=non_interactive,
-        sql_template=sql_template,
-        yml_template=yml_template,
-        yml_prefix=yml_prefix,
-        include_dependencies=include_dependencies,
-        location=location,
-        debug=debug,
-        max_depth=max_depth,
-    )
+    try:
+        import_views_func(
+            project_id=project_id,
+            dataset=dataset,
+            output_dir=output_path,
+            naming_preset=naming_preset,
+            dry_run=dry_run,
+            include_views=include_patterns,
+            exclude_views=exclude_patterns,
+            non_interactive=non_interactive,
+            sql_template=sql_template,
+            yml_template=yml_template,
+            template_cache=template_cache,
+            write_mode=write_mode,
+            yml_prefix=yml_prefix,
+            include_dependencies=include_dependencies,
+            location=location,
+            debug=debug,
+            max_depth=max_depth,
+            jobs=jobs,
+            lineage_concurrency=lineage_concurrency,
+            lineage_cache_ttl=lineage_cache_ttl,
+            refresh_lineage=refresh_lineage,
+            dependency_backend=dependency_backend,
+            from_snapshot=Path(from_snapshot) if from_snapshot else None,
+            metadata_source=metadata_source,
+            datasets=dataset_list,
+            stream=stream,
+            on_conflict=on_conflict,
+            resume=resume,
+            pool_size=pool_size,
+        )
+    finally:
+        if profile:
+            report_profile(console, logging.getLogger("bq2dbt"))
@@ -2,6 +2,7 @@
 
 import click
 
+from bq2dbt.commands.import_plan import apply_cmd, plan_cmd
 from bq2dbt.commands.import_views import import_views
 
 
@@ -16,3 +17,5 @@ def import_cmd() -> None:
 
 # サブコマンドの登録
 import_cmd.add_command(import_views)
+import_cmd.add_command(plan_cmd)
+import_cmd.add_command(apply_cmd)
@@ -0,0 +1,107 @@
+"""メタデータスナップショットコマンドモジュール。"""
+
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from bq2dbt.converter.bigquery import MetadataSource
+from bq2dbt.converter.dependency import DependencyBackend
+
+
+@click.command(name="snapshot")
+@click.option(
+    "--project-id",
+    required=True,
+    help="BigQueryプロジェクトID",
+)
+@click.option(
+    "--dataset",
+    required=True,
+    help="スナップショットを作成するBigQueryデータセット",
+)
+@click.option(
+    "--output",
+    "output_file",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="スナップショットの保存先ファイル（例: snapshot.json.gz）",
+)
+@click.option(
+    "--location",
+    default="asia-northeast1",
+    help="BigQueryのロケーション",
+)
+@click.option(
+    "--include-dependencies",
+    is_flag=True,
+    help="依存関係と依存先のメタデータも保存",
+)
+@click.option(
+    "--max-depth",
+    type=int,
+    default=3,
+    help="依存関係の最大深度（--include-dependencies使用時）",
+)
+@click.option(
+    "--dependency-backend",
+    type=click.Choice([b.value for b in DependencyBackend]),
+    default=DependencyBackend.LINEAGE.value,
+    help="依存関係の解析方法 lineage: Lineage API, sql: ビュー定義のSQLを解析, hybrid: ビューはSQL解析、テーブル等はLineage API",
+)
+@click.option(
+    "--lineage-concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    help="依存関係解析でLineage APIを並列に呼び出す最大数（--include-dependencies使用時）",
+)
+@click.option(
+    "--metadata-source",
+    type=click.Choice([m.value for m in MetadataSource]),
+    default=MetadataSource.INFORMATION_SCHEMA.value,
+    help="メタデータの取得方法 information-schema: INFORMATION_SCHEMAへのクエリ（データセット単位）, api: tables.list/tables.get API（クエリジョブを作成しない）, region: リージョン単位のINFORMATION_SCHEMAへのクエリ（依存先を含む全データセットを1回で取得）",
+)
+@click.option(
+    "--debug",
+    is_flag=True,
+    help="デバッグモードを有効化",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    help="BigQuery APIのHTTPのコネクションプールのサイズ（省略時は並列数に合わせる）",
+)
+def snapshot_cmd(
+    project_id: str,
+    dataset: str,
+    output_file: str,
+    location: str,
+    include_dependencies: bool,
+    max_depth: int,
+    dependency_backend: str,
+    lineage_concurrency: int,
+    metadata_source: str,
+    debug: bool,
+    pool_size: Optional[int],
+) -> None:
+    """データセットのメタデータをスナップショットファイルに保存します。
+
+    保存したファイルは `bq2dbt import views --from-snapshot` で読み込み、
+    ネットワークに接続せずにモデルを生成できます。
+    """
+    # BigQuery/Lineageクライアントの読み込みはコマンド実行時まで遅延させる
+    from bq2dbt.converter.importer import snapshot_dataset
+
+    snapshot_dataset(
+        project_id=project_id,
+        dataset=dataset,
+        output_file=Path(output_file),
+        location=location,
+        include_dependencies=include_dependencies,
+        max_depth=max_depth,
+        lineage_concurrency=lineage_concurrency,
+        dependency_backend=dependency_backend,
+        metadata_source=metadata_source,
+        debug=debug,
+        pool_size=pool_size,
+    )
@@ -3,32 +3,195 @@
 BigQueryのビュー取得と定義取得を行うクライアントを提供します。
 """
 
+import json
 import logging
 import re
-from typing import Dict, List, Optional
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
-from google.cloud import bigquery
+from bq2dbt.utils.api_metrics import api_metrics
+from bq2dbt.utils.patterns import (
+    is_simple_pattern,
+    match_any,
+    pattern_to_like,
+    pattern_to_regex,
+)
+from bq2dbt.utils.profiling import profiled
+
+if TYPE_CHECKING:
+    from bq2dbt.converter.clients import ClientFactory
 
 logger = logging.getLogger(__name__)
 
+# BigQuery APIの接続先を上書きする環境変数（例: http://localhost:9050）
+API_ENDPOINT_ENV = "BQ2DBT_BIGQUERY_API_ENDPOINT"
+
+# tables.list APIのテーブルタイプ -> INFORMATION_SCHEMA.TABLESのテーブルタイプ
+_API_TABLE_TYPES = {
+    "TABLE": "BASE TABLE",
+    "MATERIALIZED_VIEW": "MATERIALIZED VIEW",
+}
+
+# INFORMATION_SCHEMA.TABLE_OPTIONSのlabelsの値 (例: [STRUCT("env", "prod")])
+_LABEL_PATTERN = re.compile(
+    r'STRUCT\(\s*("(?:[^"\\]|\\.)*")\s*,\s*("(?:[^"\\]|\\.)*")\s*\)'
+)
+
+
+class MetadataSource(str, Enum):
+    """メタデータの取得方法。"""
+
+    # INFORMATION_SCHEMAへのクエリ（データセットごとにクエリジョブを作成）
+    INFORMATION_SCHEMA = "information-schema"
+    # tables.list / tables.get API（クエリジョブを作成しない）
+    API = "api"
+    # リージョン単位のINFORMATION_SCHEMAへのクエリ（プロジェクトごとに1回のみ）
+    REGION = "region"
+
+
+class ColumnSchema(TypedDict):
+    """カラム（ネストしたフィールドを含む）のスキーマ情報。
+
+    Attributes:
+        name: フィールドパス（ネストしたフィールドは "address.city" のようにドット区切り）
+        type: データ型（STRUCTは "RECORD"、ARRAYは要素の型）
+        description: 説明
+        mode: "NULLABLE"、"REQUIRED"、"REPEATED" のいずれか
+    """
+
+    name: str
+    type: str
+    description: str
+    mode: str
+
+
+# INFORMATION_SCHEMA.COLUMN_FIELD_PATHSの1行 (フィールドパス, データ型, 説明, NULL許容)
+_FieldPathRow = Tuple[str, str, Optional[str], Optional[str]]
+
+
+@dataclass
+class DatasetCatalog:
+    """データセット単位でまとめて取得したメタデータ。
+
+    テーブルタイプ、ビュー定義、カラムスキーマをデータセットごとに1クエリずつで取得し、
+    ビュー単位の問い合わせをメモリ上で解決するために使用します。
+
+    Attributes:
+        project_id: プロジェクトID
+        dataset_id: データセットID
+        table_types: テーブル名 -> テーブルタイプ
+        view_definitions: ビュー名 -> ビューのSQL定義
+        schemas: ビュー名 -> スキーマ情報のリスト（ネストしたフィールドを含む）
+        descriptions: テーブル名 -> テーブルの説明
+        labels: テーブル名 -> ラベル
+        modified: テーブル名 -> 最終更新日時（ISO 8601形式、取得できた場合のみ）
+    """
+
+    project_id: str
+    dataset_id: str
+    table_types: Dict[str, str] = field(default_factory=dict)
+    view_definitions: Dict[str, str] = field(default_factory=dict)
+    schemas: Dict[str, List[ColumnSchema]] = field(default_factory=dict)
+    descriptions: Dict[str, str] = field(default_factory=dict)
+    labels: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    modified: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ViewMetadata:
+    """1回の問い合わせで取得したビューのメタデータ。
+
+    Attributes:
+        fully_qualified_name: ビューの完全修飾名
+        table_type: テーブルの種類（存在しない場合は空文字列）
+        view_query: ビューのSQL定義（ビューでない場合は空文字列）
+        schema: スキーマ情報のタプル
+        description: テーブルの説明
+        labels: ラベル
+        modified: 最終更新日時（取得できない場合はNone）
+    """
+
+    fully_qualified_name: str
+    table_type: str
+    view_query: str = ""
+    schema: Tuple[ColumnSchema, ...] = ()
+    description: str = ""
+    labels: Dict[str, str] = field(default_factory=dict)
+    modified: Optional[datetime] = None
+
 
 class BigQueryClient:
     """BigQuery APIとの通信を行うクライアントクラス。"""
 
-    def __init__(self, project_id: str, location: str = "asia-northeast1"):
+    def __init__(
+        self,
+        project_id: str,
+        location: str = "asia-northeast1",
+        metadata_source: MetadataSource = MetadataSource.INFORMATION_SCHEMA,
+        client_factory: Optional["ClientFactory"] = None,
+    ):
         """BigQueryクライアントを初期化します。
 
         Args:
             project_id: BigQueryプロジェクトID
             location: Google Cloudのロケーション（デフォルト: asia-northeast1）
+            metadata_source: メタデータの取得方法
+            client_factory: 認証情報と接続を共有するファクトリー（省略時は単独で作成）
         """
         self.project_id = project_id
         self.location = location
-        self.client = bigquery.Client(project=project_id)
+        self.metadata_source = MetadataSource(metadata_source)
+        self.client_factory = client_factory
+        self.client = self._create_client()
+        # (プロジェクトID, データセットID) -> 読み込み済みのカタログ
+        self._catalogs: Dict[Tuple[str, str], DatasetCatalog] = {}
+        # 読み込みに失敗したデータセット（再試行しない）
+        self._catalog_errors: Dict[Tuple[str, str], Exception] = {}
+        # リージョン単位で全データセットを読み込み済みのプロジェクト
+        self._region_projects: Set[str] = set()
+        # _catalog_lock は辞書の参照と更新のみに使い、問い合わせ中は保持しない
+        self._catalog_lock = threading.Lock()
+        # 同じデータセットを重複して読み込まないためのデータセットごとのロック
+        self._dataset_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        # リージョン単位の問い合わせを重複して実行しないためのロック
+        self._region_lock = threading.Lock()
         logger.debug(
             f"BigQueryクライアントを初期化しました: プロジェクト={project_id}, ロケーション={location}"
         )
 
+    def _create_client(self) -> Any:
+        """BigQuery APIのクライアントを作成します。
+
+        クライアントは ClientFactory が作成します。ファクトリーが指定されていない場合は、
+        このクライアント専用のファクトリーを作成します（LineageClientと共有できます）。
+        環境変数 BQ2DBT_BIGQUERY_API_ENDPOINT が設定されている場合は、
+        認証を行わずにその接続先を使用します。
+
+        Returns:
+            google.cloud.bigquery.Client
+        """
+        if self.client_factory is None:
+            # clients は本モジュールを参照するため、作成時に読み込む
+            from bq2dbt.converter.clients import ClientFactory
+
+            self.client_factory = ClientFactory()
+        return self.client_factory.bigquery_client(self.project_id)
+
+    @profiled("bigquery.list_views")
     def list_views(
         self,
         dataset_id: str,
@@ -45,53 +208,141 @@ class BigQueryClient:
         Returns:
             ビューの完全修飾名のリスト (例: ["project.dataset.view1", "project.dataset.view2"])
         """
+        filtered_views = list(
+            self.iter_views(dataset_id, include_patterns, exclude_patterns)
+        )
+        logger.debug(f"{len(filtered_views)}個のビューが見つかりました")
+        return filtered_views
+
+    def iter_views(
+        self,
+        dataset_id: str,
+        include_patterns: Optional[List[str]] = None,
+        exclude_patterns: Optional[List[str]] = None,
+    ) -> Iterator[str]:
+        """データセット内のビューを、クエリ結果の取得に合わせて順次返します。
+
+        全件の取得を待たずに最初のビューから処理を始められます。
+
+        Args:
+            dataset_id: データセットID
+            include_patterns: 含めるビューのパターン（省略可）
+            exclude_patterns: 除外するビューのパターン（省略可）
+
+        Yields:
+            ビューの完全修飾名
+        """
         dataset_ref = f"{self.project_id}.{dataset_id}"
         logger.info(f"データセット {dataset_ref} のビュー一覧を取得します")
 
-        # Information Schemaからビュー一覧を取得
+        include_patterns = tuple(include_patterns or ())
+        exclude_patterns = tuple(exclude_patterns or ())
+
+        # パターンはクエリの条件として適用し、取得した行にも同じ条件で再確認する
+        for view_name in self._list_view_names(
+            dataset_id, include_patterns, exclude_patterns
+        ):
+            if include_patterns and not match_any(view_name, include_patterns):
+                continue
+            if exclude_patterns and match_any(view_name, exclude_patterns):
+                continue
+            yield f"{self.project_id}.{dataset_id}.{view_name}"
+
+    def _list_view_names(
+        self,
+        dataset_id: str,
+        include_patterns: Tuple[str, ...] = (),
+        exclude_patterns: Tuple[str, ...] = (),
+    ) -> Iterable[str]:
+        """INFORMATION_SCHEMAからデータセット内のビュー名を取得します。
+
+        パターンはクエリパラメータとしてWHERE句に渡し、BigQuery側で絞り込みます。
+        `*` のみを含むパターンはLIKE、それ以外はREGEXP_CONTAINSで評価します。
+        カタログが読み込み済みの場合、またはメタデータの取得方法がAPIかリージョンの場合は
+        カタログから取得します。
+
+        Args:
+            dataset_id: データセットID
+            include_patterns: 含めるビューのパターン
+            exclude_patterns: 除外するビューのパターン
+
+        Returns:
+            ビュー名のイテラブル（名前順、クエリ結果はページごとに順次取得）
+        """
+        # 読み込み済み（API・リージョンの場合は読み込んだ）カタログを再利用する
+        # （パターンは呼び出し元で適用）
+        catalog = self.get_catalog(self.project_id, dataset_id)
+        if catalog is not None:
+            return sorted(
+                name
+                for name, table_type in catalog.table_types.items()
+                if table_type == "VIEW"
+            )
+
+        from google.cloud import bigquery
+
+        parameters = []
+
+        def predicate(pattern: str, name: str) -> str:
+            if is_simple_pattern(pattern):
+                parameters.append(
+                    bigquery.ScalarQueryParameter(
+                        name, "STRING", pattern_to_like(pattern)
+                    )
+                )
+                return f"table_name LIKE @{name}"
+            parameters.append(
+                bigquery.ScalarQueryParameter(
+                    name, "STRING", pattern_to_regex(pattern)
+                )
+            )
+            return f"REGEXP_CONTAINS(table_name, @{name})"
+
+        conditions = []
+        if include_patterns:
+            predicates = [
+                predicate(pattern, f"include_{i}")
+                for i, pattern in enumerate(include_patterns)
+            ]
+            conditions.append(f"({' OR '.join(predicates)})")
+        if exclude_patterns:
+            predicates = [
+                predicate(pattern, f"exclude_{i}")
+                for i, pattern in enumerate(exclude_patterns)
+            ]
+            conditions.append(f"NOT ({' OR '.join(predicates)})")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
         query = f"""
             SELECT
               table_name
             FROM
-              `{dataset_ref}.INFORMATION_SCHEMA.VIEWS`
+              `{self.project_id}.{dataset_id}.INFORMATION_SCHEMA.VIEWS`
+            {where}
             ORDER BY
               table_name
         """
 
-        query_job = self.client.query(query, location=self.location)
-        rows = list(query_job)
-
-        # パターンフィルタリングを適用
-        filtered_views = []
-        for row in rows:
-            view_name = row.table_name
-            fully_qualified_name = f"{self.project_id}.{dataset_id}.{view_name}"
-
-            # 含めるパターンによるフィルタリング
-            if include_patterns:
-                include_match = False
-                for pattern in include_patterns:
-                    # 簡易的なパターンマッチング（*を使用）
-                    if self._match_pattern(view_name, pattern):
-                        include_match = True
-                        break
-                if not include_match:
-                    continue  # マッチしない場合はスキップ
-
-            # 除外パターンによるフィルタリング
-            if exclude_patterns:
-                exclude_match = False
-                for pattern in exclude_patterns:
-                    if self._match_pattern(view_name, pattern):
-                        exclude_match = True
-                        break
-                if exclude_match:
-                    continue  # マッチする場合はスキップ
-
-            filtered_views.append(fully_qualified_name)
+        job_config = bigquery.QueryJobConfig(query_parameters=parameters)
+        return (row.table_name for row in self._query(query, job_config))
 
-        logger.debug(f"{len(filtered_views)}個のビューが見つかりました")
-        return filtered_views
+    def _query(self, query: str, job_config: Any = None) -> Iterator[Any]:
+        """クエリジョブを実行し、結果の行を順に返します。
+
+        全ての行を返した後、ジョブの処理バイト数とスロット時間を記録します。
+
+        Args:
+            query: SQL
+            job_config: クエリの設定（省略可）
+
+        Yields:
+            クエリ結果の行
+        """
+        query_job = self.client.query(
+            query, location=self.location, job_config=job_config
+        )
+        yield from query_job
+        api_metrics.record_query_job(query_job)
 
     def _match_pattern(self, text: str, pattern: str) -> bool:
         """簡易的なパターンマッチングを行います。
@@ -103,10 +354,547 @@ class BigQueryClient:
         Returns:
             マッチする場合はTrue、しない場合はFalse
         """
-        # *をワイルドカードとして扱い、正規表現に変換
-        regex_pattern = pattern.replace("*", ".*")
-        return bool(re.match(f"^{regex_pattern}$", text))
+        return match_any(text, (pattern,))
+
+    def load_catalog(
+        self, dataset_id: str, project_id: Optional[str] = None
+    ) -> DatasetCatalog:
+        """データセット全体のメタデータを一括で取得してキャッシュします。
+
+        INFORMATION_SCHEMAのTABLES、VIEWS、COLUMNS、TABLE_OPTIONSを
+        それぞれ1回ずつ問い合わせるため、
+        問い合わせ回数はビュー数ではなくデータセット数に比例します。
+        読み込み後は get_table_type、get_view_definition、get_view_schema が
+        このデータセットに対してメモリ上のカタログから結果を返します。
+
+        Args:
+            dataset_id: データセットID
+            project_id: プロジェクトID（省略時はクライアントのプロジェクト）
+
+        Returns:
+            読み込まれたデータセットカタログ
+
+        Raises:
+            Exception: メタデータを取得できない場合（同じデータセットの再読み込みは行いません）
+        """
+        project_id = project_id or self.project_id
+        key = (project_id, dataset_id)
+
+        # 複数スレッドから同じデータセットを重複して読み込まないようにする
+        # （異なるデータセットの読み込みは並列に行う）
+        with self._catalog_lock:
+            if key in self._catalogs:
+                return self._catalogs[key]
+            if key in self._catalog_errors:
+                raise self._catalog_errors[key]
+            dataset_lock = self._dataset_locks.setdefault(key, threading.Lock())
+
+        with dataset_lock:
+            with self._catalog_lock:
+                if key in self._catalogs:
+                    return self._catalogs[key]
+                if key in self._catalog_errors:
+                    raise self._catalog_errors[key]
+            try:
+                catalog = self._fetch_catalog(project_id, dataset_id)
+            except Exception as e:
+                with self._catalog_lock:
+                    self._catalog_errors[key] = e
+                raise
+            with self._catalog_lock:
+                return self._catalogs.setdefault(key, catalog)
+
+    @profiled("bigquery.fetch_catalog")
+    def _fetch_catalog(self, project_id: str, dataset_id: str) -> DatasetCatalog:
+        """INFORMATION_SCHEMAからデータセットのメタデータを取得します。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_id: データセットID
+
+        Returns:
+            データセットカタログ
+        """
+        if self.metadata_source == MetadataSource.API:
+            return self._fetch_catalog_from_api(project_id, dataset_id)
+        if self.metadata_source == MetadataSource.REGION:
+            return self._fetch_catalog_from_region(project_id, dataset_id)
+
+        dataset_ref = f"{project_id}.{dataset_id}"
+        logger.info(f"データセット {dataset_ref} のメタデータを一括取得します")
+        catalog = DatasetCatalog(project_id, dataset_id)
+
+        # テーブルタイプ
+        query = f"""
+            SELECT
+              table_name,
+              table_type
+            FROM
+              `{dataset_ref}.INFORMATION_SCHEMA.TABLES`
+        """
+        for row in self._query(query):
+            catalog.table_types[row["table_name"]] = row["table_type"]
+
+        # ビュー定義
+        query = f"""
+            SELECT
+              table_name,
+              view_definition
+            FROM
+              `{dataset_ref}.INFORMATION_SCHEMA.VIEWS`
+        """
+        for row in self._query(query):
+            if row["view_definition"]:
+                catalog.view_definitions[row["table_name"]] = str(
+                    row["view_definition"]
+                )
+
+        # カラムスキーマ（ネストしたフィールドを含めてCOLUMN_FIELD_PATHSから取得）
+        query = f"""
+            SELECT
+              f.table_name,
+              f.field_path,
+              f.data_type,
+              f.description,
+              c.is_nullable
+            FROM
+              `{dataset_ref}.INFORMATION_SCHEMA.COLUMN_FIELD_PATHS` AS f
+            INNER JOIN
+              `{dataset_ref}.INFORMATION_SCHEMA.COLUMNS` AS c
+            ON
+              c.table_name = f.table_name
+              AND c.column_name = f.column_name
+            WHERE
+              f.table_name IN (
+                SELECT table_name FROM `{dataset_ref}.INFORMATION_SCHEMA.VIEWS`
+              )
+            ORDER BY
+              f.table_name,
+              c.ordinal_position
+        """
+        field_paths: Dict[str, List[_FieldPathRow]] = {}
+        for row in self._query(query):
+            field_paths.setdefault(row["table_name"], []).append(
+                _field_path_row(row)
+            )
+        for table_name, rows in field_paths.items():
+            catalog.schemas[table_name] = _columns_from_field_paths(rows)
+
+        # テーブルの説明とラベル
+        query = f"""
+            SELECT
+              table_name,
+              option_name,
+              option_value
+            FROM
+              `{dataset_ref}.INFORMATION_SCHEMA.TABLE_OPTIONS`
+            WHERE
+              option_name IN ('description', 'labels')
+        """
+        for row in self._query(query):
+            if row["option_name"] == "description":
+                catalog.descriptions[row["table_name"]] = _parse_string_literal(
+                    row["option_value"]
+                )
+            else:
+                catalog.labels[row["table_name"]] = _parse_labels(row["option_value"])
+
+        logger.debug(
+            f"メタデータを取得しました: {dataset_ref} "
+            f"(テーブル {len(catalog.table_types)}件, ビュー {len(catalog.view_definitions)}件)"
+        )
+        return catalog
+
+    def load_region_catalogs(
+        self,
+        dataset_ids: Optional[Iterable[str]] = None,
+        project_id: Optional[str] = None,
+    ) -> List[DatasetCatalog]:
+        """リージョン単位のINFORMATION_SCHEMAで複数データセットのメタデータを一括取得します。
+
+        `region-<location>.INFORMATION_SCHEMA` のTABLES、VIEWS、COLUMNS、TABLE_OPTIONSを
+        それぞれ1回ずつ問い合わせるため、問い合わせ回数はデータセット数に依存しません。
+        読み込み済みのデータセットは再取得しません。
+
+        Args:
+            dataset_ids: データセットIDのリスト（省略時はリージョン内の全データセット）
+            project_id: プロジェクトID（省略時はクライアントのプロジェクト）
+
+        Returns:
+            指定したデータセットのカタログのリスト（省略時は読み込んだ全てのカタログ）
+
+        Raises:
+            Exception: メタデータを取得できない場合
+        """
+        project_id = project_id or self.project_id
+        with self._region_lock:
+            if dataset_ids is None:
+                if project_id not in self._region_projects:
+                    catalogs = self._fetch_region_catalogs(project_id)
+                    self._region_projects.add(project_id)
+                    self._register_region_catalogs(project_id, catalogs)
+                with self._catalog_lock:
+                    return [
+                        catalog
+                        for (project, _), catalog in self._catalogs.items()
+                        if project == project_id
+                    ]
+
+            dataset_ids = list(dict.fromkeys(dataset_ids))
+            with self._catalog_lock:
+                pending = [
+                    d for d in dataset_ids if (project_id, d) not in self._catalogs
+                ]
+            if pending:
+                catalogs = self._fetch_region_catalogs(project_id, pending)
+                for dataset_id in pending:
+                    catalogs.setdefault(
+                        dataset_id, DatasetCatalog(project_id, dataset_id)
+                    )
+                self._register_region_catalogs(project_id, catalogs)
+            with self._catalog_lock:
+                return [self._catalogs[(project_id, d)] for d in dataset_ids]
+
+    def _register_region_catalogs(
+        self, project_id: str, catalogs: Dict[str, DatasetCatalog]
+    ) -> None:
+        """リージョン単位で取得したカタログを登録します（読み込み済みのものは残します）。
+
+        Args:
+            project_id: プロジェクトID
+            catalogs: データセットID -> カタログ
+        """
+        with self._catalog_lock:
+            for dataset_id, catalog in catalogs.items():
+                self._catalogs.setdefault((project_id, dataset_id), catalog)
+
+    def _fetch_catalog_from_region(
+        self, project_id: str, dataset_id: str
+    ) -> DatasetCatalog:
+        """リージョン内の全データセットのメタデータを読み込み、指定したカタログを返します。
+
+        プロジェクトごとに最初の1回だけ問い合わせ、同じプロジェクトの他のデータセットの
+        カタログも同時に登録します。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_id: データセットID
+
+        Returns:
+            データセットカタログ（リージョン内に存在しない場合は空のカタログ）
+        """
+        with self._region_lock:
+            if project_id not in self._region_projects:
+                catalogs = self._fetch_region_catalogs(project_id)
+                self._region_projects.add(project_id)
+                self._register_region_catalogs(
+                    project_id,
+                    {
+                        other_id: catalog
+                        for other_id, catalog in catalogs.items()
+                        if other_id != dataset_id
+                    },
+                )
+                if dataset_id in catalogs:
+                    return catalogs[dataset_id]
+
+        # 他のスレッドのリージョン単位の読み込みで登録済みの場合
+        with self._catalog_lock:
+            registered = self._catalogs.get((project_id, dataset_id))
+        if registered is not None:
+            return registered
+
+        logger.warning(
+            f"リージョン {self.location} にデータセットが見つかりません: "
+            f"{project_id}.{dataset_id}"
+        )
+        return DatasetCatalog(project_id, dataset_id)
+
+    @profiled("bigquery.fetch_region_catalogs")
+    def _fetch_region_catalogs(
+        self, project_id: str, dataset_ids: Optional[List[str]] = None
+    ) -> Dict[str, DatasetCatalog]:
+        """リージョン単位のINFORMATION_SCHEMAからデータセットごとのメタデータを取得します。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_ids: データセットIDのリスト（省略時はリージョン内の全データセット）
+
+        Returns:
+            データセットID -> データセットカタログ
+        """
+        from google.cloud import bigquery
+
+        region_ref = f"{project_id}.region-{self.location.lower()}"
+        logger.info(
+            f"リージョン {region_ref} のメタデータを一括取得します "
+            f"(データセット: {', '.join(dataset_ids) if dataset_ids else '全て'})"
+        )
+
+        parameters = []
+        if dataset_ids:
+            parameters.append(
+                bigquery.ArrayQueryParameter("datasets", "STRING", dataset_ids)
+            )
+
+        def dataset_filter(column: str) -> str:
+            return f"{column} IN UNNEST(@datasets)" if dataset_ids else "TRUE"
+
+        def run(query: str) -> Iterator[Any]:
+            job_config = bigquery.QueryJobConfig(query_parameters=parameters)
+            return self._query(query, job_config)
+
+        catalogs: Dict[str, DatasetCatalog] = {}
+
+        def catalog_of(row: Any) -> DatasetCatalog:
+            dataset_id = row["table_schema"]
+            if dataset_id not in catalogs:
+                catalogs[dataset_id] = DatasetCatalog(project_id, dataset_id)
+            return catalogs[dataset_id]
+
+        # テーブルタイプ
+        query = f"""
+            SELECT
+              table_schema,
+              table_name,
+              table_type
+            FROM
+              `{region_ref}.INFORMATION_SCHEMA.TABLES`
+            WHERE
+              {dataset_filter("table_schema")}
+        """
+        for row in run(query):
+            catalog_of(row).table_types[row["table_name"]] = row["table_type"]
+
+        # ビュー定義
+        query = f"""
+            SELECT
+              table_schema,
+              table_name,
+              view_definition
+            FROM
+              `{region_ref}.INFORMATION_SCHEMA.VIEWS`
+            WHERE
+              {dataset_filter("table_schema")}
+        """
+        for row in run(query):
+            if row["view_definition"]:
+                catalog_of(row).view_definitions[row["table_name"]] = str(
+                    row["view_definition"]
+                )
+
+        # カラムスキーマ（ネストしたフィールドを含めてCOLUMN_FIELD_PATHSから取得）
+        query = f"""
+            SELECT
+              f.table_schema,
+              f.table_name,
+              f.field_path,
+              f.data_type,
+              f.description,
+              c.is_nullable
+            FROM
+              `{region_ref}.INFORMATION_SCHEMA.COLUMN_FIELD_PATHS` AS f
+            INNER JOIN
+              `{region_ref}.INFORMATION_SCHEMA.COLUMNS` AS c
+            ON
+              c.table_schema = f.table_schema
+              AND c.table_name = f.table_name
+              AND c.column_name = f.column_name
+            INNER JOIN
+              `{region_ref}.INFORMATION_SCHEMA.VIEWS` AS v
+            ON
+              v.table_schema = f.table_schema
+              AND v.table_name = f.table_name
+            WHERE
+              {dataset_filter("f.table_schema")}
+            ORDER BY
+              f.table_schema,
+              f.table_name,
+              c.ordinal_position
+        """
+        field_paths: Dict[Tuple[str, str], List[_FieldPathRow]] = {}
+        for row in run(query):
+            key = (row["table_schema"], row["table_name"])
+            if key not in field_paths:
+                catalog_of(row)
+                field_paths[key] = []
+            field_paths[key].append(_field_path_row(row))
+        for (dataset_id, table_name), rows in field_paths.items():
+            catalogs[dataset_id].schemas[table_name] = _columns_from_field_paths(rows)
+
+        # テーブルの説明とラベル
+        query = f"""
+            SELECT
+              table_schema,
+              table_name,
+              option_name,
+              option_value
+            FROM
+              `{region_ref}.INFORMATION_SCHEMA.TABLE_OPTIONS`
+            WHERE
+              option_name IN ('description', 'labels')
+              AND {dataset_filter("table_schema")}
+        """
+        for row in run(query):
+            catalog = catalog_of(row)
+            if row["option_name"] == "description":
+                catalog.descriptions[row["table_name"]] = _parse_string_literal(
+                    row["option_value"]
+                )
+            else:
+                catalog.labels[row["table_name"]] = _parse_labels(row["option_value"])
+
+        logger.debug(
+            f"メタデータを取得しました: {region_ref} (データセット {len(catalogs)}件)"
+        )
+        return catalogs
+
+    def _fetch_catalog_from_api(
+        self, project_id: str, dataset_id: str
+    ) -> DatasetCatalog:
+        """tables.list APIでデータセットのテーブルタイプを取得します。
+
+        ビュー定義とスキーマはビューごとに必要になった時点で tables.get から取得し、
+        このカタログに追加します（_load_view_details）。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_id: データセットID
 
+        Returns:
+            テーブルタイプのみを含むデータセットカタログ
+        """
+        dataset_ref = f"{project_id}.{dataset_id}"
+        logger.info(f"データセット {dataset_ref} のテーブル一覧を取得します")
+        catalog = DatasetCatalog(project_id, dataset_id)
+
+        for table in self.client.list_tables(dataset_ref):
+            catalog.table_types[table.table_id] = _API_TABLE_TYPES.get(
+                table.table_type, table.table_type
+            )
+
+        logger.debug(
+            f"テーブル一覧を取得しました: {dataset_ref} (テーブル {len(catalog.table_types)}件)"
+        )
+        return catalog
+
+    @profiled("bigquery.get_table")
+    def _load_view_details(self, catalog: DatasetCatalog, view_name: str) -> None:
+        """tables.get APIでビュー定義、スキーマ、説明を取得し、カタログに追加します。
+
+        メタデータの取得方法がAPIの場合のみ使用します。取得済みのビューは再取得しません。
+
+        Args:
+            catalog: ビューが属するデータセットのカタログ
+            view_name: ビュー名
+        """
+        if view_name in catalog.schemas:
+            return
+        if catalog.table_types.get(view_name) != "VIEW":
+            return
+
+        table = self.client.get_table(
+            f"{catalog.project_id}.{catalog.dataset_id}.{view_name}"
+        )
+        schema = _columns_from_schema_fields(table.schema)
+        with self._catalog_lock:
+            if table.view_query:
+                catalog.view_definitions[view_name] = str(table.view_query)
+            catalog.schemas[view_name] = schema
+            if table.description:
+                catalog.descriptions[view_name] = table.description
+            if table.labels:
+                catalog.labels[view_name] = dict(table.labels)
+            if isinstance(table.modified, datetime):
+                catalog.modified[view_name] = table.modified.isoformat()
+
+    def get_catalog(self, project_id: str, dataset_id: str) -> Optional[DatasetCatalog]:
+        """読み込み済みのデータセットカタログを取得します。
+
+        メタデータの取得方法がAPIまたはリージョンの場合、未読み込みのデータセットは
+        読み込んでから返します。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_id: データセットID
+
+        Returns:
+            読み込み済みのカタログ。未読み込みの場合はNone
+        """
+        if self.metadata_source in (MetadataSource.API, MetadataSource.REGION):
+            return self.load_catalog(dataset_id, project_id=project_id)
+        return self._catalogs.get((project_id, dataset_id))
+
+    def loaded_catalogs(self) -> List[DatasetCatalog]:
+        """読み込み済みのデータセットカタログを全て取得します。
+
+        Returns:
+            読み込み済みのカタログのリスト（読み込み順）
+        """
+        with self._catalog_lock:
+            return list(self._catalogs.values())
+
+    @profiled("bigquery.get_view_metadata")
+    def get_view_metadata(self, fully_qualified_name: str) -> ViewMetadata:
+        """ビューの種類、SQL定義、スキーマ、説明をまとめて取得します。
+
+        カタログが読み込み済みの場合はメモリ上から返し、それ以外の場合は
+        tables.get APIを1回だけ呼び出します。get_table_type、get_view_definition、
+        get_view_schema を個別に呼び出すよりも問い合わせ回数が少なくなります。
+
+        Args:
+            fully_qualified_name: ビューの完全修飾名 (例: "project.dataset.view")
+
+        Returns:
+            ビューのメタデータ。存在しない場合は table_type が空文字列になります
+
+        Raises:
+            ValueError: 名前の形式が不正な場合、またはメタデータを取得できない場合
+        """
+        parts = fully_qualified_name.split(".")
+        if len(parts) != 3:
+            raise ValueError(f"無効なビュー名形式です: {fully_qualified_name}")
+
+        project_id, dataset_id, view_name = parts
+
+        # カタログが読み込み済みの場合はメモリ上から返す
+        catalog = self.get_catalog(project_id, dataset_id)
+        if catalog is not None:
+            if self.metadata_source == MetadataSource.API:
+                try:
+                    self._load_view_details(catalog, view_name)
+                except Exception as e:
+                    logger.error(
+                        f"メタデータの取得に失敗しました: {fully_qualified_name} - {e}"
+                    )
+                    raise ValueError(
+                        f"メタデータを取得できません: {fully_qualified_name} - {e}"
+                    )
+            return _metadata_from_catalog(catalog, fully_qualified_name, view_name)
+
+        # google-api-coreはgoogle-cloud-bigqueryの依存パッケージ
+        from google.api_core.exceptions import NotFound
+
+        try:
+            table = self.client.get_table(fully_qualified_name)
+        except NotFound:
+            logger.warning(f"テーブルが見つかりません: {fully_qualified_name}")
+            return ViewMetadata(fully_qualified_name, "")
+        except Exception as e:
+            logger.error(
+                f"メタデータの取得に失敗しました: {fully_qualified_name} - {e}"
+            )
+            raise ValueError(
+                f"メタデータを取得できません: {fully_qualified_name} - {e}"
+            )
+
+        metadata = _metadata_from_table(fully_qualified_name, table)
+        logger.debug(
+            f"テーブルタイプ: {fully_qualified_name} - {metadata.table_type}"
+        )
+        return metadata
+
+    @profiled("bigquery.get_table_type")
     def get_table_type(self, fully_qualified_name: str) -> str:
         """テーブルの種類（VIEW、TABLE、EXTERNAL、MODEL等）を取得します。
 
@@ -127,6 +915,14 @@ class BigQueryClient:
 
         project_id, dataset_id, table_id = parts
 
+        # カタログが読み込み済みの場合はメモリ上から返す
+        catalog = self.get_catalog(project_id, dataset_id)
+        if catalog is not None:
+            table_type = catalog.table_types.get(table_id, "")
+            if not table_type:
+                logger.warning(f"テーブルが見つかりません: {fully_qualified_name}")
+            return table_type
+
         try:
             # INFORMATION_SCHEMA.TABLESからテーブルタイプを取得
             query = f"""
@@ -138,7 +934,7 @@ class BigQueryClient:
                   table_name = '{table_id}'
             """
 
-            rows = list(self.client.query(query, location=self.location))
+            rows = list(self._query(query))
 
             if not rows:
                 logger.warning(f"テーブルが見つかりません: {fully_qualified_name}")
@@ -154,6 +950,7 @@ class BigQueryClient:
             )
             return ""
 
+    @profiled("bigquery.get_view_definition")
     def get_view_definition(self, fully_qualified_name: str) -> str:
         """ビューのSQL定義を取得します。
 
@@ -174,6 +971,24 @@ class BigQueryClient:
 
         # テーブルタイプのチェックは呼び出し元で行うため、ここでは行わない
 
+        # カタログが読み込み済みの場合はメモリ上から返す
+        catalog = self.get_catalog(project_id, dataset_id)
+        if catalog is not None:
+            if self.metadata_source == MetadataSource.API:
+                try:
+                    self._load_view_details(catalog, view_id)
+                except Exception as e:
+                    logger.error(
+                        f"ビュー定義の取得に失敗しました: {fully_qualified_name} - {e}"
+                    )
+                    raise ValueError(
+                        f"ビュー定義を取得できません: {fully_qualified_name} - {e}"
+                    )
+            view_definition = catalog.view_definitions.get(view_id)
+            if not view_definition:
+                raise ValueError(f"ビュー定義を取得できません: {fully_qualified_name}")
+            return view_definition
+
         try:
             # ビュー定義を取得するクエリ
             query = f"""
@@ -186,7 +1001,7 @@ class BigQueryClient:
             """
 
             # クエリを実行
-            rows = list(self.client.query(query, location=self.location))
+            rows = list(self._query(query))
 
             if not rows:
                 raise ValueError(f"ビューが見つかりません: {fully_qualified_name}")
@@ -207,9 +1022,12 @@ class BigQueryClient:
                 f"ビュー定義を取得できません: {fully_qualified_name} - {e}"
             )
 
-    def get_view_schema(self, fully_qualified_name: str) -> List[Dict[str, str]]:
+    @profiled("bigquery.get_view_schema")
+    def get_view_schema(self, fully_qualified_name: str) -> List[ColumnSchema]:
         """ビューのスキーマ情報を取得します。
 
+        STRUCT型のカラムはネストしたフィールドもドット区切りのフィールドパスで含めます。
+
         Args:
             fully_qualified_name: ビューの完全修飾名 (例: "project.dataset.view")
 
@@ -226,6 +1044,21 @@ class BigQueryClient:
         project_id, dataset_id, view_name = parts
         logger.debug(f"スキーマ情報を取得します: {fully_qualified_name}")
 
+        # カタログが読み込み済みの場合はメモリ上から返す
+        catalog = self.get_catalog(project_id, dataset_id)
+        if catalog is not None:
+            if view_name not in catalog.table_types:
+                raise ValueError(f"スキーマを取得できません: {fully_qualified_name}")
+            if self.metadata_source == MetadataSource.API:
+                try:
+                    self._load_view_details(catalog, view_name)
+                except Exception as e:
+                    logger.error(f"スキーマ取得中にエラーが発生しました: {e}")
+                    raise ValueError(
+                        f"スキーマを取得できません: {fully_qualified_name} - {e}"
+                    )
+            return list(catalog.schemas.get(view_name, []))
+
         try:
             # テーブル参照を取得
             table_ref = self.client.dataset(dataset_id, project=project_id).table(
@@ -235,15 +1068,7 @@ class BigQueryClient:
             table = self.client.get_table(table_ref)
 
             # スキーマ情報をリストに変換
-            schema_fields = []
-            for field in table.schema:
-                field_info = {
-                    "name": field.name,
-                    "type": field.field_type,
-                    "description": field.description or "",
-                    "mode": field.mode or "NULLABLE",
-                }
-                schema_fields.append(field_info)
+            schema_fields = _columns_from_schema_fields(table.schema)
 
             logger.debug(f"{len(schema_fields)}個のフィールドが見つかりました")
             return schema_fields
@@ -251,3 +1076,258 @@ class BigQueryClient:
         except Exception as e:
             logger.error(f"スキーマ取得中にエラーが発生しました: {e}")
             raise ValueError(f"スキーマを取得できません: {fully_qualified_name} - {e}")
+
+
+def _column_from_schema_field(schema_field: Any, prefix: str = "") -> ColumnSchema:
+    """tables.get APIのスキーマフィールドをカラム情報に変換します。
+
+    Args:
+        schema_field: google.cloud.bigquery.SchemaField
+        prefix: 親フィールドのパス（ネストしたフィールドの場合、例: "address."）
+
+    Returns:
+        "name", "type", "description", "mode" を含む辞書
+    """
+    return {
+        "name": f"{prefix}{schema_field.name}",
+        "type": schema_field.field_type,
+        "description": schema_field.description or "",
+        "mode": schema_field.mode or "NULLABLE",
+    }
+
+
+def _columns_from_schema_fields(
+    schema_fields: Iterable[Any], prefix: str = ""
+) -> List[ColumnSchema]:
+    """tables.get APIのスキーマをネストしたフィールドを含むカラム情報に変換します。
+
+    RECORD型のフィールドの直後に、その子フィールドを深さ優先の順序で並べます。
+
+    Args:
+        schema_fields: google.cloud.bigquery.SchemaField のリスト
+        prefix: 親フィールドのパス
+
+    Returns:
+        カラム情報のリスト
+    """
+    columns: List[ColumnSchema] = []
+    for schema_field in schema_fields:
+        column = _column_from_schema_field(schema_field, prefix)
+        columns.append(column)
+        columns.extend(
+            _columns_from_schema_fields(schema_field.fields or (), f"{column['name']}.")
+        )
+    return columns
+
+
+def _field_path_row(row: Any) -> _FieldPathRow:
+    """COLUMN_FIELD_PATHSのクエリ結果の行をタプルに変換します。"""
+    return (
+        row["field_path"],
+        row["data_type"],
+        row["description"],
+        row["is_nullable"],
+    )
+
+
+def _struct_fields(data_type: str) -> List[Tuple[str, str]]:
+    """STRUCT型（またはSTRUCTのARRAY型）のフィールド名と型を宣言順に取得します。
+
+    Args:
+        data_type: GoogleSQLのデータ型 (例: "STRUCT<city STRING, geo STRUCT<lat FLOAT64>>")
+
+    Returns:
+        (フィールド名, データ型) のリスト。STRUCT型でない場合は空のリスト
+    """
+    if data_type.startswith("ARRAY<") and data_type.endswith(">"):
+        data_type = data_type[len("ARRAY<") : -1]
+    if not (data_type.startswith("STRUCT<") and data_type.endswith(">")):
+        return []
+
+    inner = data_type[len("STRUCT<") : -1]
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(inner):
+        if char in "<(":
+            depth += 1
+        elif char in ">)":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(inner[start:i])
+            start = i + 1
+    parts.append(inner[start:])
+
+    fields = []
+    for part in parts:
+        name, _, field_type = part.strip().partition(" ")
+        if name:
+            fields.append((name.strip("`"), field_type.strip()))
+    return fields
+
+
+def _field_path_order(
+    path: str, data_type: str, key: Tuple[int, ...] = ()
+) -> Dict[str, Tuple[int, ...]]:
+    """フィールドパスごとに、宣言順の深さ優先で並べるためのソートキーを作成します。
+
+    Args:
+        path: フィールドパス
+        data_type: フィールドのデータ型
+        key: このフィールドのソートキー
+
+    Returns:
+        フィールドパス -> ソートキー
+    """
+    order = {path: key}
+    for i, (name, field_type) in enumerate(_struct_fields(data_type)):
+        order.update(_field_path_order(f"{path}.{name}", field_type, key + (i,)))
+    return order
+
+
+def _columns_from_field_paths(rows: List[_FieldPathRow]) -> List[ColumnSchema]:
+    """1テーブル分のCOLUMN_FIELD_PATHSの行をカラム情報のリストに変換します。
+
+    COLUMN_FIELD_PATHSはネストしたフィールドの順序を持たないため、
+    トップレベルのカラムのSTRUCT型の宣言順に並べ替えます。
+
+    Args:
+        rows: カラムの順序（ordinal_position）で並んだ行のリスト
+
+    Returns:
+        カラム情報のリスト（トップレベルのカラムの直後にその子フィールドが続く）
+    """
+    # トップレベルのカラム名 -> そのカラムに属する行
+    columns: Dict[str, List[_FieldPathRow]] = {}
+    for row in rows:
+        columns.setdefault(row[0].split(".")[0], []).append(row)
+
+    schema: List[ColumnSchema] = []
+    for column_name, field_rows in columns.items():
+        column_type = next((r[1] for r in field_rows if r[0] == column_name), "")
+        order = _field_path_order(column_name, column_type)
+        field_rows.sort(key=lambda r: order.get(r[0], (len(order),)))
+        for field_path, data_type, description, is_nullable in field_rows:
+            schema.append(
+                _column_from_information_schema(
+                    field_path,
+                    data_type,
+                    # NULL許容かどうかはトップレベルのカラムのみ取得できる
+                    is_nullable if field_path == column_name else None,
+                    description,
+                )
+            )
+    return schema
+
+
+def _metadata_from_table(fully_qualified_name: str, table: Any) -> ViewMetadata:
+    """tables.get APIのテーブルをビューのメタデータに変換します。
+
+    Args:
+        fully_qualified_name: ビューの完全修飾名
+        table: google.cloud.bigquery.Table
+
+    Returns:
+        ビューのメタデータ
+    """
+    return ViewMetadata(
+        fully_qualified_name=fully_qualified_name,
+        table_type=_API_TABLE_TYPES.get(table.table_type, table.table_type),
+        view_query=str(table.view_query or ""),
+        schema=tuple(_columns_from_schema_fields(table.schema)),
+        description=table.description or "",
+        labels=dict(table.labels or {}),
+        modified=table.modified if isinstance(table.modified, datetime) else None,
+    )
+
+
+def _metadata_from_catalog(
+    catalog: DatasetCatalog, fully_qualified_name: str, table_name: str
+) -> ViewMetadata:
+    """データセットカタログからビューのメタデータを作成します。
+
+    Args:
+        catalog: データセットカタログ
+        fully_qualified_name: ビューの完全修飾名
+        table_name: テーブル名
+
+    Returns:
+        ビューのメタデータ
+    """
+    table_type = catalog.table_types.get(table_name, "")
+    if not table_type:
+        logger.warning(f"テーブルが見つかりません: {fully_qualified_name}")
+    modified = catalog.modified.get(table_name)
+    return ViewMetadata(
+        fully_qualified_name=fully_qualified_name,
+        table_type=table_type,
+        view_query=catalog.view_definitions.get(table_name, ""),
+        schema=tuple(catalog.schemas.get(table_name, [])),
+        description=catalog.descriptions.get(table_name, ""),
+        labels=dict(catalog.labels.get(table_name, {})),
+        modified=datetime.fromisoformat(modified) if modified else None,
+    )
+
+
+def _parse_string_literal(literal: str) -> str:
+    """INFORMATION_SCHEMA.TABLE_OPTIONSの文字列リテラルを文字列に変換します。
+
+    Args:
+        literal: 引用符で囲まれた文字列リテラル (例: '"説明"')
+
+    Returns:
+        引用符とエスケープを取り除いた文字列
+    """
+    literal = (literal or "").strip()
+    try:
+        value = json.loads(literal)
+    except ValueError:
+        value = literal.strip("\"'")
+    return value if isinstance(value, str) else literal
+
+
+def _parse_labels(option_value: str) -> Dict[str, str]:
+    """INFORMATION_SCHEMA.TABLE_OPTIONSのlabelsの値を辞書に変換します。
+
+    Args:
+        option_value: labelsの値 (例: '[STRUCT("env", "prod")]')
+
+    Returns:
+        ラベル名 -> 値 の辞書
+    """
+    return {
+        _parse_string_literal(key): _parse_string_literal(value)
+        for key, value in _LABEL_PATTERN.findall(option_value or "")
+    }
+
+
+def _column_from_information_schema(
+    column_name: str,
+    data_type: str,
+    is_nullable: Optional[str],
+    description: Optional[str],
+) -> ColumnSchema:
+    """INFORMATION_SCHEMAの行を get_view_schema と同じ形式のカラム情報に変換します。
+
+    Args:
+        column_name: カラム名（ネストしたフィールドはフィールドパス）
+        data_type: GoogleSQLのデータ型 (例: "INT64", "ARRAY<STRING>", "STRUCT<...>")
+        is_nullable: "YES" または "NO"（不明な場合はNone）
+        description: カラムの説明
+
+    Returns:
+        "name", "type", "description", "mode" を含む辞書
+    """
+    mode = "REQUIRED" if is_nullable == "NO" else "NULLABLE"
+    if data_type.startswith("ARRAY<") and data_type.endswith(">"):
+        mode = "REPEATED"
+        data_type = data_type[len("ARRAY<") : -1]
+    if data_type.startswith("STRUCT<"):
+        data_type = "RECORD"
+
+    return {
+        "name": column_name,
+        "type": data_type,
+        "description": description or "",
+        "mode": mode,
+    }
@@ -0,0 +1,194 @@
+"""Google APIクライアントのファクトリーモジュール。
+
+BigQueryとLineage APIのクライアントが、認証情報、HTTPのコネクションプール、
+gRPCのチャネルを共有するためのファクトリーを提供します。
+並列に動くワーカーはこれらを使い回すため、ワーカーごとに認証情報の更新や
+TLS接続の確立を行いません。
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+from bq2dbt.converter import bigquery, lineage
+from bq2dbt.utils.api_metrics import api_metrics
+
+logger = logging.getLogger(__name__)
+
+# HTTPのコネクションプールの既定のサイズ（requestsの既定値と同じ）
+DEFAULT_POOL_SIZE = 10
+
+# BigQueryとLineage APIで使用する認証スコープ
+_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+
+def default_pool_size(*workers: int) -> int:
+    """並列数に合わせたコネクションプールのサイズを返します。
+
+    Args:
+        *workers: APIを並列に呼び出すワーカーの数（ビュー変換の並列数など）
+
+    Returns:
+        ワーカーの最大数（DEFAULT_POOL_SIZE 未満の場合は DEFAULT_POOL_SIZE）
+    """
+    return max(DEFAULT_POOL_SIZE, *workers)
+
+
+class ClientFactory:
+    """認証情報と接続を共有するGoogle APIクライアントのファクトリー。
+
+    認証情報は最初のクライアントの作成時に1回だけ解決します。
+    BigQueryのクライアントは1つのrequestsのセッション（コネクションプール）を、
+    Lineageのクライアントは1つのgRPCのチャネルを共有します。
+    作成したクライアントは使い回すため、同じファクトリーから何度作成しても接続は増えません。
+
+    接続先を上書きする環境変数（BQ2DBT_BIGQUERY_API_ENDPOINT、
+    BQ2DBT_LINEAGE_API_ENDPOINT）が設定されている場合は、
+    認証を行わずにその接続先に接続します。
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """ファクトリーを初期化します（この時点では認証も接続も行いません）。
+
+        Args:
+            pool_size: HTTPのコネクションプールのサイズ（同時に保持する接続数）
+        """
+        self.pool_size = pool_size
+        self._credentials: Any = None
+        self._session: Any = None
+        self._channel: Any = None
+        self._bigquery_clients: Dict[str, Any] = {}
+        self._lineage_client: Any = None
+        self._lock = threading.RLock()
+
+    @property
+    def credentials(self) -> Any:
+        """共有する認証情報（初回参照時にアプリケーションのデフォルト認証情報を解決）。"""
+        with self._lock:
+            if self._credentials is None:
+                import google.auth
+
+                self._credentials, _ = google.auth.default(scopes=list(_SCOPES))
+                logger.debug("認証情報を解決しました")
+            return self._credentials
+
+    def http_session(self) -> Any:
+        """BigQueryのクライアントで共有するrequestsのセッションを返します。
+
+        Returns:
+            google.auth.transport.requests.AuthorizedSession
+        """
+        with self._lock:
+            if self._session is None:
+                from google.auth.transport.requests import AuthorizedSession
+                from requests.adapters import HTTPAdapter
+
+                if os.environ.get(bigquery.API_ENDPOINT_ENV):
+                    from google.auth.credentials import AnonymousCredentials
+
+                    credentials = AnonymousCredentials()
+                else:
+                    credentials = self.credentials
+                session = AuthorizedSession(credentials)
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # REST APIのリクエストごと（リトライやページの取得を含む）に計測する
+                session.hooks["response"].append(api_metrics.record_http_response)
+                self._session = session
+                logger.debug(
+                    f"HTTPのコネクションプールを作成しました: サイズ={self.pool_size}"
+                )
+            return self._session
+
+    def grpc_channel(self) -> Any:
+        """Lineageのクライアントで共有するgRPCのチャネルを返します。
+
+        Returns:
+            grpc.Channel
+        """
+        with self._lock:
+            if self._channel is None:
+                api_endpoint = os.environ.get(lineage.API_ENDPOINT_ENV)
+                if api_endpoint:
+                    import grpc
+
+                    self._channel = grpc.insecure_channel(api_endpoint)
+                else:
+                    from google.cloud.datacatalog_lineage_v1.services.lineage import (
+                        transports,
+                    )
+
+                    grpc_transport = transports.LineageGrpcTransport
+                    self._channel = grpc_transport.create_channel(
+                        f"{grpc_transport.DEFAULT_HOST}:443",
+                        credentials=self.credentials,
+                        scopes=_SCOPES,
+                    )
+                logger.debug("gRPCのチャネルを作成しました")
+            return self._channel
+
+    def bigquery_client(self, project_id: str) -> Any:
+        """共有のセッションを使うBigQuery APIのクライアントを返します。
+
+        Args:
+            project_id: BigQueryプロジェクトID
+
+        Returns:
+            google.cloud.bigquery.Client
+        """
+        with self._lock:
+            if project_id not in self._bigquery_clients:
+                from google.cloud import bigquery as bigquery_api
+
+                options: Dict[str, Any] = {}
+                api_endpoint = os.environ.get(bigquery.API_ENDPOINT_ENV)
+                if api_endpoint:
+                    from google.api_core.client_options import ClientOptions
+
+                    options["client_options"] = ClientOptions(api_endpoint=api_endpoint)
+                session = self.http_session()
+                self._bigquery_clients[project_id] = bigquery_api.Client(
+                    project=project_id,
+                    credentials=session.credentials,
+                    _http=session,
+                    **options,
+                )
+            return self._bigquery_clients[project_id]
+
+    def lineage_client(self) -> Any:
+        """共有のチャネルを使うLineage APIのクライアントを返します。
+
+        Returns:
+            google.cloud.datacatalog_lineage_v1.LineageClient
+        """
+        with self._lock:
+            if self._lineage_client is None:
+                from google.cloud import datacatalog_lineage_v1
+                from google.cloud.datacatalog_lineage_v1.services.lineage import (
+                    transports,
+                )
+
+                transport = transports.LineageGrpcTransport(
+                    channel=self.grpc_channel()
+                )
+                self._lineage_client = datacatalog_lineage_v1.LineageClient(
+                    transport=transport
+                )
+            return self._lineage_client
+
+    def close(self) -> None:
+        """共有のセッションとチャネルを閉じます。"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._channel is not None:
+                self._channel.close()
+                self._channel = None
+            self._bigquery_clients = {}
+            self._lineage_client = None
+
@@ -6,6 +6,8 @@ BigQueryビュー間の依存関係を解析し、変換順序を決定します
 import abc
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import Enum
 from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from rich.console import Console
@@ -14,10 +16,33 @@ from rich.tree import Tree
 
 from bq2dbt.converter.bigquery import BigQueryClient
 from bq2dbt.converter.lineage import LineageClient
+from bq2dbt.converter.sql_parser import extract_table_references
+from bq2dbt.utils.cache import LineageCache
 
 logger = logging.getLogger(__name__)
 
 
+class DependencyBackend(str, Enum):
+    """依存関係の解析方法。"""
+
+    LINEAGE = "lineage"  # Data Catalog Lineage APIを使用
+    SQL = "sql"  # ビュー定義のSQLを解析
+    HYBRID = "hybrid"  # ビューはSQL解析、それ以外はLineage APIを使用
+
+
+class CircularDependencyError(ValueError):
+    """依存関係に循環参照がある場合に送出される例外。"""
+
+    def __init__(self, cycle: List[str]) -> None:
+        """循環参照の例外を初期化します。
+
+        Args:
+            cycle: 循環参照を構成するビューのリスト（先頭と末尾は同じビュー）
+        """
+        self.cycle = cycle
+        super().__init__(f"依存関係に循環参照があります: {' -> '.join(cycle)}")
+
+
 class DependencyResolverBase(abc.ABC):
     """依存関係解析の基底クラス。
 
@@ -31,6 +56,7 @@ class DependencyResolverBase(abc.ABC):
         self.reverse_graph: Dict[str, List[str]] = defaultdict(
             list
         )  # 依存先 -> 依存元リスト
+        self.max_workers = 1  # 同じ深さのビューを並列に処理する最大数
         logger.debug("依存関係リゾルバー基底クラスを初期化しました")
 
     @abc.abstractmethod
@@ -54,6 +80,143 @@ class DependencyResolverBase(abc.ABC):
         """
         pass
 
+    def _resolve_breadth_first(
+        self,
+        views: List[str],
+        max_depth: int,
+        status_callback: Optional[Callable[[str, int, int], None]] = None,
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """幅優先探索で依存関係グラフを構築します。
+
+        同じ深さのビューはまとめて _get_dependencies で取得します。
+
+        Args:
+            views: 分析対象のビューのリスト（project.dataset.table形式）
+            max_depth: 依存関係を追跡する最大深さ
+            status_callback: 処理状況を通知するコールバック関数
+
+        Returns:
+            (拡張されたビューリスト, 依存関係グラフ)のタプル
+        """
+        # 必要なビューを追跡するセット（重複を避けるため）
+        required_views: Set[str] = set(views)
+        processed_views: Set[str] = set()
+
+        # 依存関係グラフを初期化
+        self.dependency_graph = {}
+        self.reverse_graph = defaultdict(list)
+
+        # 幅優先探索の現在の深さで処理するビュー（同一深さ内の重複は除外）
+        frontier = list(dict.fromkeys(views))
+        depth = 0
+
+        # 処理済みビュー数
+        processed_count = 0
+        total_count = len(frontier)
+
+        # 深さごとにまとめて依存関係を取得
+        while frontier and depth <= max_depth:
+            level_dependencies = self._fetch_level(
+                frontier, processed_count, total_count, status_callback
+            )
+
+            frontier_set = set(frontier)
+            next_frontier: List[str] = []
+            next_frontier_set: Set[str] = set()
+            for view in frontier:
+                dependencies = level_dependencies[view]
+
+                # 依存関係グラフに追加
+                self.dependency_graph[view] = dependencies
+                processed_views.add(view)
+                processed_count += 1
+
+                # 逆方向の依存関係も記録
+                for dep in dependencies:
+                    self.reverse_graph[dep].append(view)
+
+                    # 依存先を必要なビューに追加
+                    required_views.add(dep)
+
+                    # まだ処理していないビューで、最大深さに達していない場合は次の深さに追加
+                    if (
+                        depth + 1 <= max_depth
+                        and dep not in processed_views
+                        and dep not in frontier_set
+                        and dep not in next_frontier_set
+                    ):
+                        next_frontier.append(dep)
+                        next_frontier_set.add(dep)
+
+            total_count += len(next_frontier)
+            frontier = next_frontier
+            depth += 1
+
+        # 最終状態をコールバックで通知
+        if status_callback:
+            status_callback("完了", processed_count, total_count)
+
+        # セットをリストに変換
+        result_views = list(required_views)
+
+        logger.info(f"依存関係解析が完了しました。対象ビュー数: {len(result_views)}")
+        return result_views, self.dependency_graph
+
+    def _fetch_level(
+        self,
+        frontier: List[str],
+        processed_count: int,
+        total_count: int,
+        status_callback: Optional[Callable[[str, int, int], None]],
+    ) -> Dict[str, List[str]]:
+        """同じ深さのビューの依存関係をまとめて取得します。
+
+        max_workersが2以上の場合はスレッドプールで並列に取得します。
+
+        Args:
+            frontier: 依存関係を取得するビューのリスト（重複なし）
+            processed_count: これまでに処理したビュー数
+            total_count: 現時点で判明している処理対象のビュー数
+            status_callback: 処理状況を通知するコールバック関数
+
+        Returns:
+            ビュー名 -> 依存先リストの辞書
+        """
+        results: Dict[str, List[str]] = {}
+
+        if self.max_workers <= 1 or len(frontier) <= 1:
+            for index, view in enumerate(frontier):
+                # 処理状況をコールバックで通知
+                if status_callback:
+                    status_callback(view, processed_count + index, total_count)
+                results[view] = self._get_dependencies(view)
+            return results
+
+        workers = min(self.max_workers, len(frontier))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._get_dependencies, view): view for view in frontier
+            }
+            # 完了したビューから順に処理状況を通知（コールバックは呼び出し元スレッドで実行）
+            for completed, future in enumerate(as_completed(futures)):
+                view = futures[future]
+                if status_callback:
+                    status_callback(view, processed_count + completed, total_count)
+                results[view] = future.result()
+        return results
+
+    @abc.abstractmethod
+    def _get_dependencies(self, view: str) -> List[str]:
+        """1つのビューの依存先を取得します（_resolve_breadth_first から呼び出されます）。
+
+        Args:
+            view: ビュー名
+
+        Returns:
+            依存先のリスト
+        """
+        pass
+
     def get_dependent_views(self, view: str) -> List[str]:
         """指定したビューに依存しているビューのリストを取得します。
 
@@ -130,51 +293,106 @@ class DependencyResolverBase(abc.ABC):
         add_dependencies(root_view, tree)
         return tree
 
-    def get_topological_order(self) -> List[str]:
-        """依存関係に基づいた変換順序を取得します。
+    def get_topological_levels(self) -> List[List[str]]:
+        """依存関係に基づいて、互いに独立して変換できるビューのレベルに分割します。
+
+        Kahnのアルゴリズムにより O(V+E) で計算します。
+        レベル0は他のビューに依存しないビューで、各レベルのビューは
+        それより前のレベルのビューにのみ依存します。
 
         Returns:
-            ビューの変換順序（依存関係の順にソート）
+            レベルごとのビューのリスト
+
+        Raises:
+            ValueError: 依存関係グラフが構築されていない場合
+            CircularDependencyError: 依存関係に循環参照がある場合
         """
         if not self.dependency_graph:
             raise ValueError("依存関係グラフが構築されていません")
 
-        # 依存関係の逆順で返す（依存先から順に変換するため）
-        # 単純に依存関係の深さでソート
-        view_depth: Dict[str, int] = {}
+        # グラフに含まれるビュー間の依存のみを対象とする
+        remaining: Dict[str, int] = {}  # ビュー名 -> 未解決の依存先の数
+        dependents: Dict[str, List[str]] = defaultdict(list)  # 依存先 -> 依存元リスト
+        for view, deps in self.dependency_graph.items():
+            unique_deps = [
+                dep for dep in dict.fromkeys(deps) if dep in self.dependency_graph
+            ]
+            remaining[view] = len(unique_deps)
+            for dep in unique_deps:
+                dependents[dep].append(view)
+
+        levels: List[List[str]] = []
+        level = [view for view, count in remaining.items() if count == 0]
+        while level:
+            levels.append(level)
+            next_level = []
+            for view in level:
+                for dependent in dependents[view]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+
+        if sum(len(level) for level in levels) < len(self.dependency_graph):
+            raise CircularDependencyError(self._find_cycle(remaining))
+
+        return levels
+
+    def _find_cycle(self, remaining: Dict[str, int]) -> List[str]:
+        """トポロジカルソートで解決できなかったビューから循環参照を1つ取り出します。
 
-        # 初期化：すべてのビューの深さを0に設定
-        for view in self.dependency_graph:
-            view_depth[view] = 0
+        Args:
+            remaining: ビュー名 -> 未解決の依存先の数
 
-        # 各ビューの深さを計算
-        for view, deps in self.dependency_graph.items():
-            for dep in deps:
-                view_depth[dep] = max(view_depth.get(dep, 0), view_depth[view] + 1)
-
-        # 深さでソート
-        return sorted(
-            self.dependency_graph.keys(),
-            key=lambda v: view_depth.get(v, 0),
-            reverse=True,
-        )
+        Returns:
+            循環参照を構成するビューのリスト（先頭と末尾は同じビュー）
+        """
+        unresolved = {view for view, count in remaining.items() if count > 0}
+        # 未解決のビューは必ず未解決の依存先を持つため、辿ると循環に到達する
+        path: List[str] = []
+        position: Dict[str, int] = {}
+        view = next(view for view in self.dependency_graph if view in unresolved)
+        while view not in position:
+            position[view] = len(path)
+            path.append(view)
+            view = next(
+                dep for dep in self.dependency_graph[view] if dep in unresolved
+            )
+        return path[position[view] :] + [view]
+
+    def get_topological_order(self) -> List[str]:
+        """依存関係に基づいた変換順序を取得します。
+
+        Returns:
+            ビューの変換順序（依存先が依存元より先になるようにソート）
+
+        Raises:
+            ValueError: 依存関係グラフが構築されていない場合
+            CircularDependencyError: 依存関係に循環参照がある場合
+        """
+        return [view for level in self.get_topological_levels() for view in level]
 
 
 class DataCatalogDependencyResolver(DependencyResolverBase):
     """Google Cloud Data Catalog Lineage APIを使用した依存関係解析クラス。"""
 
     def __init__(
-        self, bq_client: BigQueryClient, lineage_client: LineageClient
+        self,
+        bq_client: BigQueryClient,
+        lineage_client: LineageClient,
+        max_workers: int = 1,
     ) -> None:
         """Data Catalog Lineage APIを使用した依存関係リゾルバーを初期化します。
 
         Args:
             bq_client: BigQueryクライアント
             lineage_client: Lineageクライアント
+            max_workers: 同一深さのビューに対してLineage APIを並列に呼び出す最大数
         """
         super().__init__()
         self.bq_client = bq_client
         self.lineage_client = lineage_client
+        self.max_workers = max_workers
         logger.debug("Data Catalog依存関係リゾルバーを初期化しました")
 
     def analyze_dependencies(
@@ -199,84 +417,112 @@ class DataCatalogDependencyResolver(DependencyResolverBase):
             f"{len(views)}個のビューの依存関係を分析します（最大深さ: {max_depth}）"
         )
 
-        # 対象データセットの完全修飾パターン
-        project_id = self.bq_client.project_id
-        target_pattern = f"{project_id}.{target_dataset_id}."
-
-        # 必要なビューを追跡するセット（重複を避けるため）
-        required_views: Set[str] = set(views)
-        processed_views: Set[str] = set()
+        return self._resolve_breadth_first(views, max_depth, status_callback)
 
-        # 依存関係グラフを初期化
-        self.dependency_graph = {}
-        self.reverse_graph = defaultdict(list)
+    def _get_dependencies(self, view: str) -> List[str]:
+        """1つのビューの依存関係をLineage APIから取得します。
 
-        # 各ビューの深さを追跡
-        view_depth: Dict[str, int] = {view: 0 for view in views}
+        Args:
+            view: ビュー名
 
-        # 処理キュー
-        queue = [(view, 0) for view in views]  # (ビュー名, 現在の深さ)
+        Returns:
+            依存先のリスト（取得に失敗した場合は空のリスト）
+        """
+        try:
+            return self.lineage_client.get_table_dependencies(view)
+        except Exception as e:
+            logger.error(f"ビュー {view} の依存関係解析に失敗しました: {e}")
+            # エラーが発生したビューは依存関係がないものとして処理
+            return []
 
-        # 処理済みビュー数
-        processed_count = 0
-        total_count = len(queue)
 
-        # キューが空になるまで処理
-        while queue:
-            view, depth = queue.pop(0)
+class SqlParsingDependencyResolver(DependencyResolverBase):
+    """ビュー定義のSQLを解析して依存関係を求めるクラス。
 
-            # 最大深さに達した場合はスキップ
-            if depth > max_depth:
-                continue
+    データセット単位で取得したビュー定義（BigQueryClient.load_catalog）から
+    参照テーブルを抽出するため、ビューごとのAPI呼び出しは発生しません。
+    fallback_lineage_clientを指定した場合は、ビュー定義を持たないオブジェクト
+    （テーブルや定義を取得できないビュー）の依存関係をLineage APIで補完します。
+    """
 
-            # 既に処理済みの場合はスキップ
-            if view in processed_views:
-                continue
+    def __init__(
+        self,
+        bq_client: BigQueryClient,
+        fallback_lineage_client: Optional[LineageClient] = None,
+        max_workers: int = 1,
+    ) -> None:
+        """SQL解析による依存関係リゾルバーを初期化します。
 
-            # 処理状況をコールバックで通知
-            if status_callback:
-                status_callback(view, processed_count, total_count)
+        Args:
+            bq_client: BigQueryクライアント
+            fallback_lineage_client: ビュー定義がない場合に使用するLineageクライアント（省略可）
+            max_workers: 同じ深さのビューを並列に処理する最大数
+        """
+        super().__init__()
+        self.bq_client = bq_client
+        self.fallback_lineage_client = fallback_lineage_client
+        self.max_workers = max_workers
+        logger.debug("SQL解析依存関係リゾルバーを初期化しました")
 
-            try:
-                # ビューの依存関係を取得
-                dependencies = self.lineage_client.get_table_dependencies(view)
+    def analyze_dependencies(
+        self,
+        views: List[str],
+        target_dataset_id: str,
+        max_depth: int = 3,
+        status_callback: Optional[Callable[[str, int, int], None]] = None,
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """指定されたビューリストの依存関係を解析し、変換に必要なビューリストを作成します。
 
-                # 依存関係グラフに追加
-                self.dependency_graph[view] = dependencies
+        Args:
+            views: 分析対象のビューのリスト（project.dataset.table形式）
+            target_dataset_id: 変換対象のデータセットID
+            max_depth: 依存関係を追跡する最大深さ
+            status_callback: 処理状況を通知するコールバック関数
 
-                # 逆方向の依存関係も記録
-                for dep in dependencies:
-                    self.reverse_graph[dep].append(view)
+        Returns:
+            (拡張されたビューリスト, 依存関係グラフ)のタプル
+        """
+        logger.info(
+            f"{len(views)}個のビューの依存関係をSQLから分析します（最大深さ: {max_depth}）"
+        )
 
-                    # 依存先を必要なビューに追加
-                    required_views.add(dep)
+        return self._resolve_breadth_first(views, max_depth, status_callback)
 
-                    # まだ処理していないビューで、最大深さに達していない場合はキューに追加
-                    if dep not in processed_views and depth + 1 <= max_depth:
-                        queue.append((dep, depth + 1))
-                        view_depth[dep] = depth + 1
-                        total_count += 1
+    def _get_dependencies(self, view: str) -> List[str]:
+        """ビュー定義のSQLから依存先を抽出します。
 
-                # 処理済みとしてマーク
-                processed_views.add(view)
-                processed_count += 1
+        Args:
+            view: ビュー名
 
+        Returns:
+            依存先のリスト（ビューでない場合やビュー定義を取得できない場合は空のリスト、
+            またはLineage APIによる補完結果）
+        """
+        parts = view.split(".")
+        if len(parts) != 3:
+            logger.warning(f"無効なビュー名形式: {view}")
+            return []
+        project_id, dataset_id, _ = parts
+
+        view_definition = None
+        try:
+            # データセット単位でメタデータを読み込む（データセットごとに1回のみ）
+            self.bq_client.load_catalog(dataset_id, project_id=project_id)
+            if self.bq_client.get_table_type(view) == "VIEW":
+                view_definition = self.bq_client.get_view_definition(view)
+        except Exception as e:
+            logger.debug(f"ビュー定義を取得できませんでした: {view} - {e}")
+
+        if view_definition is not None:
+            return extract_table_references(view_definition, project_id)
+
+        if self.fallback_lineage_client is not None:
+            try:
+                return self.fallback_lineage_client.get_table_dependencies(view)
             except Exception as e:
                 logger.error(f"ビュー {view} の依存関係解析に失敗しました: {e}")
-                # エラーが発生したビューは依存関係がないものとして処理
-                self.dependency_graph[view] = []
-                processed_views.add(view)
-                processed_count += 1
 
-        # 最終状態をコールバックで通知
-        if status_callback:
-            status_callback("完了", processed_count, total_count)
-
-        # セットをリストに変換
-        result_views = list(required_views)
-
-        logger.info(f"依存関係解析が完了しました。対象ビュー数: {len(result_views)}")
-        return result_views, self.dependency_graph
+        return []
 
 
 # 後方互換性のために元のクラス名を維持
@@ -286,13 +532,28 @@ class DependencyResolver(DataCatalogDependencyResolver):
     このクラスはDataCatalogDependencyResolverの単なるエイリアスです。
     """
 
-    def __init__(self, bq_client: BigQueryClient) -> None:
+    def __init__(
+        self,
+        bq_client: BigQueryClient,
+        max_workers: int = 1,
+        lineage_cache: Optional[LineageCache] = None,
+        refresh_lineage: bool = False,
+    ) -> None:
         """後方互換性のためのコンストラクタ。
 
         Args:
             bq_client: BigQueryクライアント
+            max_workers: 同一深さのビューに対してLineage APIを並列に呼び出す最大数
+            lineage_cache: 依存関係の永続キャッシュ（省略時はキャッシュしない）
+            refresh_lineage: キャッシュを読まずにLineage APIから取得し直すかどうか
         """
-        # 同じプロジェクトとロケーションでLineageClientを作成
-        lineage_client = LineageClient(bq_client.project_id, bq_client.location)
-        super().__init__(bq_client, lineage_client)
+        # 同じプロジェクトとロケーションで、BigQueryクライアントと接続を共有して作成
+        lineage_client = LineageClient(
+            bq_client.project_id,
+            bq_client.location,
+            cache=lineage_cache,
+            refresh_cache=refresh_lineage,
+            client_factory=bq_client.client_factory,
+        )
+        super().__init__(bq_client, lineage_client, max_workers=max_workers)
         logger.debug("後方互換性のためのDependencyResolverを初期化しました")
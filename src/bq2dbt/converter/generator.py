@@ -4,20 +4,71 @@ BigQueryビュー定義からdbtモデルを生成する機能を提供します
 """
 
 import logging
+import os
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
-
-import jinja2
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 from bq2dbt.utils.naming import (
     NamingPreset,
     generate_model_filename,
     generate_model_name,
 )
+from bq2dbt.utils.output_index import OutputIndex
+from bq2dbt.utils.profiling import profiled
+
+if TYPE_CHECKING:
+    import jinja2
 
 logger = logging.getLogger(__name__)
 
+# 既存ファイルとの比較時にタイムスタンプの位置を示すプレースホルダー
+_TIMESTAMP_PLACEHOLDER = "\x00bq2dbt-timestamp\x00"
+
+
+class WriteMode(str, Enum):
+    """モデルファイルの書き込み方法。"""
+
+    ALWAYS = "always"  # 常に書き込む
+    CHANGED = "changed"  # 内容が変わった場合のみ書き込む
+
+
+class WriteStatus(str, Enum):
+    """モデルファイルの書き込み結果。"""
+
+    NEW = "new"  # 新規作成
+    WRITTEN = "written"  # 既存ファイルを上書き
+    UNCHANGED = "unchanged"  # 内容が同じため書き込みを省略
+
+
+class ConflictPolicy(str, Enum):
+    """既存のモデルファイルがあるビューの扱い。"""
+
+    ASK = "ask"  # 変換前に一覧を表示してまとめて選択する
+    OVERWRITE = "overwrite"  # すべて上書きする
+    SKIP = "skip"  # すべてスキップする
+    CHANGED = "changed"  # 内容が変わったファイルのみ上書きする
+
+
+@dataclass
+class RenderedModel:
+    """レンダリング済みでファイルに未書き込みのモデル。
+
+    Attributes:
+        file_path: 出力先のパス
+        content: レンダリングされた内容
+        template: レンダリングに使ったテンプレート
+        template_vars: レンダリングに使ったテンプレート変数
+    """
+
+    file_path: Path
+    content: str
+    template: "jinja2.Template"
+    template_vars: Dict[str, Any]
+
 
 class ModelGenerator:
     """dbtモデルを生成するクラス。"""
@@ -27,6 +78,8 @@ class ModelGenerator:
         output_dir: Union[str, Path],
         sql_template_path: Optional[Path] = None,
         yml_template_path: Optional[Path] = None,
+        bytecode_cache_dir: Optional[Path] = None,
+        write_mode: WriteMode = WriteMode.ALWAYS,
     ):
         """モデルジェネレーターを初期化します。
 
@@ -34,16 +87,33 @@ class ModelGenerator:
             output_dir: dbtモデルの出力先ディレクトリ
             sql_template_path: SQLテンプレートファイルのパス（省略時はデフォルトテンプレート）
             yml_template_path: YAMLテンプレートファイルのパス（省略時はデフォルトテンプレート）
+            bytecode_cache_dir: Jinjaのバイトコードキャッシュの保存先（省略時はディスクに保存しない）
+            write_mode: モデルファイルの書き込み方法
         """
+        # Jinjaの読み込みはモデル生成時まで遅延させる
+        import jinja2
+
         self.output_dir = Path(output_dir)
+        self.write_mode = WriteMode(write_mode)
+        self.write_counts: Dict[WriteStatus, int] = {
+            status: 0 for status in WriteStatus
+        }
+        self._write_lock = threading.Lock()
+        # 出力ディレクトリの索引（設定時はファイルの存在確認に使用する）
+        self.output_index: Optional[OutputIndex] = None
 
         # テンプレート環境を設定
+        # テンプレートはファイルパスを名前として読み込み、インスタンス内で一度だけコンパイルする
         template_dir = Path(__file__).parent.parent / "templates"
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_cache_dir))
         self.env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(str(template_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True,
+            loader=jinja2.FunctionLoader(_load_template_source),
+            bytecode_cache=bytecode_cache,
         )
+        self._templates: Dict[Path, "jinja2.Template"] = {}
 
         # テンプレートを読み込む
         self.sql_template_path = sql_template_path or template_dir / "model.sql"
@@ -63,27 +133,165 @@ class ModelGenerator:
 
         logger.debug(f"モデルジェネレーターを初期化しました: 出力先={output_dir}")
 
-    def _load_template(self, path: Path) -> jinja2.Template:
+    def _load_template(self, path: Path) -> "jinja2.Template":
         """テンプレートファイルを読み込みます。
 
+        コンパイル済みのテンプレートはインスタンス内でキャッシュし、
+        2回目以降はファイルの読み込みとコンパイルを行いません。
+
         Args:
             path: テンプレートファイルのパス
 
         Returns:
             読み込まれたテンプレート
         """
-        logger.debug(f"テンプレートファイルを読み込みます: {path}")
-        with open(path, "r") as f:
-            template_str = f.read()
+        template = self._templates.get(path)
+        if template is not None:
+            return template
 
+        logger.debug(f"テンプレートファイルを読み込みます: {path}")
         try:
-            template = jinja2.Template(template_str)
+            template = self.env.get_template(str(Path(path).resolve()))
+            self._templates[path] = template
             logger.debug("テンプレートを正常に読み込みました")
             return template
         except Exception as e:
             logger.error(f"テンプレートの読み込み中にエラーが発生しました: {str(e)}")
             raise
 
+    @profiled("generator.render")
+    def _render(
+        self, template: "jinja2.Template", template_vars: Dict[str, Any]
+    ) -> str:
+        """テンプレートをレンダリングします。
+
+        Args:
+            template: テンプレート
+            template_vars: テンプレート変数
+
+        Returns:
+            レンダリングされた内容
+        """
+        try:
+            rendered_content = template.render(**template_vars)
+            logger.debug("テンプレートのレンダリングに成功しました")
+            return rendered_content
+        except Exception as e:
+            logger.error(
+                f"テンプレートのレンダリング中にエラーが発生しました: {str(e)}"
+            )
+            raise
+
+    @profiled("generator.write")
+    def _write_model(
+        self,
+        file_path: Path,
+        content: str,
+        template: "jinja2.Template",
+        template_vars: Dict[str, Any],
+    ) -> WriteStatus:
+        """モデルファイルを書き込み、結果を集計します。
+
+        書き込み方法が CHANGED の場合、既存ファイルの内容がタイムスタンプを除いて
+        同じであれば書き込みを省略し、ファイルの更新日時を維持します。
+
+        Args:
+            file_path: 出力先のパス
+            content: 書き込む内容
+            template: 内容のレンダリングに使ったテンプレート
+            template_vars: 内容のレンダリングに使ったテンプレート変数
+
+        Returns:
+            書き込み結果
+        """
+        if self.output_index is not None:
+            exists = self.output_index.exists(file_path)
+        else:
+            exists = file_path.exists()
+
+        if not exists:
+            status = WriteStatus.NEW
+        elif self.write_mode == WriteMode.CHANGED and self._is_unchanged(
+            file_path, content, template, template_vars
+        ):
+            status = WriteStatus.UNCHANGED
+        else:
+            status = WriteStatus.WRITTEN
+
+        if status != WriteStatus.UNCHANGED:
+            with open(file_path, "w") as f:
+                f.write(content)
+            if self.output_index is not None and status == WriteStatus.NEW:
+                self.output_index.add(file_path.name)
+
+        with self._write_lock:
+            self.write_counts[status] += 1
+        return status
+
+    def _is_unchanged(
+        self,
+        file_path: Path,
+        content: str,
+        template: "jinja2.Template",
+        template_vars: Dict[str, Any],
+    ) -> bool:
+        """既存ファイルが、タイムスタンプを除いて新しい内容と同じかどうかを判定します。
+
+        Args:
+            file_path: 既存ファイルのパス
+            content: 新しい内容
+            template: テンプレート
+            template_vars: テンプレート変数
+
+        Returns:
+            内容が同じ場合はTrue
+        """
+        try:
+            with open(file_path, "r") as f:
+                existing_content = f.read()
+        except OSError as e:
+            logger.warning(f"既存ファイルの読み込みに失敗しました: {file_path} - {e}")
+            return False
+
+        if "timestamp" not in template_vars:
+            return existing_content == content
+
+        # 固定のプレースホルダーでレンダリングし、既存ファイルのタイムスタンプ行も
+        # 同じプレースホルダーに置き換えてから比較する
+        expected_lines = template.render(
+            **{**template_vars, "timestamp": _TIMESTAMP_PLACEHOLDER}
+        ).splitlines(keepends=True)
+        existing_lines = existing_content.splitlines(keepends=True)
+        if len(expected_lines) != len(existing_lines):
+            return False
+
+        for index, line in enumerate(expected_lines):
+            if _TIMESTAMP_PLACEHOLDER not in line:
+                continue
+            prefix, _, suffix = line.partition(_TIMESTAMP_PLACEHOLDER)
+            existing_line = existing_lines[index]
+            if existing_line.startswith(prefix) and existing_line.endswith(suffix):
+                existing_lines[index] = line
+
+        return "".join(existing_lines) == "".join(expected_lines)
+
+    def write_rendered_model(self, model: RenderedModel) -> WriteStatus:
+        """レンダリング済みのモデルをファイルに書き込みます。
+
+        Args:
+            model: レンダリング済みのモデル
+
+        Returns:
+            書き込み結果
+        """
+        status = self._write_model(
+            model.file_path, model.content, model.template, model.template_vars
+        )
+        logger.debug(
+            f"モデルファイルを生成しました: {model.file_path} ({status.value})"
+        )
+        return status
+
     def generate_sql_model(
         self,
         fully_qualified_name: str,
@@ -102,6 +310,32 @@ class ModelGenerator:
         Returns:
             生成されたモデル内容とファイルパスのタプル
         """
+        model = self.render_sql_model(
+            fully_qualified_name, sql_definition, naming_preset
+        )
+
+        # ファイルに書き込む（dry_run=Falseの場合）
+        if not dry_run:
+            self.write_rendered_model(model)
+
+        return model.content, model.file_path
+
+    def render_sql_model(
+        self,
+        fully_qualified_name: str,
+        sql_definition: str,
+        naming_preset: NamingPreset = NamingPreset.FULL,
+    ) -> RenderedModel:
+        """SQLモデルをレンダリングします（ファイルには書き込みません）。
+
+        Args:
+            fully_qualified_name: ビューの完全修飾名
+            sql_definition: ビューのSQL定義
+            naming_preset: ファイル名の命名規則
+
+        Returns:
+            レンダリング済みのモデル
+        """
         # テンプレートを読み込む
         template = self._load_template(self.sql_template_path)
 
@@ -128,23 +362,8 @@ class ModelGenerator:
         # テンプレート変数のログ
         logger.debug(f"テンプレート変数: {template_vars.keys()}")
 
-        try:
-            # テンプレートをレンダリング
-            rendered_content = template.render(**template_vars)
-            logger.debug("テンプレートのレンダリングに成功しました")
-        except Exception as e:
-            logger.error(
-                f"テンプレートのレンダリング中にエラーが発生しました: {str(e)}"
-            )
-            raise
-
-        # ファイルに書き込む（dry_run=Falseの場合）
-        if not dry_run:
-            with open(file_path, "w") as f:
-                f.write(rendered_content)
-            logger.debug(f"SQLモデルファイルを生成しました: {file_path}")
-
-        return rendered_content, file_path
+        rendered_content = self._render(template, template_vars)
+        return RenderedModel(file_path, rendered_content, template, template_vars)
 
     def generate_yaml_model(
         self,
@@ -167,6 +386,36 @@ class ModelGenerator:
         Returns:
             生成されたモデル内容とファイルパスのタプル
         """
+        model = self.render_yaml_model(
+            fully_qualified_name, schema_fields, description, naming_preset, yml_prefix
+        )
+
+        # ファイルに書き込む（dry_run=Falseの場合）
+        if not dry_run:
+            self.write_rendered_model(model)
+
+        return model.content, model.file_path
+
+    def render_yaml_model(
+        self,
+        fully_qualified_name: str,
+        schema_fields: List[Dict[str, str]],
+        description: str = "",
+        naming_preset: NamingPreset = NamingPreset.FULL,
+        yml_prefix: Optional[str] = None,
+    ) -> RenderedModel:
+        """YAMLモデルをレンダリングします（ファイルには書き込みません）。
+
+        Args:
+            fully_qualified_name: ビューの完全修飾名
+            schema_fields: スキーマフィールドのリスト
+            description: モデルの説明
+            naming_preset: ファイル名の命名規則
+            yml_prefix: YAMLファイルの接頭辞
+
+        Returns:
+            レンダリング済みのモデル
+        """
         # テンプレートを読み込む
         template = self._load_template(self.yml_template_path)
 
@@ -195,20 +444,30 @@ class ModelGenerator:
         # テンプレート変数のログ
         logger.debug(f"テンプレート変数: {template_vars.keys()}")
 
-        try:
-            # テンプレートをレンダリング
-            rendered_content = template.render(**template_vars)
-            logger.debug("テンプレートのレンダリングに成功しました")
-        except Exception as e:
-            logger.error(
-                f"テンプレートのレンダリング中にエラーが発生しました: {str(e)}"
-            )
-            raise
+        rendered_content = self._render(template, template_vars)
+        return RenderedModel(file_path, rendered_content, template, template_vars)
 
-        # ファイルに書き込む（dry_run=Falseの場合）
-        if not dry_run:
-            with open(file_path, "w") as f:
-                f.write(rendered_content)
-            logger.debug(f"YAMLモデルファイルを生成しました: {file_path}")
 
-        return rendered_content, file_path
+def _load_template_source(name: str) -> Tuple[str, str, Callable[[], bool]]:
+    """テンプレートのファイルパスからソースを読み込みます。
+
+    jinja2.FunctionLoader から呼び出されます。
+
+    Args:
+        name: テンプレートファイルの絶対パス
+
+    Returns:
+        (テンプレートのソース, ファイル名, 更新確認用の関数) のタプル
+    """
+    path = Path(name)
+    with open(path, "r") as f:
+        source = f.read()
+    mtime = os.path.getmtime(path)
+
+    def uptodate() -> bool:
+        try:
+            return os.path.getmtime(path) == mtime
+        except OSError:
+            return False
+
+    return source, str(path), uptodate
@@ -1,22 +1,75 @@
 """BigQueryビューをdbtモデルにインポートするビジネスロジック"""
 import logging
-import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from rich.console import Console
-from rich.prompt import Confirm
+from rich.prompt import Prompt
 from rich.table import Table
 
-from bq2dbt.converter.bigquery import BigQueryClient
-from bq2dbt.converter.dependency import DependencyResolver
-from bq2dbt.converter.generator import ModelGenerator
-from bq2dbt.utils.logger import setup_logging
-from bq2dbt.utils.naming import NamingPreset, generate_model_name
+from bq2dbt.converter.bigquery import BigQueryClient, MetadataSource, ViewMetadata
+from bq2dbt.converter.clients import ClientFactory, default_pool_size
+from bq2dbt.converter.dependency import (
+    CircularDependencyError,
+    DataCatalogDependencyResolver,
+    DependencyBackend,
+    DependencyResolver,
+    DependencyResolverBase,
+    SqlParsingDependencyResolver,
+)
+from bq2dbt.converter.generator import (
+    ConflictPolicy,
+    ModelGenerator,
+    RenderedModel,
+    WriteMode,
+    WriteStatus,
+)
+from bq2dbt.converter.lineage import LineageClient
+from bq2dbt.converter.pipeline import DEFAULT_QUEUE_SIZE, Stage, run_pipeline
+from bq2dbt.converter.plan import (
+    ImportPlan,
+    PlannedView,
+    load_plan,
+    metadata_fingerprint,
+    save_plan,
+    select_shard,
+)
+from bq2dbt.converter.snapshot import (
+    MetadataSnapshot,
+    SnapshotBigQueryClient,
+    SnapshotLineageClient,
+    load_snapshot,
+    save_snapshot,
+)
+from bq2dbt.utils.api_metrics import api_metrics, format_bytes
+from bq2dbt.utils.cache import (
+    DEFAULT_LINEAGE_CACHE_TTL,
+    TEMPLATE_CACHE_DIR,
+    LineageCache,
+)
+from bq2dbt.utils.checkpoint import ImportCheckpoint
+from bq2dbt.utils.logger import LOG_DIR, current_log_file, setup_logging
+from bq2dbt.utils.naming import NamingPreset, generate_model_filename
+from bq2dbt.utils.output_index import OutputIndex
+from bq2dbt.utils.patterns import match_any
+from bq2dbt.utils.profiling import profiler, span
+
+# レンダリング済みの (SQLモデル, YAMLモデル)
+_RenderedModels = Tuple[RenderedModel, RenderedModel]
+
+
+class NotAViewError(ValueError):
+    """変換対象のオブジェクトがビューでない、または存在しない場合に送出される例外。"""
 
 
 def initialize_bigquery_client(
-    project_id: str, location: str, console: Console
+    project_id: str,
+    location: str,
+    console: Console,
+    metadata_source: MetadataSource = MetadataSource.INFORMATION_SCHEMA,
+    client_factory: Optional[ClientFactory] = None,
 ) -> BigQueryClient:
     """BigQueryクライアントを初期化します。
 
@@ -24,23 +77,35 @@ def initialize_bigquery_client(
         project_id: BigQueryプロジェクトID
         location: BigQueryロケーション
         console: コンソールオブジェクト
+        metadata_source: メタデータの取得方法
+        client_factory: 認証情報と接続を共有するファクトリー（省略時は単独で作成）
 
     Returns:
         初期化されたBigQueryクライアント
     """
     with console.status("BigQueryクライアントを初期化中..."):
-        bq_client = BigQueryClient(project_id, location=location)
+        bq_client = BigQueryClient(
+            project_id,
+            location=location,
+            metadata_source=metadata_source,
+            client_factory=client_factory,
+        )
     return bq_client
 
 
 def initialize_model_generator(
-    sql_template: Optional[str] = None, yml_template: Optional[str] = None
+    sql_template: Optional[str] = None,
+    yml_template: Optional[str] = None,
+    template_cache: bool = False,
+    write_mode: WriteMode = WriteMode.ALWAYS,
 ) -> ModelGenerator:
     """モデルジェネレーターを初期化します。
 
     Args:
         sql_template: SQLモデル用のテンプレートファイルパス
         yml_template: YAMLモデル用のテンプレートファイルパス
+        template_cache: テンプレートのバイトコードをディスクにキャッシュするかどうか
+        write_mode: モデルファイルの書き込み方法
 
     Returns:
         初期化されたModelGeneratorオブジェクト
@@ -49,7 +114,14 @@ def initialize_model_generator(
     output_dir = Path(".")
     sql_template_path = Path(sql_template) if sql_template else None
     yml_template_path = Path(yml_template) if yml_template else None
-    return ModelGenerator(output_dir, sql_template_path, yml_template_path)
+    bytecode_cache_dir = TEMPLATE_CACHE_DIR if template_cache else None
+    return ModelGenerator(
+        output_dir,
+        sql_template_path,
+        yml_template_path,
+        bytecode_cache_dir,
+        write_mode=write_mode,
+    )
 
 
 def setup_output_directory(output_path: Path, console: Console) -> None:
@@ -119,6 +191,58 @@ def display_views_table(views: List[str], console: Console) -> None:
     console.print(table)
 
 
+def create_dependency_resolver(
+    backend: DependencyBackend,
+    bq_client: BigQueryClient,
+    lineage_concurrency: int = 1,
+    lineage_cache: Optional[LineageCache] = None,
+    refresh_lineage: bool = False,
+    lineage_client: Optional[LineageClient] = None,
+) -> DependencyResolverBase:
+    """依存関係の解析方法に応じたリゾルバーを作成します。
+
+    Args:
+        backend: 依存関係の解析方法
+        bq_client: BigQueryクライアント
+        lineage_concurrency: Lineage APIを並列に呼び出す最大数
+        lineage_cache: 依存関係の永続キャッシュ（省略時はキャッシュしない）
+        refresh_lineage: キャッシュを読まずにLineage APIから取得し直すかどうか
+        lineage_client: 使用するLineageクライアント（省略時は新しく作成）
+
+    Returns:
+        依存関係リゾルバー
+    """
+    if backend == DependencyBackend.SQL:
+        return SqlParsingDependencyResolver(bq_client)
+
+    if backend == DependencyBackend.HYBRID:
+        if lineage_client is None:
+            lineage_client = LineageClient(
+                bq_client.project_id,
+                bq_client.location,
+                cache=lineage_cache,
+                refresh_cache=refresh_lineage,
+                client_factory=bq_client.client_factory,
+            )
+        return SqlParsingDependencyResolver(
+            bq_client,
+            fallback_lineage_client=lineage_client,
+            max_workers=lineage_concurrency,
+        )
+
+    if lineage_client is not None:
+        return DataCatalogDependencyResolver(
+            bq_client, lineage_client, max_workers=lineage_concurrency
+        )
+
+    return DependencyResolver(
+        bq_client,
+        max_workers=lineage_concurrency,
+        lineage_cache=lineage_cache,
+        refresh_lineage=refresh_lineage,
+    )
+
+
 def analyze_dependencies(
     views: List[str],
     dataset: str,
@@ -127,6 +251,12 @@ def analyze_dependencies(
     console: Console,
     logger: logging.Logger,
     max_depth: int = 3,
+    lineage_concurrency: int = 1,
+    lineage_cache: Optional[LineageCache] = None,
+    refresh_lineage: bool = False,
+    dependency_backend: DependencyBackend = DependencyBackend.LINEAGE,
+    lineage_client: Optional[LineageClient] = None,
+    dependency_graph: Optional[Dict[str, List[str]]] = None,
 ) -> Tuple[List[str], List[str]]:
     """ビュー間の依存関係を分析します。
 
@@ -138,6 +268,12 @@ def analyze_dependencies(
         console: コンソールオブジェクト
         logger: ロガーオブジェクト
         max_depth: 依存関係の最大深度
+        lineage_concurrency: Lineage APIを並列に呼び出す最大数
+        lineage_cache: 依存関係の永続キャッシュ（省略時はキャッシュしない）
+        refresh_lineage: キャッシュを読まずにLineage APIから取得し直すかどうか
+        dependency_backend: 依存関係の解析方法
+        lineage_client: 使用するLineageクライアント（省略時は新しく作成）
+        dependency_graph: 解析した依存関係（ビュー名 -> 依存先のリスト）の格納先
 
     Returns:
         (全てのビュー, 変換順序に並べられたビュー) のタプル
@@ -147,7 +283,14 @@ def analyze_dependencies(
         return views, views
 
     console.print("ビュー間の依存関係を分析中...")
-    resolver = DependencyResolver(bq_client)
+    resolver = create_dependency_resolver(
+        dependency_backend,
+        bq_client,
+        lineage_concurrency=lineage_concurrency,
+        lineage_cache=lineage_cache,
+        refresh_lineage=refresh_lineage,
+        lineage_client=lineage_client,
+    )
 
     # 進捗状況を表示する関数
     def status_update(view_name: str, current: int, total: int) -> None:
@@ -158,9 +301,20 @@ def analyze_dependencies(
         all_views, dependency_info = resolver.analyze_dependencies(
             views, dataset, max_depth=max_depth, status_callback=status_update
         )
+        if dependency_graph is not None:
+            dependency_graph.update(
+                {view: list(deps) for view, deps in dependency_info.items()}
+            )
 
         # 依存関係に基づいてビューの順序を決定
-        ordered_views = resolver.get_topological_order()
+        try:
+            ordered_views = resolver.get_topological_order()
+        except CircularDependencyError as e:
+            # 循環参照がある場合は順序付けせず、分析で見つかった順に変換する
+            logger.warning(str(e))
+            console.print(f"[bold yellow]警告:[/] {e}")
+            console.print("依存関係の順序付けを行わずに変換します。")
+            return all_views, all_views
 
         return all_views, ordered_views
     except Exception as e:
@@ -207,8 +361,88 @@ def display_ordered_views(ordered_views: List[str], console: Console) -> None:
     console.print(table)
 
 
+def prefetch_metadata(
+    views: List[str],
+    bq_client: BigQueryClient,
+    console: Console,
+    logger: logging.Logger,
+) -> None:
+    """変換対象ビューのメタデータをデータセット単位で一括取得します。
+
+    ビューごとに問い合わせる代わりに、対象ビューが属するデータセットごとに
+    カタログを読み込みます。読み込みに失敗したデータセットはビュー単位の取得にフォールバックします。
+
+    Args:
+        views: 変換対象のビュー名のリスト
+        bq_client: BigQueryクライアント
+        console: コンソールオブジェクト
+        logger: ロガーオブジェクト
+    """
+    datasets: List[Tuple[str, str]] = []
+    for view in views:
+        parts = view.split(".")
+        if len(parts) != 3:
+            continue
+        key = (parts[0], parts[1])
+        if key not in datasets:
+            datasets.append(key)
+
+    for project, dataset in datasets:
+        with console.status(f"データセット '{project}.{dataset}' のメタデータを取得中..."):
+            try:
+                bq_client.load_catalog(dataset, project_id=project)
+            except Exception as e:
+                logger.warning(
+                    f"メタデータの一括取得に失敗しました。ビュー単位で取得します: "
+                    f"{project}.{dataset} - {e}"
+                )
+
+
+def fetch_view_metadata(
+    views: List[str], bq_client: BigQueryClient, jobs: int = 1
+) -> Tuple[Dict[str, ViewMetadata], Dict[str, Exception]]:
+    """ビューのメタデータを取得します。
+
+    メタデータの取得方法がAPIの場合や、カタログの読み込みに失敗したデータセットでは
+    ビューごとに tables.get を呼び出すため、jobsが2以上の場合はスレッドプールで並列に取得します。
+
+    Args:
+        views: ビュー名のリスト
+        bq_client: BigQueryクライアント
+        jobs: 並列に取得するビューの最大数
+
+    Returns:
+        (ビュー名 -> メタデータ, ビュー名 -> 取得時の例外) のタプル（いずれもviewsの順）
+    """
+
+    def fetch(view: str) -> Union[ViewMetadata, Exception]:
+        try:
+            return bq_client.get_view_metadata(view)
+        except Exception as e:
+            return e
+
+    if jobs <= 1 or len(views) <= 1:
+        results = [fetch(view) for view in views]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(fetch, views))
+
+    metadata: Dict[str, ViewMetadata] = {}
+    errors: Dict[str, Exception] = {}
+    for view, result in zip(views, results):
+        if isinstance(result, Exception):
+            errors[view] = result
+        else:
+            metadata[view] = result
+    return metadata, errors
+
+
 def check_file_exists(
-    view: str, naming_preset: NamingPreset, output_path: Path
+    view: str,
+    naming_preset: NamingPreset,
+    output_path: Path,
+    yml_prefix: Optional[str] = None,
+    output_index: Optional[OutputIndex] = None,
 ) -> Tuple[bool, bool, Path, Path]:
     """ファイルが既に存在するかどうかを確認します。
 
@@ -216,6 +450,8 @@ def check_file_exists(
         view: ビュー名
         naming_preset: 命名規則プリセット
         output_path: 出力ディレクトリのパス
+        yml_prefix: YAMLファイルの接頭辞（デフォルト: None）
+        output_index: 出力ディレクトリの索引（省略時はファイルシステムを確認）
 
     Returns:
         (SQLファイルが存在するか, YAMLファイルが存在するか, SQLファイルパス, YAMLファイルパス) のタプル
@@ -225,52 +461,139 @@ def check_file_exists(
     if len(parts) != 3:
         raise ValueError(f"無効なビュー名: {view}")
 
-    project_id, dataset, view_name = parts
+    # ModelGeneratorが書き込むファイル名と同じ命名で確認する
+    sql_path = output_path / generate_model_filename(
+        view, naming_preset, extension="sql"
+    )
+    yml_path = output_path / generate_model_filename(
+        view, naming_preset, extension="yml", yml_prefix=yml_prefix
+    )
+
+    exists = output_index.exists if output_index is not None else Path.exists
+    return exists(sql_path), exists(yml_path), sql_path, yml_path
 
-    # 命名規則に基づいてファイル名を生成
-    base_name = generate_model_name(view, naming_preset)
 
-    sql_path = output_path / f"{base_name}.sql"
-    yml_path = output_path / f"{base_name}.yml"
+def display_conflicts(conflicts: Dict[str, List[str]], console: Console) -> None:
+    """既存ファイルがあるビューの一覧を表示します。
 
-    return sql_path.exists(), yml_path.exists(), sql_path, yml_path
+    Args:
+        conflicts: ビュー名 -> 既存のファイル名のリスト
+        console: コンソールオブジェクト
+    """
+    table = Table(title=f"既存ファイルがあるビュー ({len(conflicts)}個)")
+    table.add_column("番号", style="dim")
+    table.add_column("ビュー名", style="cyan")
+    table.add_column("既存ファイル", style="yellow")
 
+    for number, (view, existing_files) in enumerate(conflicts.items(), 1):
+        table.add_row(str(number), view, ", ".join(existing_files))
 
-def confirm_view_import(
-    view: str,
-    files_exist: bool,
-    existing_files: List[str],
-    non_interactive: bool,
-) -> Tuple[bool, bool]:
-    """ビューのインポートを確認します。
+    console.print(table)
+
+
+def _parse_selection(text: str, count: int) -> List[int]:
+    """番号の指定（カンマ区切り、範囲指定可）を解析します。
 
     Args:
-        view: ビュー名
-        files_exist: ファイルが既に存在するかどうか
-        existing_files: 既存のファイル名のリスト
-        non_interactive: 非インタラクティブモードかどうか
+        text: 番号の指定 (e.g. "1,3-5", "all", "none")
+        count: 選択肢の数
+
+    Returns:
+        選択された0始まりの番号のリスト（昇順）
+
+    Raises:
+        ValueError: 番号の指定が不正な場合
+    """
+    text = text.strip().lower()
+    if text == "all":
+        return list(range(count))
+    if text in ("", "none"):
+        return []
+
+    selected = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        try:
+            start = int(first)
+            end = int(last) if last else start
+        except ValueError:
+            raise ValueError(f"番号を解析できません: {part}")
+        if not 1 <= start <= end <= count:
+            raise ValueError(f"番号の範囲が不正です: {part} (1-{count})")
+        selected.update(range(start - 1, end))
+    return sorted(selected)
+
+
+def select_conflicts(views: List[str], console: Console) -> List[str]:
+    """上書きするビューを番号でまとめて選択します。
+
+    Args:
+        views: 既存ファイルがあるビュー名のリスト
+        console: コンソールオブジェクト
 
     Returns:
-        (インポートするかどうか, 上書きするかどうか) のタプル
+        上書きするビュー名のリスト
     """
-    if not files_exist:
-        return True, False
+    while True:
+        answer = Prompt.ask(
+            "上書きするビューの番号を入力してください"
+            "（カンマ区切り、範囲指定可 e.g. 1,3-5 / all / none）",
+            default="all",
+        )
+        try:
+            return [views[index] for index in _parse_selection(answer, len(views))]
+        except ValueError as e:
+            console.print(f"[bold red]エラー:[/] {e}")
 
-    if non_interactive:
-        return True, True
 
-    print(f"\nビュー '{view}' のファイルが既に存在します:")
-    for file in existing_files:
-        print(f"  - {file}")
+def resolve_conflicts(
+    conflicts: Dict[str, List[str]],
+    policy: ConflictPolicy,
+    non_interactive: bool,
+    console: Console,
+) -> Tuple[Dict[str, str], ConflictPolicy]:
+    """既存ファイルがあるビューの扱いを、変換を始める前にまとめて決定します。
 
-    import_this_view = Confirm.ask(
-        f"このビューをインポートしますか? {view}", default=True
-    )
-    if not import_this_view:
-        return False, False
+    policy が ASK の場合は一覧を表示し、一括の扱いか個別の選択を1回だけ尋ねます
+    （非インタラクティブモードではすべて上書きします）。
+
+    Args:
+        conflicts: ビュー名 -> 既存のファイル名のリスト
+        policy: 既存ファイルの扱い
+        non_interactive: 非インタラクティブモードかどうか
+        console: コンソールオブジェクト
+
+    Returns:
+        (スキップするビューと理由の辞書, 適用する扱い) のタプル
+        （適用する扱いが CHANGED の場合は内容が変わったファイルのみ書き込みます）
+    """
+    if policy == ConflictPolicy.ASK:
+        if non_interactive or not conflicts:
+            return {}, ConflictPolicy.OVERWRITE
+
+        display_conflicts(conflicts, console)
+        choices = [p.value for p in ConflictPolicy if p != ConflictPolicy.ASK]
+        answer = Prompt.ask(
+            "既存ファイルの扱いを選択してください（select: 個別に選択）",
+            choices=choices + ["select"],
+            default=ConflictPolicy.OVERWRITE.value,
+        )
+        if answer == "select":
+            selected = select_conflicts(list(conflicts), console)
+            skipped = {
+                view: "ユーザーによりスキップ"
+                for view in conflicts
+                if view not in selected
+            }
+            return skipped, ConflictPolicy.OVERWRITE
+        policy = ConflictPolicy(answer)
 
-    overwrite = Confirm.ask("既存のファイルを上書きしますか?", default=True)
-    return True, overwrite
+    if policy == ConflictPolicy.SKIP:
+        return {view: "既存ファイルを上書きしない" for view in conflicts}, policy
+    return {}, policy
 
 
 def convert_view(
@@ -282,6 +605,7 @@ def convert_view(
     debug: bool,
     logger: logging.Logger,
     yml_prefix: Optional[str] = None,
+    metadata: Optional[ViewMetadata] = None,
 ) -> Tuple[str, Path, Path]:
     """ビューをdbtモデルに変換します。
 
@@ -295,32 +619,31 @@ def convert_view(
         logger: ロガーオブジェクト
         yml_prefix: YAMLファイルの接頭辞（デフォルト: None）
                      e.g. "_" -> _model_name.yml
+        metadata: 取得済みのビューのメタデータ（省略時は取得する）
     Returns:
         (ビュー名, SQLファイルパス, YAMLファイルパス) のタプル
 
     Raises:
         RuntimeError: 変換中にエラーが発生した場合
-        ValueError: テーブルタイプがVIEW以外、またはオブジェクトが存在しない場合
-    """
-    # テーブルタイプを確認
-    table_type = bq_client.get_table_type(view)
-    if table_type != "VIEW":
-        # ビューでない場合はValueErrorを返す（呼び出し元でスキップ処理する）
-        if not table_type:
-            raise ValueError(f"オブジェクトが存在しません: {view}")
-        else:
-            raise ValueError(
-                f"オブジェクトはビューではありません (タイプ: {table_type}): {view}"
-            )
+        NotAViewError: テーブルタイプがVIEW以外、またはオブジェクトが存在しない場合
+    """
+    # 種類・定義・スキーマを1回の問い合わせで取得
+    if metadata is None:
+        metadata = bq_client.get_view_metadata(view)
+
+    # テーブルタイプを確認（ビューでない場合は呼び出し元でスキップ処理する）
+    _require_view(view, metadata)
 
     try:
-        # ビュー定義を取得
-        view_definition = bq_client.get_view_definition(view)
+        # ビュー定義
+        view_definition = metadata.view_query
+        if not view_definition:
+            raise ValueError(f"ビュー定義を取得できません: {view}")
         if debug:
             logger.debug(f"ビュー定義: {view_definition}")
 
-        # ビューのスキーマを取得
-        schema = bq_client.get_view_schema(view)
+        # ビューのスキーマ
+        schema = list(metadata.schema)
         if debug:
             logger.debug(f"ビュースキーマ: {schema}")
 
@@ -329,9 +652,9 @@ def convert_view(
             view, view_definition, naming_preset_enum, dry_run
         )
 
-        # YAMLモデルを生成
+        # YAMLモデルを生成（ビューの説明をモデルの説明に使用）
         yml_content, yml_path = generator.generate_yaml_model(
-            view, schema, "", naming_preset_enum, dry_run, yml_prefix
+            view, schema, metadata.description, naming_preset_enum, dry_run, yml_prefix
         )
 
         return view, sql_path, yml_path
@@ -342,12 +665,212 @@ def convert_view(
         ) from e
 
 
+def _require_view(view: str, metadata: ViewMetadata) -> None:
+    """メタデータがビューのものであることを確認します。
+
+    Args:
+        view: ビュー名
+        metadata: ビューのメタデータ
+
+    Raises:
+        NotAViewError: テーブルタイプがVIEW以外、またはオブジェクトが存在しない場合
+    """
+    table_type = metadata.table_type
+    if table_type == "VIEW":
+        return
+    if not table_type:
+        raise NotAViewError(f"オブジェクトが存在しません: {view}")
+    raise NotAViewError(
+        f"オブジェクトはビューではありません (タイプ: {table_type}): {view}"
+    )
+
+
+def stream_convert_views(
+    views: Iterable[str],
+    bq_client: BigQueryClient,
+    generator: ModelGenerator,
+    naming_preset_enum: NamingPreset,
+    dry_run: bool,
+    logger: logging.Logger,
+    yml_prefix: Optional[str] = None,
+    jobs: int = 1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    skip_existing: bool = False,
+) -> Tuple[List[Tuple[str, Path, Path]], Dict[str, str]]:
+    """ビューのメタデータ取得からファイルの書き込みまでをストリーミングで実行します。
+
+    メタデータの取得（jobs並列）、レンダリング、書き込みの各段階を
+    サイズ上限付きのキューでつなぎ、ビューごとに完了したものから順に書き込みます。
+    viewsにはジェネレーターを渡せるため、ビュー一覧の取得と変換も並行して進みます。
+
+    Args:
+        views: 変換するビュー名のイテラブル
+        bq_client: BigQueryクライアント
+        generator: モデルジェネレーター
+        naming_preset_enum: 命名規則プリセット
+        dry_run: ドライランモードかどうか
+        logger: ロガーオブジェクト
+        yml_prefix: YAMLファイルの接頭辞（デフォルト: None）
+        jobs: メタデータを並列に取得する最大数
+        queue_size: 段階の間のキューに保持する最大件数
+        skip_existing: 既存ファイルがあるビューを書き込まずにスキップするかどうか
+
+    Returns:
+        (変換されたモデルのリスト, 変換できなかったビューと理由の辞書) のタプル
+        （いずれも入力順）
+    """
+
+    def fetch(view: str) -> ViewMetadata:
+        metadata = bq_client.get_view_metadata(view)
+        _require_view(view, metadata)
+        if not metadata.view_query:
+            raise RuntimeError(f"ビュー定義を取得できません: {view}")
+        return metadata
+
+    def render(metadata: ViewMetadata) -> _RenderedModels:
+        view = metadata.fully_qualified_name
+        sql_model = generator.render_sql_model(
+            view, metadata.view_query, naming_preset_enum
+        )
+        yml_model = generator.render_yaml_model(
+            view,
+            list(metadata.schema),
+            metadata.description,
+            naming_preset_enum,
+            yml_prefix,
+        )
+        return sql_model, yml_model
+
+    def write(models: _RenderedModels) -> _RenderedModels:
+        if skip_existing:
+            index = generator.output_index
+            exists = index.exists if index is not None else Path.exists
+            if any(exists(model.file_path) for model in models):
+                raise FileExistsError("既存ファイルを上書きしない")
+        if not dry_run:
+            for model in models:
+                generator.write_rendered_model(model)
+        return models
+
+    stages = [
+        Stage("metadata", fetch, workers=jobs),
+        Stage("render", render),
+        Stage("write", write),
+    ]
+
+    converted: List[Tuple[int, Tuple[str, Path, Path]]] = []
+    failed: List[Tuple[int, str, str]] = []
+    for result in run_pipeline(views, stages, queue_size=queue_size):
+        view = result.item
+        if result.error is None:
+            sql_model, yml_model = result.value
+            converted.append(
+                (result.index, (view, sql_model.file_path, yml_model.file_path))
+            )
+            logger.info(f"ビューを変換しました: {view}")
+        elif isinstance(result.error, NotAViewError):
+            # ビューでないオブジェクトはスキップ（メタデータの取得の失敗はエラー）
+            failed.append((result.index, view, str(result.error)))
+        elif isinstance(result.error, FileExistsError):
+            failed.append((result.index, view, str(result.error)))
+        else:
+            logger.error(
+                f"ビュー '{view}' の変換中にエラーが発生しました: {result.error}"
+            )
+            failed.append((result.index, view, f"エラー: {result.error}"))
+
+    converted.sort(key=lambda entry: entry[0])
+    failed.sort(key=lambda entry: entry[0])
+    return (
+        [model for _, model in converted],
+        {view: reason for _, view, reason in failed},
+    )
+
+
+def convert_views(
+    views: List[str],
+    bq_client: BigQueryClient,
+    generator: ModelGenerator,
+    naming_preset_enum: NamingPreset,
+    dry_run: bool,
+    debug: bool,
+    logger: logging.Logger,
+    yml_prefix: Optional[str] = None,
+    jobs: int = 1,
+    metadata: Optional[Dict[str, ViewMetadata]] = None,
+    result_callback: Optional[Callable[[str, str], None]] = None,
+) -> Tuple[List[Tuple[str, Path, Path]], Dict[str, str]]:
+    """複数のビューをdbtモデルに変換します。
+
+    jobsが2以上の場合はスレッドプールで並列に変換します。
+    結果は並列度に関わらず入力されたビューの順序で返します。
+
+    Args:
+        views: 変換するビュー名のリスト
+        bq_client: BigQueryクライアント
+        generator: モデルジェネレーター
+        naming_preset_enum: 命名規則プリセット
+        dry_run: ドライランモードかどうか
+        debug: デバッグモードかどうか
+        logger: ロガーオブジェクト
+        yml_prefix: YAMLファイルの接頭辞（デフォルト: None）
+        jobs: 並列に変換するビューの最大数
+        metadata: ビュー名 -> 取得済みのメタデータ（含まれないビューは個別に取得する）
+        result_callback: ビューの変換が終わるたびに (ビュー名, 失敗した理由) を
+            受け取る関数（成功した場合の理由は空文字列、並列時は各スレッドから呼ばれる）
+
+    Returns:
+        (変換されたモデルのリスト, 変換に失敗したビューと理由の辞書) のタプル
+    """
+    metadata = metadata or {}
+
+    def convert(view: str) -> Tuple[Optional[Tuple[str, Path, Path]], str]:
+        try:
+            result = convert_view(
+                view,
+                bq_client,
+                generator,
+                naming_preset_enum,
+                dry_run,
+                debug,
+                logger,
+                yml_prefix,
+                metadata=metadata.get(view),
+            )
+            outcome: Tuple[Optional[Tuple[str, Path, Path]], str] = (result, "")
+        except Exception as e:
+            logger.error(f"ビュー '{view}' の変換中にエラーが発生しました: {e}")
+            outcome = (None, f"エラー: {str(e)}")
+        if result_callback is not None:
+            result_callback(view, outcome[1])
+        return outcome
+
+    if jobs <= 1 or len(views) <= 1:
+        outcomes = [convert(view) for view in views]
+    else:
+        logger.debug(f"{len(views)}個のビューを{jobs}並列で変換します")
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            # executor.mapは完了順ではなく投入順に結果を返す
+            outcomes = list(executor.map(convert, views))
+
+    converted_models: List[Tuple[str, Path, Path]] = []
+    failed_views: Dict[str, str] = {}
+    for view, (result, error) in zip(views, outcomes):
+        if result is not None:
+            converted_models.append(result)
+        else:
+            failed_views[view] = error
+
+    return converted_models, failed_views
+
+
 def display_conversion_results(
     converted_models: List[Tuple[str, Path, Path]],
     skipped_views: Dict[str, str],
     dry_run: bool,
     console: Console,
     logger: logging.Logger,
+    write_counts: Optional[Dict[WriteStatus, int]] = None,
 ) -> None:
     """変換結果を表示します。
 
@@ -357,6 +880,7 @@ def display_conversion_results(
         dry_run: ドライランモードかどうか
         console: コンソールオブジェクト
         logger: ロガーオブジェクト
+        write_counts: 書き込み結果ごとのファイル数
     """
     if dry_run:
         console.print(
@@ -368,6 +892,15 @@ def display_conversion_results(
         + ("（ドライラン）" if dry_run else "")
     )
 
+    if write_counts and not dry_run:
+        summary = (
+            f"新規 {write_counts.get(WriteStatus.NEW, 0)}, "
+            f"更新 {write_counts.get(WriteStatus.WRITTEN, 0)}, "
+            f"変更なし {write_counts.get(WriteStatus.UNCHANGED, 0)}"
+        )
+        console.print(f"ファイル: {summary}")
+        logger.info(f"ファイルの書き込み結果: {summary}")
+
     if converted_models:
         table = Table(title="変換されたモデル")
         table.add_column("ビュー名", style="cyan")
@@ -392,6 +925,120 @@ def display_conversion_results(
             logger.info(f"スキップされたビュー: {view}: {reason}")
         console.print(table)
 
+    display_api_metrics(console, logger)
+
+
+def display_api_metrics(console: Console, logger: logging.Logger) -> None:
+    """API呼び出しの回数、エラー、リトライ、レイテンシを表示し、ログに記録します。
+
+    API呼び出しがない場合（スナップショットからのインポートなど）は何も表示しません。
+
+    Args:
+        console: コンソールオブジェクト
+        logger: ロガーオブジェクト
+    """
+    calls, query_jobs = api_metrics.summary()
+    if not calls:
+        return
+
+    table = Table(title="API呼び出し")
+    table.add_column("API", style="cyan", no_wrap=True)
+    table.add_column("回数", justify="right")
+    table.add_column("エラー", justify="right")
+    table.add_column("リトライ", justify="right")
+    table.add_column("p50(ms)", justify="right")
+    table.add_column("p95(ms)", justify="right")
+    table.add_column("最大(ms)", justify="right")
+    for stats in calls:
+        p50, p95 = stats.percentile(50), stats.percentile(95)
+        table.add_row(
+            stats.name,
+            str(stats.calls),
+            str(stats.errors),
+            str(stats.retries),
+            f"≤{p50 * 1000:.0f}" if p50 is not None else "-",
+            f"≤{p95 * 1000:.0f}" if p95 is not None else "-",
+            f"{stats.max * 1000:.0f}" if p50 is not None else "-",
+        )
+        logger.info(
+            f"API呼び出し: {stats.name}: {stats.calls}回, "
+            f"エラー {stats.errors}回, リトライ {stats.retries}回, "
+            f"最大 {stats.max * 1000:.0f}ms, ヒストグラム {stats.histogram}"
+        )
+    console.print(table)
+
+    if query_jobs.jobs:
+        summary = (
+            f"{query_jobs.jobs}件, "
+            f"処理 {format_bytes(query_jobs.bytes_processed)}, "
+            f"課金 {format_bytes(query_jobs.bytes_billed)}, "
+            f"スロット時間 {query_jobs.slot_millis / 1000:.1f}秒, "
+            f"キャッシュヒット {query_jobs.cache_hits}件"
+        )
+        console.print(f"クエリジョブ: {summary}")
+        logger.info(f"クエリジョブ: {summary}")
+
+
+def report_profile(
+    console: Console,
+    logger: logging.Logger,
+    report_path: Optional[Path] = None,
+) -> Optional[Path]:
+    """計測した処理時間の集計結果を表示し、JSONファイルに保存します。
+
+    表示後はプロファイラーを無効にします。
+
+    Args:
+        console: コンソールオブジェクト
+        logger: ロガーオブジェクト
+        report_path: 保存先のパス（省略時はログファイルと同じ場所に
+            <ログファイル名>.profile.json として保存）
+
+    Returns:
+        保存したレポートのパス、または計測結果がない場合はNone
+    """
+    profiler.disable()
+    stats = profiler.summary()
+    if not stats:
+        return None
+
+    table = Table(title="処理時間")
+    table.add_column("区間", style="cyan")
+    table.add_column("回数", justify="right")
+    table.add_column("合計(秒)", justify="right")
+    table.add_column("p50(ms)", justify="right")
+    table.add_column("p95(ms)", justify="right")
+    for span_stats in stats:
+        table.add_row(
+            span_stats.name,
+            str(span_stats.count),
+            f"{span_stats.total:.3f}",
+            f"{span_stats.p50 * 1000:.1f}",
+            f"{span_stats.p95 * 1000:.1f}",
+        )
+        logger.debug(
+            f"処理時間: {span_stats.name}: {span_stats.count}回, "
+            f"合計 {span_stats.total:.3f}秒, "
+            f"p50 {span_stats.p50 * 1000:.1f}ms, p95 {span_stats.p95 * 1000:.1f}ms"
+        )
+    console.print(table)
+
+    if report_path is None:
+        log_file = current_log_file()
+        if log_file is not None:
+            report_path = log_file.with_suffix(".profile.json")
+        else:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            report_path = LOG_DIR / f"{timestamp}.profile.json"
+    profiler.write_report(
+        report_path,
+        created_at=datetime.now().isoformat(),
+        api_calls=api_metrics.to_dict(),
+    )
+    console.print(f"処理時間のレポートを保存しました: {report_path}")
+    return report_path
+
 
 def _match_pattern(text: str, pattern: str) -> bool:
     """簡易的なパターンマッチングを行います。
@@ -403,9 +1050,7 @@ def _match_pattern(text: str, pattern: str) -> bool:
     Returns:
         マッチする場合はTrue、しない場合はFalse
     """
-    # *をワイルドカードとして扱い、正規表現に変換
-    regex_pattern = pattern.replace("*", ".*")
-    return bool(re.match(f"^{regex_pattern}$", text))
+    return match_any(text, (pattern,))
 
 
 def filter_views(
@@ -432,6 +1077,13 @@ def filter_views(
     if not include_patterns and not exclude_patterns:
         return views
 
+    # パターンに"."が含まれている場合はFQN全体、それ以外はview部分のみに対してマッチング
+    # （後方互換性のため）。パターンは種類ごとに1つの正規表現にまとめて評価する
+    include_fqn = tuple(p for p in include_patterns or () if "." in p)
+    include_name = tuple(p for p in include_patterns or () if "." not in p)
+    exclude_fqn = tuple(p for p in exclude_patterns or () if "." in p)
+    exclude_name = tuple(p for p in exclude_patterns or () if "." not in p)
+
     filtered_views = []
     for view in views:
         # ビュー名の形式を確認（project.dataset.viewの形式であることを確認）
@@ -444,82 +1096,316 @@ def filter_views(
         project, dataset, view_name = parts
 
         # 含めるパターンによるフィルタリング
-        if include_patterns:
-            include_match = False
-            for pattern in include_patterns:
-                # パターンに"."が含まれている場合はFQN全体に対してマッチング
-                if "." in pattern:
-                    # FQN全体に対してパターンマッチング
-                    if _match_pattern(view, pattern):
-                        include_match = True
-                        break
-                else:
-                    # view部分のみに対してパターンマッチング（後方互換性のため）
-                    if _match_pattern(view_name, pattern):
-                        include_match = True
-                        break
-            if not include_match:
-                continue  # マッチしない場合はスキップ
+        if include_patterns and not (
+            match_any(view, include_fqn) or match_any(view_name, include_name)
+        ):
+            continue  # マッチしない場合はスキップ
 
         # 除外パターンによるフィルタリング
-        if exclude_patterns:
-            exclude_match = False
-            for pattern in exclude_patterns:
-                # パターンに"."が含まれている場合はFQN全体に対してマッチング
-                if "." in pattern:
-                    # FQN全体に対してパターンマッチング
-                    if _match_pattern(view, pattern):
-                        exclude_match = True
-                        break
-                else:
-                    # view部分のみに対してパターンマッチング（後方互換性のため）
-                    if _match_pattern(view_name, pattern):
-                        exclude_match = True
-                        break
-            if exclude_match:
-                continue  # マッチする場合はスキップ
+        if exclude_patterns and (
+            match_any(view, exclude_fqn) or match_any(view_name, exclude_name)
+        ):
+            continue  # マッチする場合はスキップ
 
         filtered_views.append(view)
 
     return filtered_views
 
 
-def import_views(
+def resolve_import_order(
+    bq_client: BigQueryClient,
     project_id: str,
-    dataset: str,
-    output_dir: Path,
-    naming_preset: str,
-    dry_run: bool = False,
-    include_views: Optional[List[str]] = None,
-    exclude_views: Optional[List[str]] = None,
-    non_interactive: bool = False,
-    sql_template: Optional[str] = None,
-    yml_template: Optional[str] = None,
-    yml_prefix: Optional[str] = None,
-    include_dependencies: bool = False,
-    location: str = "asia-northeast1",
-    debug: bool = False,
+    datasets: List[str],
+    include_views: Optional[List[str]],
+    exclude_views: Optional[List[str]],
+    include_dependencies: bool,
+    console: Console,
+    logger: logging.Logger,
     max_depth: int = 3,
-) -> None:
-    """BigQueryビューをdbtモデルにインポートします。
+    lineage_concurrency: int = 8,
+    lineage_cache_ttl: int = DEFAULT_LINEAGE_CACHE_TTL,
+    refresh_lineage: bool = False,
+    dependency_backend: DependencyBackend = DependencyBackend.LINEAGE,
+    lineage_client: Optional[LineageClient] = None,
+    dependency_graph: Optional[Dict[str, List[str]]] = None,
+) -> Optional[List[str]]:
+    """ビュー一覧を取得し、依存関係を解決して変換順序を決定します。
 
     Args:
-        project_id: BigQueryプロジェクトID
-        dataset: データセットID
-        output_dir: 出力ディレクトリのパス
-        naming_preset: 命名規則プリセット
-        dry_run: ドライランモードかどうか
+        bq_client: BigQueryクライアント
+        project_id: プロジェクトID
+        datasets: データセットIDのリスト
         include_views: 含めるビュー名のパターンリスト
         exclude_views: 除外するビュー名のパターンリスト
-        non_interactive: 非インタラクティブモードかどうか
-        sql_template: SQLモデル用のテンプレートファイルパス
+        include_dependencies: 依存関係にあるビューも含めるかどうか
+        console: コンソールオブジェクト
+        logger: ロガーオブジェクト
+        max_depth: 依存関係の最大深度
+        lineage_concurrency: 依存関係解析でLineage APIを並列に呼び出す最大数
+        lineage_cache_ttl: Lineageキャッシュの有効期間（秒）。0以下の場合はキャッシュしない
+        refresh_lineage: キャッシュを読まずにLineage APIから取得し直すかどうか
+        dependency_backend: 依存関係の解析方法
+        lineage_client: 使用するLineageクライアント（省略時は新たに作成）
+        dependency_graph: 解析した依存関係（ビュー名 -> 依存先のリスト）の格納先
+
+    Returns:
+        変換順序に並べたビュー名のリスト、またはビューが見つからない場合はNone
+    """
+    # ビュー一覧の取得
+    views = []
+    with span("import.list_views"):
+        for dataset in datasets:
+            views.extend(
+                fetch_views(
+                    bq_client,
+                    dataset,
+                    include_views,
+                    exclude_views,
+                    console,
+                    project_id,
+                )
+                or []
+            )
+    if not views:
+        return None
+
+    # ビュー一覧の表示
+    display_views_table(views, console)
+
+    # 依存関係の分析
+    lineage_cache = None
+    if (
+        include_dependencies
+        and dependency_backend != DependencyBackend.SQL
+        and lineage_cache_ttl > 0
+    ):
+        lineage_cache = LineageCache(ttl=lineage_cache_ttl)
+    try:
+        with span("import.resolve_dependencies"):
+            all_views, ordered_views = analyze_dependencies(
+                views,
+                ",".join(datasets),
+                include_dependencies,
+                bq_client,
+                console,
+                logger,
+                max_depth,
+                lineage_concurrency,
+                lineage_cache=lineage_cache,
+                refresh_lineage=refresh_lineage,
+                dependency_backend=dependency_backend,
+                lineage_client=lineage_client,
+                dependency_graph=dependency_graph,
+            )
+    finally:
+        if lineage_cache is not None:
+            lineage_cache.close()
+
+    # 依存関係により追加されたビューの表示
+    added_views = [view for view in all_views if view not in views]
+    if added_views:
+        display_added_views(added_views, console)
+
+    # 依存関係で追加されたビューも含めて、フィルタリングを適用
+    if include_dependencies and (include_views or exclude_views):
+        logger.info("依存関係で追加されたビューにもフィルタリングを適用します")
+        ordered_views = filter_views(
+            ordered_views, include_views, exclude_views, logger
+        )
+        logger.info(f"フィルタリング後のビュー数: {len(ordered_views)}")
+
+    # 変換順序の表示
+    display_ordered_views(ordered_views, console)
+
+    return ordered_views
+
+
+def check_views(
+    ordered_views: List[str],
+    bq_client: BigQueryClient,
+    naming_preset_enum: NamingPreset,
+    output_dir: Path,
+    yml_prefix: Optional[str],
+    output_index: OutputIndex,
+    logger: logging.Logger,
+    jobs: int = 1,
+) -> Tuple[
+    List[str], Dict[str, str], Dict[str, List[str]], Dict[str, ViewMetadata]
+]:
+    """変換前にビューの種類と出力先のファイルを確認します。
+
+    ビューでないオブジェクトと、同じ実行内で他のビューとファイル名が重複するビューを
+    変換対象から除き、既存ファイルがあるビューを集めます。
+
+    Args:
+        ordered_views: 変換順序に並べたビュー名のリスト
+        bq_client: BigQueryクライアント
+        naming_preset_enum: 命名規則プリセット
+        output_dir: 出力ディレクトリのパス
+        yml_prefix: YAMLファイルの接頭辞
+        output_index: 出力ディレクトリの索引
+        logger: ロガーオブジェクト
+        jobs: メタデータを並列に取得するビューの最大数
+
+    Returns:
+        (変換対象のビュー名のリスト, スキップするビューと理由の辞書,
+        ビュー名 -> 既存のファイル名のリスト, ビュー名 -> 取得したメタデータ) のタプル
+    """
+    views_to_convert = []
+    skipped: Dict[str, str] = {}
+    conflicts: Dict[str, List[str]] = {}
+    # 確認時に取得したメタデータは変換時に再利用する
+    view_metadata, errors = fetch_view_metadata(ordered_views, bq_client, jobs)
+
+    for view in ordered_views:
+        # テーブルタイプを確認（ビューでない場合はスキップ）
+        if view in errors:
+            logger.warning(
+                f"テーブルタイプの確認中にエラーが発生しました: {view} - {errors[view]}"
+            )
+            skipped[view] = f"テーブルタイプの確認に失敗: {str(errors[view])}"
+            continue
+        table_type = view_metadata[view].table_type
+        if table_type != "VIEW":
+            if not table_type:
+                skipped[view] = "オブジェクトが存在しません"
+            else:
+                skipped[view] = f"ビューではありません (タイプ: {table_type})"
+            # ビューでない場合は次のオブジェクトへ
+            continue
+
+        # ファイルの存在確認
+        sql_exists, yml_exists, sql_path, yml_path = check_file_exists(
+            view, naming_preset_enum, output_dir, yml_prefix, output_index
+        )
+
+        # 同じ実行内で別のビューと同じファイル名になる場合はスキップ
+        duplicates = [
+            other
+            for other in (
+                output_index.claim(sql_path.name, view),
+                output_index.claim(yml_path.name, view),
+            )
+            if other is not None
+        ]
+        if duplicates:
+            skipped[view] = f"ファイル名が他のビューと重複しています: {duplicates[0]}"
+            continue
+
+        # 既存ファイルの確認（扱いは全ビューの確認後にまとめて決定する）
+        existing_files = []
+        if sql_exists:
+            existing_files.append(f"SQL: {sql_path.name}")
+        if yml_exists:
+            existing_files.append(f"YAML: {yml_path.name}")
+        if existing_files:
+            conflicts[view] = existing_files
+
+        views_to_convert.append(view)
+
+    return views_to_convert, skipped, conflicts, view_metadata
+
+
+def resolve_snapshot_target(
+    snapshot: MetadataSnapshot, project_id: Optional[str], dataset: Optional[str]
+) -> Tuple[str, str, str]:
+    """スナップショットからインポート対象のプロジェクト、データセット、ロケーションを決定します。
+
+    Args:
+        snapshot: メタデータのスナップショット
+        project_id: 指定されたプロジェクトID（省略時はスナップショットの値）
+        dataset: 指定されたデータセットID（省略時はスナップショットの値）
+
+    Returns:
+        (プロジェクトID, データセットID, ロケーション) のタプル
+
+    Raises:
+        ValueError: 指定された値がスナップショットの内容と異なる場合
+    """
+    if project_id and project_id != snapshot.project_id:
+        raise ValueError(
+            f"スナップショットのプロジェクト ({snapshot.project_id}) と"
+            f"指定されたプロジェクト ({project_id}) が異なります"
+        )
+    if dataset and dataset != snapshot.dataset_id:
+        raise ValueError(
+            f"スナップショットのデータセット ({snapshot.dataset_id}) と"
+            f"指定されたデータセット ({dataset}) が異なります"
+        )
+    return snapshot.project_id, snapshot.dataset_id, snapshot.location
+
+
+def import_views(
+    project_id: Optional[str],
+    dataset: Optional[str],
+    output_dir: Path,
+    naming_preset: str,
+    dry_run: bool = False,
+    include_views: Optional[List[str]] = None,
+    exclude_views: Optional[List[str]] = None,
+    non_interactive: bool = False,
+    sql_template: Optional[str] = None,
+    yml_template: Optional[str] = None,
+    yml_prefix: Optional[str] = None,
+    include_dependencies: bool = False,
+    template_cache: bool = False,
+    write_mode: str = WriteMode.ALWAYS.value,
+    location: str = "asia-northeast1",
+    debug: bool = False,
+    max_depth: int = 3,
+    jobs: int = 1,
+    lineage_concurrency: int = 8,
+    lineage_cache_ttl: int = DEFAULT_LINEAGE_CACHE_TTL,
+    refresh_lineage: bool = False,
+    dependency_backend: str = DependencyBackend.LINEAGE.value,
+    from_snapshot: Optional[Path] = None,
+    metadata_source: str = MetadataSource.INFORMATION_SCHEMA.value,
+    datasets: Optional[List[str]] = None,
+    stream: bool = False,
+    on_conflict: str = ConflictPolicy.ASK.value,
+    resume: bool = False,
+    pool_size: Optional[int] = None,
+) -> None:
+    """BigQueryビューをdbtモデルにインポートします。
+
+    Args:
+        project_id: BigQueryプロジェクトID（スナップショット使用時は省略可）
+        dataset: データセットID（スナップショット使用時は省略可）
+        output_dir: 出力ディレクトリのパス
+        naming_preset: 命名規則プリセット
+        dry_run: ドライランモードかどうか
+        include_views: 含めるビュー名のパターンリスト
+        exclude_views: 除外するビュー名のパターンリスト
+        non_interactive: 非インタラクティブモードかどうか
+        sql_template: SQLモデル用のテンプレートファイルパス
         yml_template: YAMLモデル用のテンプレートファイルパス
         yml_prefix: YAMLファイルの接頭辞（デフォルト: None）
                      e.g. "_" -> _model_name.yml
         include_dependencies: 依存関係にあるビューも含めるかどうか
+        template_cache: テンプレートのバイトコードをディスクにキャッシュするかどうか
+        write_mode: モデルファイルの書き込み方法（"always", "changed"）
         location: BigQueryロケーション
         debug: デバッグモードかどうか
         max_depth: 依存関係の最大深度
+        jobs: 並列に変換するビューの最大数
+        lineage_concurrency: 依存関係解析でLineage APIを並列に呼び出す最大数
+        lineage_cache_ttl: Lineageキャッシュの有効期間（秒）。0以下の場合はキャッシュしない
+        refresh_lineage: キャッシュを読まずにLineage APIから取得し直すかどうか
+        dependency_backend: 依存関係の解析方法（"lineage", "sql", "hybrid"）
+        from_snapshot: メタデータを読み込むスナップショットファイル（指定時はネットワークに接続しない）
+        metadata_source: メタデータの取得方法（"information-schema", "api", "region"）
+        datasets: インポート対象の複数のデータセットID（指定時はdatasetの代わりに使用）
+        stream: ビュー一覧の取得から書き込みまでをストリーミングで実行するかどうか
+            （確認プロンプトと依存関係の分析は行いません）
+        on_conflict: 既存ファイルがあるビューの扱い（"ask", "overwrite", "skip", "changed"）
+            ask は変換前に1回だけ尋ねます（非インタラクティブモードとストリーミング実行では上書き）
+        resume: 同じ条件で中断したインポートのチェックポイントから再開するかどうか
+            （依存関係の解決を省略し、変換が完了したビューをスキップします）
+        pool_size: HTTPのコネクションプールのサイズ（省略時は並列数に合わせる）
+
+    Raises:
+        ValueError: スナップショットの内容が指定したプロジェクトやデータセットと異なる場合、
+            またはスナップショットと複数のデータセットを同時に指定した場合
     """
     # ロギングの設定
     logger = setup_logging(verbose=debug)
@@ -527,16 +1413,43 @@ def import_views(
     # コンソールの設定
     console = Console(highlight=False)
 
+    # API呼び出しの計測はこの実行の分のみ集計する
+    api_metrics.reset()
+
+    # スナップショットの読み込み
+    snapshot = None
+    if from_snapshot is not None:
+        if datasets:
+            raise ValueError("スナップショット使用時は複数のデータセットを指定できません")
+        snapshot = load_snapshot(from_snapshot)
+        project_id, dataset, location = resolve_snapshot_target(
+            snapshot, project_id, dataset
+        )
+        console.print(
+            f"スナップショットから読み込みます: {from_snapshot} "
+            f"(作成日時: {snapshot.created_at})"
+        )
+
+    target_datasets = list(datasets) if datasets else [dataset]
+
     # インポート情報をログに記録
     options = {
         "project": project_id,
-        "dataset": dataset,
+        "datasets": target_datasets,
         "output_dir": str(output_dir),
         "naming_preset": naming_preset,
         "dry_run": dry_run,
         "non_interactive": non_interactive,
         "include_dependencies": include_dependencies,
+        "dependency_backend": dependency_backend,
+        "write_mode": write_mode,
         "debug": debug,
+        "jobs": jobs,
+        "from_snapshot": str(from_snapshot) if from_snapshot else None,
+        "metadata_source": metadata_source,
+        "stream": stream,
+        "on_conflict": on_conflict,
+        "resume": resume,
     }
     logger.debug(f"インポートオプション: {options}")
 
@@ -549,114 +1462,677 @@ def import_views(
     # 出力ディレクトリの設定
     setup_output_directory(output_dir, console)
 
-    # BigQueryクライアントの初期化
-    bq_client = initialize_bigquery_client(project_id, location, console)
-
-    # ビュー一覧の取得
-    views = fetch_views(
-        bq_client, dataset, include_views, exclude_views, console, project_id
+    client_factory = ClientFactory(
+        pool_size or default_pool_size(jobs, lineage_concurrency)
     )
-    if not views:
-        return
+    try:
+        # BigQueryクライアントの初期化
+        lineage_client = None
+        if snapshot is not None:
+            bq_client = SnapshotBigQueryClient(snapshot)
+            lineage_client = SnapshotLineageClient(snapshot)
+            if include_dependencies and (
+                snapshot.max_depth is None or snapshot.max_depth < max_depth
+            ):
+                console.print(
+                    "[bold yellow]警告:[/] スナップショットの依存関係は最大深度 "
+                    f"{snapshot.max_depth or 0} まで取得されています"
+                )
+        else:
+            bq_client = initialize_bigquery_client(
+                project_id,
+                location,
+                console,
+                MetadataSource(metadata_source),
+                client_factory=client_factory,
+            )
+            # 複数のデータセットはリージョン単位の1回の問い合わせでまとめて取得する
+            if len(target_datasets) > 1 and metadata_source != MetadataSource.API:
+                with console.status(
+                    f"{len(target_datasets)}個のデータセットのメタデータを取得中..."
+                ):
+                    try:
+                        bq_client.load_region_catalogs(target_datasets)
+                    except Exception as e:
+                        logger.warning(
+                            "メタデータの一括取得に失敗しました。"
+                            f"データセット単位で取得します: {e}"
+                        )
+
+        if stream:
+            if include_dependencies:
+                raise ValueError("ストリーミング実行では依存関係を分析できません")
+            generator = initialize_model_generator(
+                sql_template, yml_template, template_cache, WriteMode(write_mode)
+            )
+            generator.output_dir = output_dir
+            generator.output_index = OutputIndex(output_dir)
+            # 確認プロンプトは出さず、askは上書きとして扱う
+            policy = ConflictPolicy(on_conflict)
+            if policy == ConflictPolicy.CHANGED:
+                generator.write_mode = WriteMode.CHANGED
+
+            # ビュー一覧はクエリ結果の取得に合わせて順次変換に渡す
+            view_source = (
+                view
+                for target_dataset in target_datasets
+                for view in bq_client.iter_views(
+                    target_dataset,
+                    include_patterns=include_views,
+                    exclude_patterns=exclude_views,
+                )
+            )
+            with console.status("ビューを順次変換中..."), span("import.stream_convert"):
+                converted_models, skipped_views = stream_convert_views(
+                    view_source,
+                    bq_client,
+                    generator,
+                    NamingPreset(naming_preset),
+                    dry_run,
+                    logger,
+                    yml_prefix,
+                    jobs=jobs,
+                    skip_existing=policy == ConflictPolicy.SKIP,
+                )
+            if not converted_models and not skipped_views:
+                console.print(
+                    "[bold red]エラー:[/] データセット "
+                    f"'{', '.join(target_datasets)}' にビューが見つかりませんでした。"
+                )
+                return
+            display_conversion_results(
+                converted_models,
+                skipped_views,
+                dry_run,
+                console,
+                logger,
+                write_counts=generator.write_counts,
+            )
+            return
+
+        # 進捗はビューごとにチェックポイントに記録する（ドライランでは記録しない）
+        checkpoint = None
+        if not dry_run:
+            checkpoint = ImportCheckpoint.for_run(
+                {
+                    "project": project_id,
+                    "datasets": target_datasets,
+                    "output_dir": str(output_dir.resolve()),
+                    "naming_preset": naming_preset,
+                    "yml_prefix": yml_prefix,
+                    "include_views": include_views,
+                    "exclude_views": exclude_views,
+                    "include_dependencies": include_dependencies,
+                    "max_depth": max_depth,
+                    "dependency_backend": dependency_backend,
+                }
+            )
 
-    # ビュー一覧の表示
-    display_views_table(views, console)
+        resumed = resume and checkpoint is not None and checkpoint.load()
+        if resumed:
+            # 変換順序はチェックポイントから復元し、依存関係の解決を省略する
+            ordered_views = checkpoint.ordered_views
+            console.print(
+                f"チェックポイントから再開します: {checkpoint.path} "
+                f"(完了 {len(checkpoint.completed)}/{len(ordered_views)}個のビュー)"
+            )
+            pending_views = checkpoint.remaining()
+        else:
+            if resume:
+                console.print(
+                    "[bold yellow]警告:[/] 再開できるチェックポイントが見つかりません。"
+                    "最初から実行します"
+                )
+
+            # ビュー一覧の取得と変換順序の決定
+            dependency_graph: Dict[str, List[str]] = {}
+            resolved_views = resolve_import_order(
+                bq_client,
+                project_id,
+                target_datasets,
+                include_views,
+                exclude_views,
+                include_dependencies,
+                console,
+                logger,
+                max_depth=max_depth,
+                lineage_concurrency=lineage_concurrency,
+                lineage_cache_ttl=lineage_cache_ttl if snapshot is None else 0,
+                refresh_lineage=refresh_lineage,
+                dependency_backend=DependencyBackend(dependency_backend),
+                lineage_client=lineage_client,
+                dependency_graph=dependency_graph,
+            )
+            if resolved_views is None:
+                return
+            ordered_views = pending_views = resolved_views
+            if checkpoint is not None:
+                checkpoint.start(ordered_views, dependency_graph)
+
+        # モデルジェネレーターの初期化
+        generator = initialize_model_generator(
+            sql_template, yml_template, template_cache, WriteMode(write_mode)
+        )
+        # 出力ディレクトリを設定
+        generator.output_dir = output_dir
+
+        # 命名規則プリセットの設定
+        naming_preset_enum = NamingPreset(naming_preset)
+
+        # メタデータをデータセット単位で一括取得
+        with span("import.prefetch_metadata"):
+            prefetch_metadata(pending_views, bq_client, console, logger)
+
+        # 変換対象の確定（変換中に確認プロンプトで止まらないよう、ここで全て決定する）
+        # 既存ファイルの確認は出力ディレクトリを一度だけ走査して行う
+        output_index = OutputIndex(output_dir)
+        generator.output_index = output_index
+        with span("import.check_views"):
+            views_to_convert, skipped_before_conversion, conflicts, view_metadata = (
+                check_views(
+                    pending_views,
+                    bq_client,
+                    naming_preset_enum,
+                    output_dir,
+                    yml_prefix,
+                    output_index,
+                    logger,
+                    jobs=jobs,
+                )
+            )
 
-    # モデルジェネレーターの初期化
-    generator = initialize_model_generator(sql_template, yml_template)
-    # 出力ディレクトリを設定
-    generator.output_dir = output_dir
+        # 既存ファイルがあるビューの扱いを決定
+        skipped_conflicts, policy = resolve_conflicts(
+            conflicts, ConflictPolicy(on_conflict), non_interactive, console
+        )
+        if policy == ConflictPolicy.CHANGED:
+            generator.write_mode = WriteMode.CHANGED
+        skipped_before_conversion.update(skipped_conflicts)
+        views_to_convert = [
+            view for view in views_to_convert if view not in skipped_conflicts
+        ]
+
+        def record_result(view: str, error: str) -> None:
+            if error:
+                checkpoint.record_failed(view, error)
+            else:
+                checkpoint.record_completed(view)
+
+        # ビューの変換
+        try:
+            with span("import.convert_views"):
+                converted_models, failed_views = convert_views(
+                    views_to_convert,
+                    bq_client,
+                    generator,
+                    naming_preset_enum,
+                    dry_run,
+                    debug,
+                    logger,
+                    yml_prefix,
+                    jobs=jobs,
+                    metadata=view_metadata,
+                    result_callback=record_result if checkpoint is not None else None,
+                )
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        # 全てのビューを変換できた場合はチェックポイントを削除する
+        if checkpoint is not None:
+            if failed_views:
+                console.print(
+                    f"チェックポイントを保存しました: {checkpoint.path} "
+                    "（--resume で未完了のビューから再開できます）"
+                )
+            else:
+                checkpoint.remove()
+
+        # スキップされたビューを変換順序に並べる
+        skipped_views = {}
+        for view in ordered_views:
+            if view in skipped_before_conversion:
+                skipped_views[view] = skipped_before_conversion[view]
+            elif view in failed_views:
+                skipped_views[view] = failed_views[view]
+
+        # 変換結果の表示
+        display_conversion_results(
+            converted_models,
+            skipped_views,
+            dry_run,
+            console,
+            logger,
+            write_counts=generator.write_counts,
+        )
+    finally:
+        client_factory.close()
 
-    # 依存関係の分析
-    all_views, ordered_views = analyze_dependencies(
-        views, dataset, include_dependencies, bq_client, console, logger, max_depth
+
+def plan_import(
+    project_id: str,
+    dataset: Optional[str],
+    output_dir: Path,
+    plan_file: Path,
+    naming_preset: str,
+    include_views: Optional[List[str]] = None,
+    exclude_views: Optional[List[str]] = None,
+    non_interactive: bool = False,
+    on_conflict: str = ConflictPolicy.ASK.value,
+    yml_prefix: Optional[str] = None,
+    include_dependencies: bool = False,
+    write_mode: str = WriteMode.ALWAYS.value,
+    location: str = "asia-northeast1",
+    debug: bool = False,
+    max_depth: int = 3,
+    lineage_concurrency: int = 8,
+    lineage_cache_ttl: int = DEFAULT_LINEAGE_CACHE_TTL,
+    refresh_lineage: bool = False,
+    dependency_backend: str = DependencyBackend.LINEAGE.value,
+    metadata_source: str = MetadataSource.INFORMATION_SCHEMA.value,
+    datasets: Optional[List[str]] = None,
+    pool_size: Optional[int] = None,
+) -> ImportPlan:
+    """インポート計画を作成してファイルに保存します。
+
+    import_views のうち、ビュー一覧の取得、フィルタリング、依存関係の解決、
+    既存ファイルの確認までを行い、変換対象のビューと出力ファイル名、
+    計画の元になったメタデータのフィンガープリントを保存します。
+
+    Args:
+        project_id: BigQueryプロジェクトID
+        dataset: データセットID
+        output_dir: 出力ディレクトリのパス
+        plan_file: 計画の保存先のパス
+        naming_preset: 命名規則プリセット
+        include_views: 含めるビュー名のパターンリスト
+        exclude_views: 除外するビュー名のパターンリスト
+        non_interactive: 非インタラクティブモードかどうか
+        on_conflict: 既存ファイルがあるビューの扱い（"ask", "overwrite", "skip", "changed"）
+        yml_prefix: YAMLファイルの接頭辞（デフォルト: None）
+        include_dependencies: 依存関係にあるビューも含めるかどうか
+        write_mode: モデルファイルの書き込み方法（"always", "changed"）
+        location: BigQueryロケーション
+        debug: デバッグモードかどうか
+        max_depth: 依存関係の最大深度
+        lineage_concurrency: 依存関係解析でLineage APIを並列に呼び出す最大数
+        lineage_cache_ttl: Lineageキャッシュの有効期間（秒）。0以下の場合はキャッシュしない
+        refresh_lineage: キャッシュを読まずにLineage APIから取得し直すかどうか
+        dependency_backend: 依存関係の解析方法（"lineage", "sql", "hybrid"）
+        metadata_source: メタデータの取得方法（"information-schema", "api", "region"）
+        datasets: インポート対象の複数のデータセットID（指定時はdatasetの代わりに使用）
+        pool_size: HTTPのコネクションプールのサイズ（省略時は並列数に合わせる）
+
+    Returns:
+        保存した計画
+    """
+    # ロギングの設定
+    logger = setup_logging(verbose=debug)
+
+    # コンソールの設定
+    console = Console(highlight=False)
+
+    # API呼び出しの計測はこの実行の分のみ集計する
+    api_metrics.reset()
+
+    target_datasets = list(datasets) if datasets else [dataset]
+    logger.debug(
+        f"計画オプション: project={project_id}, datasets={target_datasets}, "
+        f"include_dependencies={include_dependencies}, on_conflict={on_conflict}"
     )
 
-    # 依存関係により追加されたビューの表示
-    added_views = [view for view in all_views if view not in views]
-    if added_views:
-        display_added_views(added_views, console)
+    plan = ImportPlan(
+        project_id=project_id,
+        location=location,
+        metadata_source=metadata_source,
+        output_dir=str(output_dir),
+        naming_preset=naming_preset,
+        yml_prefix=yml_prefix,
+        write_mode=write_mode,
+    )
 
-    # 依存関係で追加されたビューも含めて、フィルタリングを適用
-    if include_dependencies and (include_views or exclude_views):
-        logger.info("依存関係で追加されたビューにもフィルタリングを適用します")
-        ordered_views = filter_views(
-            ordered_views, include_views, exclude_views, logger
+    client_factory = ClientFactory(pool_size or default_pool_size(lineage_concurrency))
+    try:
+        # BigQueryクライアントの初期化
+        bq_client = initialize_bigquery_client(
+            project_id,
+            location,
+            console,
+            MetadataSource(metadata_source),
+            client_factory=client_factory,
         )
-        logger.info(f"フィルタリング後のビュー数: {len(ordered_views)}")
 
-    # 変換順序の表示
-    display_ordered_views(ordered_views, console)
+        # ビュー一覧の取得と変換順序の決定
+        ordered_views = resolve_import_order(
+            bq_client,
+            project_id,
+            target_datasets,
+            include_views,
+            exclude_views,
+            include_dependencies,
+            console,
+            logger,
+            max_depth=max_depth,
+            lineage_concurrency=lineage_concurrency,
+            lineage_cache_ttl=lineage_cache_ttl,
+            refresh_lineage=refresh_lineage,
+            dependency_backend=DependencyBackend(dependency_backend),
+        )
 
-    # 命名規則プリセットの設定
-    naming_preset_enum = NamingPreset(naming_preset)
+        if ordered_views is not None:
+            naming_preset_enum = NamingPreset(naming_preset)
+            prefetch_metadata(ordered_views, bq_client, console, logger)
 
-    # ビューの変換
-    converted_models = []
-    skipped_views = {}
+            # 変換対象と既存ファイルの扱いを確定
+            views_to_convert, skipped, conflicts, view_metadata = check_views(
+                ordered_views,
+                bq_client,
+                naming_preset_enum,
+                output_dir,
+                yml_prefix,
+                OutputIndex(output_dir),
+                logger,
+            )
+            skipped_conflicts, policy = resolve_conflicts(
+                conflicts, ConflictPolicy(on_conflict), non_interactive, console
+            )
+            if policy == ConflictPolicy.CHANGED:
+                plan.write_mode = WriteMode.CHANGED.value
+            skipped.update(skipped_conflicts)
+
+            for view in views_to_convert:
+                if view in skipped_conflicts:
+                    continue
+                plan.views.append(
+                    PlannedView(
+                        view=view,
+                        sql_file=generate_model_filename(
+                            view, naming_preset_enum, extension="sql"
+                        ),
+                        yml_file=generate_model_filename(
+                            view,
+                            naming_preset_enum,
+                            extension="yml",
+                            yml_prefix=yml_prefix,
+                        ),
+                        fingerprint=metadata_fingerprint(view_metadata[view]),
+                    )
+                )
+            # スキップしたビューを変換順序に並べる
+            plan.skipped = {
+                view: skipped[view] for view in ordered_views if view in skipped
+            }
+
+        save_plan(plan, plan_file)
+        console.print(
+            f"\n[bold green]計画を保存しました:[/] {plan_file} "
+            f"(変換 {len(plan.views)}個, スキップ {len(plan.skipped)}個)"
+        )
+        for view, reason in plan.skipped.items():
+            logger.info(f"スキップされたビュー: {view}: {reason}")
+        display_api_metrics(console, logger)
+        return plan
+    finally:
+        client_factory.close()
 
-    for view in ordered_views:
-        # テーブルタイプを確認（ビューでない場合はスキップ）
-        try:
-            table_type = bq_client.get_table_type(view)
-            if table_type != "VIEW":
-                if not table_type:
-                    skipped_views[view] = "オブジェクトが存在しません"
-                else:
-                    skipped_views[view] = f"ビューではありません (タイプ: {table_type})"
-                # ビューでない場合は次のオブジェクトへ
+
+def apply_import_plan(
+    plan_file: Path,
+    sql_template: Optional[str] = None,
+    yml_template: Optional[str] = None,
+    template_cache: bool = False,
+    dry_run: bool = False,
+    debug: bool = False,
+    jobs: int = 1,
+    shard: Tuple[int, int] = (1, 1),
+    pool_size: Optional[int] = None,
+) -> None:
+    """保存したインポート計画を実行します。
+
+    ビュー一覧の取得や依存関係の解決は行わず、計画に含まれるビューについて
+    メタデータの取得、レンダリング、書き込みのみを行います。
+    計画作成後にメタデータが変わったビューは警告を表示したうえで、現在の内容で変換します。
+    出力ファイル名が計画と一致しないビューは、計画と異なるファイルに書き込まないよう
+    スキップします。
+
+    Args:
+        plan_file: 計画ファイルのパス
+        sql_template: SQLモデル用のテンプレートファイルパス
+        yml_template: YAMLモデル用のテンプレートファイルパス
+        template_cache: テンプレートのバイトコードをディスクにキャッシュするかどうか
+        dry_run: ドライランモードかどうか
+        debug: デバッグモードかどうか
+        jobs: 並列に変換するビューの最大数
+        shard: (分割の番号, 分割数) のタプル。計画のビューを分割し、その一部のみを実行する
+        pool_size: HTTPのコネクションプールのサイズ（省略時は並列数に合わせる）
+
+    Raises:
+        ValueError: 計画ファイルまたは分割の指定が不正な場合
+    """
+    # ロギングの設定
+    logger = setup_logging(verbose=debug)
+
+    # コンソールの設定
+    console = Console(highlight=False)
+
+    # API呼び出しの計測はこの実行の分のみ集計する
+    api_metrics.reset()
+
+    plan = load_plan(plan_file)
+    planned_views = select_shard(plan.views, *shard)
+    console.print(
+        f"計画を読み込みました: {plan_file} (作成日時: {plan.created_at}, "
+        f"対象 {len(planned_views)}/{len(plan.views)}個のビュー)"
+    )
+    if not planned_views:
+        return
+
+    output_dir = Path(plan.output_dir)
+    setup_output_directory(output_dir, console)
+
+    client_factory = ClientFactory(pool_size or default_pool_size(jobs))
+    try:
+        bq_client = initialize_bigquery_client(
+            plan.project_id,
+            plan.location,
+            console,
+            MetadataSource(plan.metadata_source),
+            client_factory=client_factory,
+        )
+        views = [planned.view for planned in planned_views]
+        naming_preset = NamingPreset(plan.naming_preset)
+
+        # 計画と異なるファイルに書き込まないよう、出力ファイル名を確認する
+        skipped_views: Dict[str, str] = {}
+        for planned in planned_views:
+            sql_file = generate_model_filename(
+                planned.view, naming_preset, extension="sql"
+            )
+            yml_file = generate_model_filename(
+                planned.view, naming_preset, extension="yml", yml_prefix=plan.yml_prefix
+            )
+            if (sql_file, yml_file) != (planned.sql_file, planned.yml_file):
+                logger.warning(
+                    f"出力ファイル名が計画と一致しません: {planned.view} - "
+                    f"計画: {planned.sql_file}, {planned.yml_file} / "
+                    f"現在: {sql_file}, {yml_file}"
+                )
+                skipped_views[planned.view] = (
+                    f"出力ファイル名が計画と一致しません: {planned.sql_file}, "
+                    f"{planned.yml_file}"
+                )
+        planned_views = [
+            planned for planned in planned_views if planned.view not in skipped_views
+        ]
+        target_views = [planned.view for planned in planned_views]
+        prefetch_metadata(target_views, bq_client, console, logger)
+
+        # メタデータの取得と計画作成時からの変更の確認
+        view_metadata, errors = fetch_view_metadata(target_views, bq_client, jobs)
+        changed_views = []
+        for planned in planned_views:
+            if planned.view in errors:
+                e = errors[planned.view]
+                logger.warning(f"メタデータの取得に失敗しました: {planned.view} - {e}")
+                skipped_views[planned.view] = f"メタデータの取得に失敗: {str(e)}"
                 continue
-        except Exception as e:
-            logger.warning(
-                f"テーブルタイプの確認中にエラーが発生しました: {view} - {e}"
+            metadata = view_metadata[planned.view]
+            if metadata_fingerprint(metadata) != planned.fingerprint:
+                changed_views.append(planned.view)
+                logger.warning(f"計画作成後にメタデータが変更されています: {planned.view}")
+
+        if changed_views:
+            console.print(
+                f"[bold yellow]警告:[/] {len(changed_views)}個のビューのメタデータが"
+                "計画作成後に変更されています（現在の内容で変換します）"
             )
-            skipped_views[view] = f"テーブルタイプの確認に失敗: {str(e)}"
-            continue
 
-        # ファイルの存在確認
-        sql_exists, yml_exists, sql_path, yml_path = check_file_exists(
-            view, naming_preset_enum, output_dir
+        generator = initialize_model_generator(
+            sql_template, yml_template, template_cache, WriteMode(plan.write_mode)
+        )
+        generator.output_dir = output_dir
+        generator.output_index = OutputIndex(output_dir)
+
+        converted_models, failed_views = convert_views(
+            [view for view in target_views if view in view_metadata],
+            bq_client,
+            generator,
+            naming_preset,
+            dry_run,
+            debug,
+            logger,
+            plan.yml_prefix,
+            jobs=jobs,
+            metadata=view_metadata,
+        )
+        skipped_views.update(failed_views)
+
+        display_conversion_results(
+            converted_models,
+            {view: skipped_views[view] for view in views if view in skipped_views},
+            dry_run,
+            console,
+            logger,
+            write_counts=generator.write_counts,
         )
+    finally:
+        client_factory.close()
 
-        # 既存ファイルの確認
-        files_exist = sql_exists or yml_exists
-        existing_files = []
-        if sql_exists:
-            existing_files.append(f"SQL: {sql_path.name}")
-        if yml_exists:
-            existing_files.append(f"YAML: {yml_path.name}")
 
-        # インポートの確認
-        import_this_view, overwrite = confirm_view_import(
-            view, files_exist, existing_files, non_interactive
-        )
+def snapshot_dataset(
+    project_id: str,
+    dataset: str,
+    output_file: Path,
+    location: str = "asia-northeast1",
+    include_dependencies: bool = False,
+    max_depth: int = 3,
+    lineage_concurrency: int = 8,
+    dependency_backend: str = DependencyBackend.LINEAGE.value,
+    metadata_source: str = MetadataSource.INFORMATION_SCHEMA.value,
+    debug: bool = False,
+    pool_size: Optional[int] = None,
+) -> MetadataSnapshot:
+    """データセットのメタデータをスナップショットファイルに保存します。
 
-        if not import_this_view:
-            skipped_views[view] = "ユーザーによりスキップ"
-            continue
+    ビュー一覧、テーブルタイプ、ビュー定義、スキーマ、依存関係を取得し、
+    `import views --from-snapshot` で読み込める1つのファイルに保存します。
 
-        if files_exist and not overwrite:
-            skipped_views[view] = "既存ファイルを上書きしない"
-            continue
+    Args:
+        project_id: BigQueryプロジェクトID
+        dataset: データセットID
+        output_file: スナップショットの保存先のパス
+        location: BigQueryロケーション
+        include_dependencies: 依存関係と依存先のメタデータも保存するかどうか
+        max_depth: 依存関係の最大深度
+        lineage_concurrency: 依存関係解析でLineage APIを並列に呼び出す最大数
+        dependency_backend: 依存関係の解析方法（"lineage", "sql", "hybrid"）
+        metadata_source: メタデータの取得方法（"information-schema", "api"）
+        debug: デバッグモードかどうか
+        pool_size: HTTPのコネクションプールのサイズ（省略時は並列数に合わせる）
 
-        try:
-            # ビューの変換
-            result = convert_view(
-                view,
+    Returns:
+        保存したスナップショット
+    """
+    # ロギングの設定
+    logger = setup_logging(verbose=debug)
+
+    # コンソールの設定
+    console = Console(highlight=False)
+
+    # API呼び出しの計測はこの実行の分のみ集計する
+    api_metrics.reset()
+
+    logger.debug(
+        f"スナップショットオプション: project={project_id}, dataset={dataset}, "
+        f"include_dependencies={include_dependencies}, max_depth={max_depth}"
+    )
+
+    client_factory = ClientFactory(pool_size or default_pool_size(lineage_concurrency))
+    try:
+        # BigQueryクライアントの初期化
+        bq_client = initialize_bigquery_client(
+            project_id,
+            location,
+            console,
+            MetadataSource(metadata_source),
+            client_factory=client_factory,
+        )
+
+        # ビュー一覧の取得（フィルタリングはインポート時に行う）
+        with console.status(f"データセット {dataset} のビュー一覧を取得中..."):
+            views = bq_client.list_views(dataset)
+        console.print(f"{len(views)}個のビューが見つかりました")
+
+        # 依存関係の取得
+        lineage: Dict[str, List[str]] = {}
+        all_views = list(views)
+        if include_dependencies and views:
+            console.print("ビュー間の依存関係を分析中...")
+            resolver = create_dependency_resolver(
+                DependencyBackend(dependency_backend),
                 bq_client,
-                generator,
-                naming_preset_enum,
-                dry_run,
-                debug,
-                logger,
-                yml_prefix,
+                lineage_concurrency=lineage_concurrency,
             )
-            converted_models.append(result)
-        except Exception as e:
-            logger.error(f"ビュー '{view}' の変換中にエラーが発生しました: {e}")
-            skipped_views[view] = f"エラー: {str(e)}"
 
-    # 変換結果の表示
-    display_conversion_results(
-        converted_models, skipped_views, dry_run, console, logger
-    )
+            def status_update(view_name: str, current: int, total: int) -> None:
+                console.print(f"[{current}/{total}] {view_name} の依存関係を分析中...")
+
+            all_views, _ = resolver.analyze_dependencies(
+                views, dataset, max_depth=max_depth, status_callback=status_update
+            )
+            lineage = {
+                view: list(deps) for view, deps in resolver.dependency_graph.items()
+            }
+
+        # 対象データセットと依存先のデータセットのメタデータを取得
+        bq_client.load_catalog(dataset)
+        prefetch_metadata(all_views, bq_client, console, logger)
+
+        # ビュー単位で取得する方式でも全てのビュー定義とスキーマをカタログに含める
+        for view in all_views:
+            try:
+                bq_client.get_view_metadata(view)
+            except Exception as e:
+                logger.warning(f"ビューのメタデータを取得できませんでした: {view} - {e}")
+
+        snapshot = MetadataSnapshot(
+            project_id=project_id,
+            location=location,
+            dataset_id=dataset,
+            views=[view.split(".")[-1] for view in views],
+            catalogs=bq_client.loaded_catalogs(),
+            lineage=lineage,
+            max_depth=max_depth if include_dependencies else None,
+        )
+        save_snapshot(snapshot, output_file)
+
+        console.print(
+            f"\n[bold green]スナップショットを保存しました:[/] {output_file} "
+            f"(ビュー {len(snapshot.views)}件, データセット {len(snapshot.catalogs)}件, "
+            f"依存関係 {len(snapshot.lineage)}件)"
+        )
+        logger.info(f"スナップショットを保存しました: {output_file}")
+        display_api_metrics(console, logger)
+        return snapshot
+    finally:
+        client_factory.close()
@@ -4,30 +4,88 @@ BigQueryビュー間の依存関係を取得するためのLineage APIクライ
 """
 
 import logging
-from typing import List
+import os
+import time
+from typing import TYPE_CHECKING, Any, List, Optional
 
-from google.cloud import datacatalog_lineage_v1
+from bq2dbt.utils.api_metrics import api_metrics
+from bq2dbt.utils.cache import LineageCache
+from bq2dbt.utils.profiling import profiled
+
+if TYPE_CHECKING:
+    from bq2dbt.converter.clients import ClientFactory
 
 logger = logging.getLogger(__name__)
 
+# Lineage APIの接続先を上書きする環境変数（例: localhost:9060、TLSなしのgRPCで接続）
+API_ENDPOINT_ENV = "BQ2DBT_LINEAGE_API_ENDPOINT"
+
+# API呼び出しの計測で使うAPI名（ページごとに1回として数える）
+_SEARCH_LINKS = "lineage.search_links"
+
 
 class LineageClient:
     """Google Cloud Data Catalog Lineage APIとの通信を行うクライアントクラス。"""
 
-    def __init__(self, project_id: str, location: str = "asia-northeast1"):
+    def __init__(
+        self,
+        project_id: str,
+        location: str = "asia-northeast1",
+        cache: Optional[LineageCache] = None,
+        refresh_cache: bool = False,
+        client_factory: Optional["ClientFactory"] = None,
+    ):
         """Lineageクライアントを初期化します。
 
         Args:
             project_id: Google Cloudプロジェクト
             location: Google Cloudのロケーション（デフォルト: asia-northeast1）
+            cache: 依存関係の永続キャッシュ（省略時はキャッシュしない）
+            refresh_cache: キャッシュを読まずにAPIから取得し直すかどうか
+            client_factory: 認証情報と接続を共有するファクトリー（省略時は単独で作成）
         """
         self.project_id = project_id
         self.location = location
-        self.lineage_client = datacatalog_lineage_v1.LineageClient()
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        self.client_factory = client_factory
+        self.lineage_client = self._create_client()
         logger.debug(
             f"Lineageクライアントを初期化しました: プロジェクト={project_id}, ロケーション={location}"
         )
 
+    def _create_client(self) -> Any:
+        """Lineage APIのクライアントを作成します。
+
+        ファクトリーが指定されている場合は、その共有のクライアントを使います。
+        環境変数 BQ2DBT_LINEAGE_API_ENDPOINT が設定されている場合は、
+        認証もTLSも使わないgRPCのチャネルでその接続先に接続します。
+
+        Returns:
+            google.cloud.datacatalog_lineage_v1.LineageClient
+        """
+        if self.client_factory is not None:
+            return self.client_factory.lineage_client()
+
+        # Lineage APIのクライアントライブラリ（gRPC）の読み込みは重いため、作成時まで遅延させる
+        from google.cloud import datacatalog_lineage_v1
+
+        api_endpoint = os.environ.get(API_ENDPOINT_ENV)
+        if api_endpoint:
+            import grpc
+            from google.cloud.datacatalog_lineage_v1.services.lineage.transports import (
+                LineageGrpcTransport,
+            )
+
+            logger.debug(f"Lineage APIの接続先: {api_endpoint}")
+            transport = LineageGrpcTransport(
+                channel=grpc.insecure_channel(api_endpoint)
+            )
+            return datacatalog_lineage_v1.LineageClient(transport=transport)
+
+        return datacatalog_lineage_v1.LineageClient()
+
+    @profiled("lineage.get_table_dependencies")
     def get_table_dependencies(self, fully_qualified_name: str) -> List[str]:
         """ビューが参照しているテーブル/ビューの一覧を取得します。
 
@@ -50,8 +108,18 @@ class LineageClient:
             # BigQuery用のFQNフォーマットを作成（Lineage API用）
             bq_fqn = f"bigquery:{fully_qualified_name}"
 
+            # キャッシュが有効な場合はキャッシュから返す
+            if self.cache is not None and not self.refresh_cache:
+                cached = self.cache.get(bq_fqn, self.location)
+                if cached is not None:
+                    logger.debug(f"キャッシュから依存関係を取得しました: {bq_fqn}")
+                    return cached
+
             logger.debug(f"Lineage APIを使用して依存関係を取得: {bq_fqn}")
 
+            from google.api_core import retry as retries
+            from google.cloud import datacatalog_lineage_v1
+
             # 検索リクエストを作成 (このビューをターゲットとするリンクを検索)
             target = datacatalog_lineage_v1.EntityReference()
             target.fully_qualified_name = bq_fqn
@@ -65,22 +133,47 @@ class LineageClient:
                 parent=f"projects/{project_id}/locations/{location}",
             )
 
-            # APIを呼び出し、結果を取得
-            page_result = self.lineage_client.search_links(request=request)
+            # 一時的なエラー（UNAVAILABLEなど）はリトライし、失敗した呼び出しとして記録する
+            def on_error(exc: Exception) -> None:
+                logger.debug(f"Lineage APIの呼び出しをリトライします: {bq_fqn} - {exc}")
+                api_metrics.record_call(_SEARCH_LINKS, error=True)
+                api_metrics.record_retry(_SEARCH_LINKS)
+
+            retry = retries.Retry(
+                predicate=retries.if_transient_error, on_error=on_error
+            )
 
-            # 結果を処理
+            # APIを呼び出し、結果をページごとに処理（2ページ目以降はイテレーション中に取得）
             dependencies = []
-            for link in page_result:
-                # ソースからBigQueryの完全修飾名を抽出
-                source_fqn = link.source.fully_qualified_name
-                if source_fqn.startswith("bigquery:"):
-                    # bigquery:project.dataset.tableから project.dataset.table 形式に変換
-                    bq_name = source_fqn[len("bigquery:") :]
-                    dependencies.append(bq_name)
+            start = time.perf_counter()
+            try:
+                page_result = self.lineage_client.search_links(
+                    request=request, retry=retry
+                )
+                for page in page_result.pages:
+                    api_metrics.record_call(_SEARCH_LINKS, time.perf_counter() - start)
+                    for link in page.links:
+                        # ソースからBigQueryの完全修飾名を抽出
+                        source_fqn = link.source.fully_qualified_name
+                        if source_fqn.startswith("bigquery:"):
+                            # bigquery:project.dataset.table -> project.dataset.table
+                            bq_name = source_fqn[len("bigquery:") :]
+                            dependencies.append(bq_name)
+                    start = time.perf_counter()
+            except Exception:
+                api_metrics.record_call(
+                    _SEARCH_LINKS, time.perf_counter() - start, error=True
+                )
+                raise
 
             logger.info(
                 f"依存関係を{len(dependencies)}件取得しました: {fully_qualified_name}"
             )
+
+            # 取得に成功した結果のみキャッシュに保存
+            if self.cache is not None:
+                self.cache.set(bq_fqn, self.location, dependencies)
+
             return dependencies
 
         except Exception as e:
@@ -0,0 +1,163 @@
+"""ストリーミング処理のパイプラインモジュール。
+
+ビュー一覧の取得からファイルの書き込みまでの各段階をスレッドで並行に実行し、
+段階の間をサイズ上限付きのキューでつなぎます。前の段階が全てのビューを処理し終えるのを
+待たずに次の段階が進むため、最初のモデルがすぐに書き込まれ、処理中のデータ量も
+キューのサイズで抑えられます。
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 段階の間のキューに保持する最大件数
+DEFAULT_QUEUE_SIZE = 32
+
+# 入力の終わりを表す番兵
+_END = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """パイプラインの1段階。
+
+    Attributes:
+        name: 段階の名前（ログとエラーの報告に使用）
+        func: 前の段階の結果を受け取り、次の段階に渡す値を返す関数
+        workers: この段階を並列に実行するスレッド数
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class PipelineResult:
+    """パイプラインを通過した1件の結果。
+
+    Attributes:
+        index: 入力順の番号
+        item: 入力された値
+        value: 最後の段階の戻り値（エラー時は例外が発生する前の値）
+        error: 途中の段階で発生した例外（成功した場合はNone）
+        stage: 例外が発生した段階の名前
+    """
+
+    index: int
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+    stage: str = ""
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: Sequence[Stage],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Iterator[PipelineResult]:
+    """入力を各段階に順に通し、完了したものから結果を返します。
+
+    ある段階で例外が発生した入力は以降の段階を実行せず、error を設定して返します。
+    結果は完了順に返るため、入力順とは限りません（index で並べ替えられます）。
+    入力のイテレーター自体が例外を送出した場合は、処理中の入力を返し終えた後に
+    同じ例外を送出します。
+
+    Args:
+        items: 入力（ジェネレーターなど遅延評価されるイテラブルを渡せます）
+        stages: 段階のリスト
+        queue_size: 段階の間のキューに保持する最大件数
+
+    Yields:
+        各入力の処理結果
+    """
+    if not stages:
+        raise ValueError("パイプラインの段階が指定されていません")
+
+    # queues[i] は段階iの入力、queues[-1] は呼び出し元への出力
+    queues: List["queue.Queue[Any]"] = [
+        queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)
+    ]
+    workers = [max(1, stage.workers) for stage in stages]
+    # 次の段階で番兵を待つスレッド数（最後は呼び出し元の1つ）
+    readers = workers[1:] + [1]
+    remaining = list(workers)
+    remaining_lock = threading.Lock()
+    stop = threading.Event()
+    source_errors: List[Exception] = []
+
+    def feed() -> None:
+        try:
+            for index, item in enumerate(items):
+                if stop.is_set():
+                    break
+                queues[0].put(PipelineResult(index, item, value=item))
+        except Exception as e:
+            logger.error(f"パイプラインの入力の取得中にエラーが発生しました: {e}")
+            source_errors.append(e)
+        finally:
+            for _ in range(workers[0]):
+                queues[0].put(_END)
+
+    def work(stage_index: int) -> None:
+        stage = stages[stage_index]
+        inbox, outbox = queues[stage_index], queues[stage_index + 1]
+        while True:
+            result = inbox.get()
+            if result is _END:
+                break
+            if result.error is None and not stop.is_set():
+                try:
+                    result.value = stage.func(result.value)
+                except Exception as e:
+                    logger.debug(
+                        f"パイプラインの段階 '{stage.name}' でエラーが発生しました: "
+                        f"{result.item} - {e}"
+                    )
+                    result.error = e
+                    result.stage = stage.name
+            outbox.put(result)
+
+        # 最後に終了したスレッドが次の段階に終わりを伝える
+        with remaining_lock:
+            remaining[stage_index] -= 1
+            last = remaining[stage_index] == 0
+        if last:
+            for _ in range(readers[stage_index]):
+                outbox.put(_END)
+
+    threads = [threading.Thread(target=feed, name="pipeline-source", daemon=True)]
+    for stage_index, stage in enumerate(stages):
+        for worker in range(workers[stage_index]):
+            threads.append(
+                threading.Thread(
+                    target=work,
+                    args=(stage_index,),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True,
+                )
+            )
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            result = queues[-1].get()
+            if result is _END:
+                break
+            yield result
+    finally:
+        # 呼び出し元が途中で終了した場合も、出力を読み捨ててスレッドを終了させる
+        stop.set()
+        while any(thread.is_alive() for thread in threads):
+            try:
+                queues[-1].get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+    if source_errors:
+        raise source_errors[0]
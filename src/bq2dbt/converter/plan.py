@@ -0,0 +1,170 @@
+"""インポート計画モジュール。
+
+ビュー一覧の取得、フィルタリング、依存関係の解決、既存ファイルの確認の結果を
+JSONファイルに保存し、後からメタデータの取得・レンダリング・書き込みのみを
+実行するための機能を提供します。
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from bq2dbt.converter.bigquery import ViewMetadata
+
+logger = logging.getLogger(__name__)
+
+# 計画ファイルの形式名とバージョン
+PLAN_FORMAT = "bq2dbt-plan"
+PLAN_VERSION = 1
+
+
+@dataclass
+class PlannedView:
+    """計画に含まれる1つのビュー。
+
+    Attributes:
+        view: ビューの完全修飾名
+        sql_file: 出力するSQLファイル名
+        yml_file: 出力するYAMLファイル名
+        fingerprint: 計画作成時のメタデータのフィンガープリント
+    """
+
+    view: str
+    sql_file: str
+    yml_file: str
+    fingerprint: str
+
+
+@dataclass
+class ImportPlan:
+    """インポート計画。
+
+    Attributes:
+        project_id: プロジェクトID
+        location: BigQueryのロケーション
+        metadata_source: メタデータの取得方法
+        output_dir: 出力ディレクトリ
+        naming_preset: 命名規則プリセット
+        yml_prefix: YAMLファイルの接頭辞
+        write_mode: モデルファイルの書き込み方法
+        views: 変換順序に並べた変換対象のビュー
+        skipped: 計画作成時にスキップしたビューと理由
+        created_at: 計画の作成日時（ISO 8601形式）
+    """
+
+    project_id: str
+    location: str
+    metadata_source: str
+    output_dir: str
+    naming_preset: str
+    yml_prefix: Optional[str] = None
+    write_mode: str = "always"
+    views: List[PlannedView] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    created_at: str = field(
+        default_factory=lambda: datetime.now().isoformat(timespec="seconds")
+    )
+
+
+def metadata_fingerprint(metadata: ViewMetadata) -> str:
+    """生成されるモデルに影響するメタデータのフィンガープリントを計算します。
+
+    Args:
+        metadata: ビューのメタデータ
+
+    Returns:
+        SHA-256の16進数文字列
+    """
+    data = {
+        "table_type": metadata.table_type,
+        "view_query": metadata.view_query,
+        "schema": list(metadata.schema),
+        "description": metadata.description,
+    }
+    encoded = json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def save_plan(plan: ImportPlan, path: Path) -> None:
+    """計画をJSONファイルに保存します。
+
+    Args:
+        plan: インポート計画
+        path: 保存先のパス
+    """
+    data = {"format": PLAN_FORMAT, "version": PLAN_VERSION, **asdict(plan)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    logger.debug(f"インポート計画を保存しました: {path}")
+
+
+def load_plan(path: Path) -> ImportPlan:
+    """計画ファイルを読み込みます。
+
+    Args:
+        path: 計画ファイルのパス
+
+    Returns:
+        読み込まれた計画
+
+    Raises:
+        ValueError: 計画ファイルの形式またはバージョンが異なる場合
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"計画ファイルを読み込めません: {path} - {e}")
+
+    if not isinstance(data, dict) or data.get("format") != PLAN_FORMAT:
+        raise ValueError(f"計画ファイルではありません: {path}")
+    if data.get("version") != PLAN_VERSION:
+        raise ValueError(
+            f"サポートされていない計画のバージョンです: {data.get('version')} "
+            f"(対応バージョン: {PLAN_VERSION})"
+        )
+
+    plan = ImportPlan(
+        project_id=data["project_id"],
+        location=data["location"],
+        metadata_source=data["metadata_source"],
+        output_dir=data["output_dir"],
+        naming_preset=data["naming_preset"],
+        yml_prefix=data["yml_prefix"],
+        write_mode=data["write_mode"],
+        views=[PlannedView(**view) for view in data["views"]],
+        skipped=dict(data["skipped"]),
+        created_at=data["created_at"],
+    )
+    logger.debug(
+        f"インポート計画を読み込みました: {path} "
+        f"(ビュー {len(plan.views)}件, 作成日時 {plan.created_at})"
+    )
+    return plan
+
+
+def select_shard(
+    views: List[PlannedView], index: int, count: int
+) -> List[PlannedView]:
+    """計画のビューを count 個に分割したうちの index 番目を返します。
+
+    ビューは変換順序に沿って順番に割り当てるため、各分割の件数の差は1以下になります。
+
+    Args:
+        views: 計画のビュー
+        index: 分割の番号（1始まり）
+        count: 分割数
+
+    Returns:
+        分割に割り当てられたビュー
+
+    Raises:
+        ValueError: 分割の指定が不正な場合
+    """
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分割の指定が不正です: {index}/{count}")
+    return views[index - 1 :: count]
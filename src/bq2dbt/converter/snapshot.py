@@ -0,0 +1,218 @@
+"""メタデータスナップショットモジュール。
+
+BigQueryとLineage APIから取得したメタデータを1つのファイルに保存し、
+ネットワークに接続せずにインポート処理を再実行するための機能を提供します。
+"""
+
+import gzip
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bq2dbt.converter.bigquery import BigQueryClient, DatasetCatalog
+from bq2dbt.converter.lineage import LineageClient
+
+logger = logging.getLogger(__name__)
+
+# スナップショットファイルの形式名とバージョン
+SNAPSHOT_FORMAT = "bq2dbt-snapshot"
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class MetadataSnapshot:
+    """データセットのメタデータのスナップショット。
+
+    Attributes:
+        project_id: プロジェクトID
+        location: BigQueryのロケーション
+        dataset_id: 対象のデータセットID
+        views: 対象データセットのビュー名のリスト
+        catalogs: 取得したデータセットカタログのリスト（依存先のデータセットを含む）
+        lineage: ビューの完全修飾名 -> 依存先の完全修飾名のリスト
+        max_depth: 依存関係を取得した最大深度（依存関係を取得していない場合はNone）
+        created_at: スナップショットの作成日時（ISO 8601形式）
+    """
+
+    project_id: str
+    location: str
+    dataset_id: str
+    views: List[str] = field(default_factory=list)
+    catalogs: List[DatasetCatalog] = field(default_factory=list)
+    lineage: Dict[str, List[str]] = field(default_factory=dict)
+    max_depth: Optional[int] = None
+    created_at: str = field(
+        default_factory=lambda: datetime.now().isoformat(timespec="seconds")
+    )
+
+
+def save_snapshot(snapshot: MetadataSnapshot, path: Path) -> None:
+    """スナップショットをgzip圧縮したJSONファイルに保存します。
+
+    Args:
+        snapshot: スナップショット
+        path: 保存先のパス
+    """
+    data = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        **asdict(snapshot),
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    logger.debug(f"スナップショットを保存しました: {path}")
+
+
+def load_snapshot(path: Path) -> MetadataSnapshot:
+    """スナップショットファイルを読み込みます。
+
+    Args:
+        path: スナップショットファイルのパス
+
+    Returns:
+        読み込まれたスナップショット
+
+    Raises:
+        ValueError: スナップショットファイルの形式またはバージョンが異なる場合
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"スナップショットファイルを読み込めません: {path} - {e}")
+
+    if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"スナップショットファイルではありません: {path}")
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"サポートされていないスナップショットのバージョンです: {data.get('version')} "
+            f"(対応バージョン: {SNAPSHOT_VERSION})"
+        )
+
+    snapshot = MetadataSnapshot(
+        project_id=data["project_id"],
+        location=data["location"],
+        dataset_id=data["dataset_id"],
+        views=list(data["views"]),
+        catalogs=[DatasetCatalog(**catalog) for catalog in data["catalogs"]],
+        lineage={view: list(deps) for view, deps in data["lineage"].items()},
+        max_depth=data["max_depth"],
+        created_at=data["created_at"],
+    )
+    logger.debug(
+        f"スナップショットを読み込みました: {path} "
+        f"(データセット {len(snapshot.catalogs)}件, 作成日時 {snapshot.created_at})"
+    )
+    return snapshot
+
+
+class SnapshotBigQueryClient(BigQueryClient):
+    """スナップショットからメタデータを返すBigQueryクライアント。
+
+    BigQuery APIには接続しません。スナップショットに含まれないデータセットは
+    空のデータセットとして扱います。
+    """
+
+    def __init__(self, snapshot: MetadataSnapshot):
+        """スナップショットからクライアントを初期化します。
+
+        Args:
+            snapshot: メタデータのスナップショット
+        """
+        self.snapshot = snapshot
+        super().__init__(snapshot.project_id, location=snapshot.location)
+        for catalog in snapshot.catalogs:
+            self._catalogs[(catalog.project_id, catalog.dataset_id)] = catalog
+
+    def _create_client(self) -> None:
+        """BigQuery APIのクライアントは作成しません。"""
+        return None
+
+    def _list_view_names(
+        self,
+        dataset_id: str,
+        include_patterns: Tuple[str, ...] = (),
+        exclude_patterns: Tuple[str, ...] = (),
+    ) -> List[str]:
+        """スナップショットに保存されたビュー名を返します。
+
+        パターンによる絞り込みは呼び出し元の list_views で行います。
+
+        Args:
+            dataset_id: データセットID
+            include_patterns: 含めるビューのパターン（使用しない）
+            exclude_patterns: 除外するビューのパターン（使用しない）
+
+        Returns:
+            ビュー名のリスト
+        """
+        if dataset_id != self.snapshot.dataset_id:
+            logger.warning(f"スナップショットに含まれないデータセットです: {dataset_id}")
+            return []
+        return list(self.snapshot.views)
+
+    def _fetch_catalog(self, project_id: str, dataset_id: str) -> DatasetCatalog:
+        """スナップショットに含まれないデータセットを空のカタログとして返します。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_id: データセットID
+
+        Returns:
+            空のデータセットカタログ
+        """
+        logger.debug(
+            f"スナップショットに含まれないデータセットです: {project_id}.{dataset_id}"
+        )
+        return DatasetCatalog(project_id, dataset_id)
+
+    def get_catalog(
+        self, project_id: str, dataset_id: str
+    ) -> Optional[DatasetCatalog]:
+        """データセットカタログを取得します。
+
+        スナップショットに含まれないデータセットも空のカタログとして返すため、
+        ビュー単位の問い合わせがBigQuery APIに送られることはありません。
+
+        Args:
+            project_id: プロジェクトID
+            dataset_id: データセットID
+
+        Returns:
+            データセットカタログ
+        """
+        return self.load_catalog(dataset_id, project_id=project_id)
+
+
+class SnapshotLineageClient(LineageClient):
+    """スナップショットに保存された依存関係を返すLineageクライアント。
+
+    Lineage APIには接続しません。
+    """
+
+    def __init__(self, snapshot: MetadataSnapshot):
+        """スナップショットからクライアントを初期化します。
+
+        Args:
+            snapshot: メタデータのスナップショット
+        """
+        self.lineage = snapshot.lineage
+        super().__init__(snapshot.project_id, location=snapshot.location)
+
+    def _create_client(self) -> None:
+        """Lineage APIのクライアントは作成しません。"""
+        return None
+
+    def get_table_dependencies(self, fully_qualified_name: str) -> List[str]:
+        """スナップショットからビューの依存先を取得します。
+
+        Args:
+            fully_qualified_name: ビューの完全修飾名 (例: "project.dataset.view")
+
+        Returns:
+            参照先の完全修飾名のリスト（スナップショットにない場合は空のリスト）
+        """
+        return list(self.lineage.get(fully_qualified_name, []))
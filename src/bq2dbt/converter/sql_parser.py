@@ -0,0 +1,353 @@
+"""ビュー定義SQLの解析モジュール。
+
+BigQueryのビュー定義から参照しているテーブル/ビューを抽出します。
+完全な構文解析は行わず、字句解析とFROM/JOIN句の位置だけを追跡する軽量な実装です。
+"""
+
+import logging
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# FROM句の終わりを表すキーワード
+_FROM_TERMINATORS = {
+    "WHERE",
+    "GROUP",
+    "HAVING",
+    "QUALIFY",
+    "WINDOW",
+    "ORDER",
+    "LIMIT",
+    "UNION",
+    "INTERSECT",
+    "EXCEPT",
+    "SELECT",
+}
+
+# 結合条件の始まりを表すキーワード（条件の後にカンマ区切りの結合が続くことがある）
+_JOIN_CONDITIONS = {"ON", "USING"}
+
+# テーブル参照の直後に現れてもエイリアスではないキーワード
+_NON_ALIAS_KEYWORDS = _FROM_TERMINATORS | _JOIN_CONDITIONS | {
+    "AS",
+    "JOIN",
+    "INNER",
+    "LEFT",
+    "RIGHT",
+    "FULL",
+    "OUTER",
+    "CROSS",
+    "NATURAL",
+    "FOR",
+    "TABLESAMPLE",
+    "PIVOT",
+    "UNPIVOT",
+    "WITH",
+    "FROM",
+}
+
+
+class _Token(NamedTuple):
+    """字句解析で得られるトークン。"""
+
+    kind: str  # "ident", "quoted", "string", "punct"
+    value: str
+
+
+class _Scope:
+    """括弧の深さごとのFROM句の解析状態。"""
+
+    def __init__(self, function_name: str = "") -> None:
+        self.function_name = function_name
+        self.in_from = False
+        self.expect_table = False
+        # このFROM句でこれまでに定義されたテーブルエイリアス（小文字）
+        self.aliases: Set[str] = set()
+
+
+def _tokenize(sql: str) -> List[_Token]:
+    """SQLをトークンに分割します。
+
+    コメントは読み捨て、文字列リテラルは中身を持たないトークンに置き換えます。
+
+    Args:
+        sql: SQL文
+
+    Returns:
+        トークンのリスト
+    """
+    tokens: List[_Token] = []
+    i = 0
+    length = len(sql)
+
+    while i < length:
+        char = sql[i]
+
+        # 空白
+        if char.isspace():
+            i += 1
+            continue
+
+        # 行コメント (-- または #)
+        if sql.startswith("--", i) or char == "#":
+            newline = sql.find("\n", i)
+            i = length if newline == -1 else newline + 1
+            continue
+
+        # ブロックコメント
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+            continue
+
+        # 文字列リテラル（三重引用符を含む）
+        if char in ("'", '"'):
+            quote = char * 3 if sql.startswith(char * 3, i) else char
+            i += len(quote)
+            while i < length and not sql.startswith(quote, i):
+                i += 2 if sql[i] == "\\" else 1
+            i += len(quote)
+            tokens.append(_Token("string", ""))
+            continue
+
+        # バッククォートで囲まれた識別子
+        if char == "`":
+            end = sql.find("`", i + 1)
+            end = length if end == -1 else end
+            tokens.append(_Token("quoted", sql[i + 1 : end]))
+            i = end + 1
+            continue
+
+        # 識別子・キーワード・数値
+        if char.isalnum() or char == "_":
+            start = i
+            while i < length and (sql[i].isalnum() or sql[i] == "_"):
+                i += 1
+            tokens.append(_Token("ident", sql[start:i]))
+            continue
+
+        tokens.append(_Token("punct", char))
+        i += 1
+
+    return tokens
+
+
+def _is_name(token: _Token) -> bool:
+    """トークンがテーブル名の一部になり得るかどうかを判定します。"""
+    if token.kind == "quoted":
+        return True
+    return token.kind == "ident" and token.value.upper() not in _NON_ALIAS_KEYWORDS
+
+
+def _read_path(tokens: List[_Token], start: int) -> Tuple[List[str], int]:
+    """ドット区切りのテーブルパスを読み取ります。
+
+    `project.dataset.table`、`` `project.dataset.table` ``、
+    `` `project`.dataset.table ``、ハイフンを含むプロジェクト名などに対応します。
+
+    Args:
+        tokens: トークンのリスト
+        start: パスの先頭トークンの位置
+
+    Returns:
+        (パスの各部分, パスの直後のトークン位置) のタプル
+    """
+    parts: List[str] = []
+    i = start
+    length = len(tokens)
+
+    while i < length:
+        token = tokens[i]
+        if token.kind == "quoted":
+            parts.extend(token.value.split("."))
+            i += 1
+        elif token.kind == "ident":
+            name = token.value
+            i += 1
+            # 引用符なしのハイフン付きプロジェクト名 (例: my-project.dataset.table)
+            while (
+                i + 1 < length
+                and tokens[i] == _Token("punct", "-")
+                and tokens[i + 1].kind == "ident"
+            ):
+                name += "-" + tokens[i + 1].value
+                i += 2
+            parts.append(name)
+        else:
+            break
+
+        if (
+            i + 1 < length
+            and tokens[i] == _Token("punct", ".")
+            and tokens[i + 1].kind in ("ident", "quoted")
+        ):
+            i += 1
+            continue
+        break
+
+    return parts, i
+
+
+def extract_table_references(sql: str, default_project: str) -> List[str]:
+    """SQLのFROM句/JOIN句から参照しているテーブルの完全修飾名を抽出します。
+
+    CTE名、UNNESTやテーブル関数、相関参照（エイリアス.配列カラム）、
+    INFORMATION_SCHEMA、ワイルドカードテーブルは結果に含めません。
+
+    Args:
+        sql: ビュー定義のSQL
+        default_project: プロジェクトが省略された参照（dataset.table）に使うプロジェクトID
+
+    Returns:
+        参照先の完全修飾名のリスト（出現順、重複なし）
+    """
+    tokens = _tokenize(sql)
+    length = len(tokens)
+
+    # CTE名を収集 (name AS ( の形)
+    cte_names: Set[str] = set()
+    for i in range(length - 2):
+        if (
+            tokens[i].kind in ("ident", "quoted")
+            and tokens[i + 1].kind == "ident"
+            and tokens[i + 1].value.upper() == "AS"
+            and tokens[i + 2] == _Token("punct", "(")
+        ):
+            cte_names.add(tokens[i].value.lower())
+
+    # (テーブルパス, その位置で参照できるエイリアス) のリスト
+    candidates: List[Tuple[List[str], Set[str]]] = []
+    scopes = [_Scope()]
+    i = 0
+
+    while i < length:
+        token = tokens[i]
+        scope = scopes[-1]
+
+        if token == _Token("punct", "("):
+            # サブクエリや関数呼び出しはテーブル参照ではない
+            scope.expect_table = False
+            previous = tokens[i - 1] if i > 0 else None
+            function_name = (
+                previous.value.upper() if previous and previous.kind == "ident" else ""
+            )
+            scopes.append(_Scope(function_name))
+            i += 1
+            continue
+
+        if token == _Token("punct", ")"):
+            if len(scopes) > 1:
+                scopes.pop()
+            i += 1
+            continue
+
+        if token.kind == "ident":
+            keyword = token.value.upper()
+            # EXTRACT(part FROM expr) のFROMはFROM句ではない
+            if keyword in ("FROM", "JOIN") and scope.function_name != "EXTRACT":
+                if keyword == "FROM":
+                    scope.aliases = set()
+                scope.in_from = True
+                scope.expect_table = True
+                i += 1
+                continue
+            if keyword in _FROM_TERMINATORS:
+                scope.in_from = False
+                scope.expect_table = False
+                i += 1
+                continue
+            if keyword in _JOIN_CONDITIONS:
+                # 結合条件の式はテーブル参照ではないが、FROM句は続く
+                scope.expect_table = False
+                i += 1
+                continue
+
+        if token == _Token("punct", ",") and scope.in_from:
+            # カンマ区切りの結合
+            scope.expect_table = True
+            i += 1
+            continue
+
+        if scope.expect_table and _is_name(token):
+            scope.expect_table = False
+            parts, i = _read_path(tokens, i)
+
+            # テーブル関数やUNNESTは対象外
+            if i < length and tokens[i] == _Token("punct", "("):
+                continue
+
+            # 相関参照になりうるのは、外側のスコープとこのFROM句の前の項目のエイリアス
+            visible = set().union(*(outer.aliases for outer in scopes))
+            candidates.append((parts, visible))
+
+            # エイリアスを記録
+            alias: Optional[_Token] = None
+            if i < length and tokens[i].kind == "ident":
+                if tokens[i].value.upper() == "AS" and i + 1 < length:
+                    alias = tokens[i + 1]
+                    i += 2
+                elif _is_name(tokens[i]):
+                    alias = tokens[i]
+                    i += 1
+            elif i < length and tokens[i].kind == "quoted":
+                alias = tokens[i]
+                i += 1
+            if alias is not None:
+                scope.aliases.add(alias.value.lower())
+            continue
+
+        i += 1
+
+    # データセット名と同じエイリアスは、依存関係を落とさないようにデータセットとして扱う
+    dataset_names = {
+        parts[-2].lower()
+        for parts, visible in candidates
+        if len(parts) == 3 or (len(parts) == 2 and parts[0].lower() not in visible)
+    }
+
+    references: List[str] = []
+    for parts, visible in candidates:
+        reference = _to_fully_qualified_name(
+            parts, default_project, cte_names, visible - dataset_names
+        )
+        if reference and reference not in references:
+            references.append(reference)
+
+    logger.debug(f"SQLから{len(references)}件の参照を抽出しました")
+    return references
+
+
+def _to_fully_qualified_name(
+    parts: List[str], default_project: str, cte_names: Set[str], aliases: Set[str]
+) -> Optional[str]:
+    """テーブルパスを完全修飾名に変換します。
+
+    Args:
+        parts: テーブルパスの各部分
+        default_project: プロジェクトが省略された場合のプロジェクトID
+        cte_names: CTE名の集合（小文字）
+        aliases: その位置で相関参照として参照できるテーブルエイリアスの集合（小文字）
+
+    Returns:
+        完全修飾名。テーブル参照として扱わない場合はNone
+    """
+    if not parts or any(not part for part in parts):
+        return None
+    if any(part.upper() == "INFORMATION_SCHEMA" for part in parts):
+        return None
+    if "*" in parts[-1]:
+        # ワイルドカードテーブルはビューを指さない
+        return None
+
+    if len(parts) == 1:
+        # CTEまたはデータセット修飾のない名前
+        return None
+    if len(parts) == 2:
+        # エイリアス.配列カラム などの相関参照
+        if parts[0].lower() in aliases or parts[0].lower() in cte_names:
+            return None
+        return f"{default_project}.{parts[0]}.{parts[1]}"
+    if len(parts) == 3:
+        return ".".join(parts)
+
+    return None
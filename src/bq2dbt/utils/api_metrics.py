@@ -0,0 +1,238 @@
+"""API呼び出しの計測ユーティリティモジュール。
+
+BigQueryとLineage APIへのリクエストをAPIの種類ごとに数え、
+エラーとリトライの回数、レイテンシのヒストグラム、
+クエリジョブの処理バイト数・課金バイト数・スロット時間を集計します。
+ビュー数に比例して増える問い合わせ（N+1）やクォータの消費を実行後に確認するために使います。
+"""
+
+import bisect
+import logging
+import math
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# レイテンシのヒストグラムの区切り（秒、最後の区切りより大きいものは最後のビンに入る）
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 一時的なエラーとしてクライアントがリトライするHTTPステータス
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# BigQuery REST APIのリクエスト (メソッド, パス) -> API名
+_BIGQUERY_ROUTES = (
+    ("POST", re.compile(r"/projects/[^/]+/jobs"), "jobs.insert"),
+    ("POST", re.compile(r"/projects/[^/]+/queries"), "jobs.query"),
+    ("GET", re.compile(r"/projects/[^/]+/jobs/[^/]+"), "jobs.get"),
+    ("GET", re.compile(r"/projects/[^/]+/queries/[^/]+"), "jobs.getQueryResults"),
+    ("GET", re.compile(r"/projects/[^/]+/datasets/[^/]+/tables"), "tables.list"),
+    ("GET", re.compile(r"/projects/[^/]+/datasets/[^/]+/tables/[^/]+"), "tables.get"),
+)
+
+
+@dataclass
+class ApiCallStats:
+    """1つのAPIの集計結果。
+
+    Attributes:
+        name: API名 (例: "bigquery.tables.get")
+        calls: リクエスト数（リトライを含む）
+        errors: エラーになったリクエスト数
+        retries: 一時的なエラーでリトライしたリクエスト数
+        total: レイテンシの合計（秒）
+        max: レイテンシの最大（秒）
+        histogram: LATENCY_BUCKETS の区切りごとのリクエスト数（最後は区切りを超えたもの）
+    """
+
+    name: str
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    histogram: List[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """ヒストグラムから推定したパーセンタイル（区切りの上限、秒）を返します。
+
+        区切りを超えたビンに入る場合は最大値を返します。
+        """
+        timed = sum(self.histogram)
+        if not timed:
+            return None
+        rank = max(1, math.ceil(timed * percent / 100))
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                break
+        return LATENCY_BUCKETS[bucket] if bucket < len(LATENCY_BUCKETS) else self.max
+
+
+@dataclass
+class QueryJobStats:
+    """クエリジョブの集計結果。
+
+    Attributes:
+        jobs: 完了したクエリジョブの数
+        bytes_processed: 処理バイト数の合計
+        bytes_billed: 課金バイト数の合計
+        slot_millis: スロット時間の合計（ミリ秒）
+        cache_hits: キャッシュから結果を返したジョブの数
+    """
+
+    jobs: int = 0
+    bytes_processed: int = 0
+    bytes_billed: int = 0
+    slot_millis: int = 0
+    cache_hits: int = 0
+
+
+class ApiMetrics:
+    """API呼び出しの回数、エラー、リトライ、レイテンシを記録するカウンター。
+
+    複数のスレッドから同時に記録できます。
+    """
+
+    def __init__(self) -> None:
+        """カウンターを初期化します。"""
+        self._calls: Dict[str, ApiCallStats] = {}
+        self._query_jobs = QueryJobStats()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """記録済みの計測結果を破棄します。"""
+        with self._lock:
+            self._calls = {}
+            self._query_jobs = QueryJobStats()
+
+    def _stats(self, name: str) -> ApiCallStats:
+        if name not in self._calls:
+            self._calls[name] = ApiCallStats(name)
+        return self._calls[name]
+
+    def record_call(
+        self, name: str, seconds: Optional[float] = None, error: bool = False
+    ) -> None:
+        """リクエストを1件記録します。
+
+        Args:
+            name: API名
+            seconds: レイテンシ（秒、計測していない場合はNone）
+            error: エラーになったかどうか
+        """
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            if seconds is not None:
+                stats.total += seconds
+                stats.max = max(stats.max, seconds)
+                stats.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def record_retry(self, name: str) -> None:
+        """一時的なエラーによるリトライを1件記録します。
+
+        Args:
+            name: API名
+        """
+        with self._lock:
+            self._stats(name).retries += 1
+
+    def record_query_job(self, query_job: Any) -> None:
+        """完了したクエリジョブの統計を記録します。
+
+        ジョブが返さない統計（キャッシュヒット時のスロット時間など）は加算しません。
+
+        Args:
+            query_job: google.cloud.bigquery.QueryJob
+        """
+        values = {
+            name: getattr(query_job, attr, None)
+            for name, attr in (
+                ("bytes_processed", "total_bytes_processed"),
+                ("bytes_billed", "total_bytes_billed"),
+                ("slot_millis", "slot_millis"),
+            )
+        }
+        cache_hit = getattr(query_job, "cache_hit", None)
+        with self._lock:
+            self._query_jobs.jobs += 1
+            for name, value in values.items():
+                if isinstance(value, int):
+                    total = getattr(self._query_jobs, name) + value
+                    setattr(self._query_jobs, name, total)
+            if cache_hit is True:
+                self._query_jobs.cache_hits += 1
+
+    def record_http_response(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        """BigQuery REST APIの応答を記録します（requestsのresponseフック）。
+
+        リクエストのURLからAPI名を判定し、ステータスと所要時間を記録します。
+        一時的なエラーのステータス（429、5xx）はクライアントがリトライするため、
+        リトライとしても記録します。
+
+        Args:
+            response: requests.Response
+        """
+        name = f"bigquery.{_bigquery_api_name(response.request)}"
+        error = response.status_code >= 400
+        elapsed = getattr(response, "elapsed", None)
+        self.record_call(
+            name,
+            elapsed.total_seconds() if elapsed is not None else None,
+            error=error,
+        )
+        if response.status_code in _RETRYABLE_STATUS:
+            self.record_retry(name)
+
+    def summary(self) -> Tuple[List[ApiCallStats], QueryJobStats]:
+        """APIごとの集計結果（API名順）とクエリジョブの集計結果を返します。"""
+        with self._lock:
+            calls = [
+                ApiCallStats(**asdict(self._calls[name]))
+                for name in sorted(self._calls)
+            ]
+            return calls, QueryJobStats(**asdict(self._query_jobs))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """集計結果をJSONに保存できる形式で返します。"""
+        calls, query_jobs = self.summary()
+        return {
+            "latency_buckets": list(LATENCY_BUCKETS),
+            "calls": [asdict(stats) for stats in calls],
+            "query_jobs": asdict(query_jobs),
+        }
+
+
+def _bigquery_api_name(request: Any) -> str:
+    """BigQuery REST APIのリクエストのAPI名 (例: "tables.get") を返します。"""
+    method = request.method
+    path = request.path_url.split("?", 1)[0]
+    path = path[path.find("/projects/") :] if "/projects/" in path else path
+    for route_method, pattern, name in _BIGQUERY_ROUTES:
+        if method == route_method and pattern.fullmatch(path):
+            return name
+    return f"{method} {path}"
+
+
+def format_bytes(size: int) -> str:
+    """バイト数を読みやすい単位の文字列に変換します。"""
+    if size < 1024:
+        return f"{size}B"
+    value = size / 1024
+    for unit in ("KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}TiB"
+
+
+# アプリケーション全体で共有するカウンター
+api_metrics = ApiMetrics()
@@ -0,0 +1,134 @@
+"""永続キャッシュユーティリティモジュール。"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# キャッシュファイルを保存するディレクトリ
+CACHE_DIR = Path.home() / ".bq2dbt" / "cache"
+
+# Jinjaテンプレートのバイトコードキャッシュを保存するディレクトリ
+TEMPLATE_CACHE_DIR = CACHE_DIR / "jinja"
+
+# Lineageキャッシュのデフォルトの有効期間（秒）
+DEFAULT_LINEAGE_CACHE_TTL = 24 * 60 * 60
+
+
+class LineageCache:
+    """Lineage APIで取得した依存関係を保存するSQLiteキャッシュ。
+
+    `bigquery:` 形式の完全修飾名とロケーションをキーに、
+    LineageClient.get_table_dependencies の結果を保存します。
+    複数スレッドから共有できるように、接続へのアクセスはロックで直列化します。
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: int = DEFAULT_LINEAGE_CACHE_TTL,
+    ):
+        """Lineageキャッシュを初期化します。
+
+        Args:
+            path: キャッシュファイルのパス（省略時は ~/.bq2dbt/cache/lineage.sqlite3）
+            ttl: キャッシュの有効期間（秒）
+        """
+        self.path = path or CACHE_DIR / "lineage.sqlite3"
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lineage_links (
+                  fully_qualified_name TEXT NOT NULL,
+                  location TEXT NOT NULL,
+                  dependencies TEXT NOT NULL,
+                  fetched_at REAL NOT NULL,
+                  PRIMARY KEY (fully_qualified_name, location)
+                )
+                """
+            )
+        logger.debug(f"Lineageキャッシュを開きました: {self.path} (TTL={ttl}秒)")
+
+    def get(self, fully_qualified_name: str, location: str) -> Optional[List[str]]:
+        """キャッシュから依存関係を取得します。
+
+        Args:
+            fully_qualified_name: `bigquery:` 形式の完全修飾名
+            location: Google Cloudのロケーション
+
+        Returns:
+            依存先のリスト。キャッシュが存在しないか期限切れの場合はNone
+        """
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT dependencies, fetched_at
+                FROM lineage_links
+                WHERE fully_qualified_name = ? AND location = ?
+                """,
+                (fully_qualified_name, location),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        dependencies, fetched_at = row
+        if time.time() - fetched_at > self.ttl:
+            return None
+
+        return list(json.loads(dependencies))
+
+    def set(
+        self, fully_qualified_name: str, location: str, dependencies: List[str]
+    ) -> None:
+        """依存関係をキャッシュに保存します。
+
+        Args:
+            fully_qualified_name: `bigquery:` 形式の完全修飾名
+            location: Google Cloudのロケーション
+            dependencies: 依存先のリスト
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO lineage_links
+                  (fully_qualified_name, location, dependencies, fetched_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (fully_qualified_name, location, json.dumps(dependencies), time.time()),
+            )
+
+    def purge(self, expired_only: bool = False) -> int:
+        """キャッシュを削除します。
+
+        Args:
+            expired_only: 期限切れのエントリのみ削除するかどうか
+
+        Returns:
+            削除したエントリ数
+        """
+        with self._lock, self._connection:
+            if expired_only:
+                cursor = self._connection.execute(
+                    "DELETE FROM lineage_links WHERE fetched_at < ?",
+                    (time.time() - self.ttl,),
+                )
+            else:
+                cursor = self._connection.execute("DELETE FROM lineage_links")
+        logger.debug(f"Lineageキャッシュから{cursor.rowcount}件を削除しました")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """キャッシュファイルへの接続を閉じます。"""
+        with self._lock:
+            self._connection.close()
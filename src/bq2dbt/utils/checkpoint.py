@@ -0,0 +1,179 @@
+"""インポートのチェックポイントユーティリティモジュール。
+
+変換順序と依存関係の解決結果、およびビューごとの変換結果をJSON Lines形式で
+追記し、中断したインポートを完了済みのビューを除いて再開できるようにします。
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# チェックポイントファイルを保存するディレクトリ
+CHECKPOINT_DIR = Path.home() / ".bq2dbt" / "checkpoints"
+
+
+class ImportCheckpoint:
+    """インポートの進捗を記録するチェックポイントファイル。
+
+    1行目に変換順序と依存関係を、以降の行にビューごとの結果を1行ずつ追記します。
+    各行は書き込みごとにフラッシュするため、プロセスが途中で終了しても
+    それまでに完了したビューの記録は失われません。
+    """
+
+    def __init__(self, path: Path):
+        """チェックポイントを初期化します。
+
+        Args:
+            path: チェックポイントファイルのパス
+        """
+        self.path = path
+        self.ordered_views: List[str] = []
+        self.dependency_graph: Dict[str, List[str]] = {}
+        self.completed: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+
+    @classmethod
+    def for_run(
+        cls, options: Dict[str, Any], directory: Optional[Path] = None
+    ) -> "ImportCheckpoint":
+        """インポートの条件に対応するチェックポイントを返します。
+
+        同じ条件で実行したインポートは同じファイルを使います。
+
+        Args:
+            options: 変換対象を決めるインポートの条件（JSONに変換できる値）
+            directory: 保存先のディレクトリ（省略時は ~/.bq2dbt/checkpoints）
+
+        Returns:
+            チェックポイント
+        """
+        encoded = json.dumps(options, ensure_ascii=False, sort_keys=True)
+        key = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+        return cls((directory or CHECKPOINT_DIR) / f"import-{key}.jsonl")
+
+    def load(self) -> bool:
+        """チェックポイントファイルを読み込みます。
+
+        書き込み途中で終了した最後の行はファイルから切り詰めます
+        （再開後の追記がその行に連結されて読めなくなるため）。
+        その他の解析できない行は無視します。
+
+        Returns:
+            変換順序が記録されたチェックポイントを読み込めた場合はTrue
+        """
+        if not self.path.exists():
+            return False
+
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                logger.warning(f"チェックポイントの書き込み途中の行を破棄しました: {self.path}")
+
+        started = False
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"チェックポイントの行を読み込めません: {self.path}:{line_number}"
+                    )
+                    continue
+                kind = record.get("type")
+                if kind == "start":
+                    started = True
+                    self.ordered_views = list(record["ordered_views"])
+                    self.dependency_graph = {
+                        view: list(deps)
+                        for view, deps in record["dependency_graph"].items()
+                    }
+                elif kind == "completed":
+                    self.completed.add(record["view"])
+                    self.failed.pop(record["view"], None)
+                elif kind == "failed":
+                    self.failed[record["view"]] = record["reason"]
+
+        logger.debug(
+            f"チェックポイントを読み込みました: {self.path} "
+            f"(完了 {len(self.completed)}/{len(self.ordered_views)}件, "
+            f"失敗 {len(self.failed)}件)"
+        )
+        return started
+
+    def start(
+        self, ordered_views: List[str], dependency_graph: Dict[str, List[str]]
+    ) -> None:
+        """新しいチェックポイントを作成し、変換順序と依存関係を記録します。
+
+        Args:
+            ordered_views: 変換順序に並べたビュー名のリスト
+            dependency_graph: ビュー名 -> 依存先のリスト
+        """
+        self.ordered_views = list(ordered_views)
+        self.dependency_graph = dependency_graph
+        self.completed = set()
+        self.failed = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("")
+        self._append(
+            {
+                "type": "start",
+                "ordered_views": self.ordered_views,
+                "dependency_graph": dependency_graph,
+            }
+        )
+
+    def remaining(self) -> List[str]:
+        """変換が完了していないビューを変換順序で返します。"""
+        return [view for view in self.ordered_views if view not in self.completed]
+
+    def record_completed(self, view: str) -> None:
+        """ビューの変換が完了したことを記録します。
+
+        Args:
+            view: ビュー名
+        """
+        self._append({"type": "completed", "view": view})
+
+    def record_failed(self, view: str, reason: str) -> None:
+        """ビューの変換に失敗したことを記録します。
+
+        Args:
+            view: ビュー名
+            reason: 失敗した理由
+        """
+        self._append({"type": "failed", "view": view, "reason": reason})
+
+    def remove(self) -> None:
+        """チェックポイントファイルを削除します。"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        logger.debug(f"チェックポイントを削除しました: {self.path}")
+
+    def close(self) -> None:
+        """チェックポイントファイルを閉じます。"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """1件の記録を追記してフラッシュします。"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            if record["type"] == "completed":
+                self.completed.add(record["view"])
+            elif record["type"] == "failed":
+                self.failed[record["view"]] = record["reason"]
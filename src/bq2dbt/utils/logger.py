@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from rich.console import Console
 from rich.logging import RichHandler
@@ -70,6 +70,20 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     return logger
 
 
+def current_log_file() -> Optional[Path]:
+    """`setup_logging` で設定した現在のログファイルのパスを返す。
+
+    Returns:
+        ログファイルのパス、またはロギングが設定されていない場合はNone
+    """
+    for handler in reversed(logging.getLogger().handlers):
+        if isinstance(handler, logging.FileHandler):
+            path = Path(handler.baseFilename)
+            if path.parent == LOG_DIR:
+                return path
+    return None
+
+
 def get_recent_logs(limit: int = 5) -> List[Path]:
     """最近のログファイルを取得する。
 
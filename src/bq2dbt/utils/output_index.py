@@ -0,0 +1,92 @@
+"""出力ディレクトリのファイル索引モジュール。
+
+変換前に出力ディレクトリを os.scandir で一度だけ走査し、
+ビューごとのファイルの存在確認をメモリ上で行います。
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+class OutputIndex:
+    """出力ディレクトリ直下のファイル名の索引。
+
+    走査後に書き込んだファイルは add で索引に追加します。
+    同じ実行内で複数のビューが同じファイル名になる場合は claim で検出できます。
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """出力ディレクトリを走査して索引を作成します。
+
+        Args:
+            directory: 出力ディレクトリ（存在しない場合は空の索引になります）
+        """
+        self.directory = Path(directory)
+        self._names: Set[str] = set()
+        # ファイル名 -> この実行でそのファイルに出力するビュー
+        self._owners: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """出力ディレクトリを走査し直します。"""
+        names: Set[str] = set()
+        try:
+            # エントリ名のみを使い、ファイルごとのstat呼び出しは行わない
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    names.add(entry.name)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._names = names
+        logger.debug(f"出力ディレクトリを走査しました: {self.directory} ({len(names)}件)")
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, file_name: object) -> bool:
+        return file_name in self._names
+
+    def exists(self, path: Path) -> bool:
+        """パスが存在するかどうかを判定します。
+
+        出力ディレクトリ直下のパスは索引から判定し、それ以外はファイルシステムを確認します。
+
+        Args:
+            path: 確認するパス
+
+        Returns:
+            存在する場合はTrue
+        """
+        if Path(path).parent != self.directory:
+            return Path(path).exists()
+        return Path(path).name in self._names
+
+    def add(self, file_name: str) -> None:
+        """書き込んだファイルを索引に追加します。
+
+        Args:
+            file_name: 出力ディレクトリ直下のファイル名
+        """
+        with self._lock:
+            self._names.add(file_name)
+
+    def claim(self, file_name: str, owner: str) -> Optional[str]:
+        """この実行でファイルに出力するビューを登録します。
+
+        Args:
+            file_name: 出力ディレクトリ直下のファイル名
+            owner: ファイルに出力するビュー
+
+        Returns:
+            既に別のビューが登録されている場合はそのビュー、それ以外はNone
+        """
+        with self._lock:
+            current = self._owners.setdefault(file_name, owner)
+        return None if current == owner else current
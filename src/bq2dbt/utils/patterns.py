@@ -0,0 +1,83 @@
+"""ビュー名パターンのユーティリティモジュール。
+
+`--include-views`/`--exclude-views` で指定するパターンは `*` をワイルドカードとし、
+それ以外の文字は正規表現として解釈されます。
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Pattern, Tuple
+
+# `*` 以外で正規表現として特別な意味を持つ文字
+_REGEX_SPECIAL_CHARS = frozenset(".^$+?{}[]\\|()")
+
+
+def pattern_to_regex(pattern: str) -> str:
+    """パターンを正規表現に変換します。
+
+    Args:
+        pattern: パターン（*をワイルドカードとして使用可能）
+
+    Returns:
+        パターン全体に一致する正規表現
+    """
+    return f"^{pattern.replace('*', '.*')}$"
+
+
+@lru_cache(maxsize=256)
+def compile_patterns(patterns: Tuple[str, ...]) -> Pattern[str]:
+    """複数のパターンをまとめて1つの正規表現にコンパイルします。
+
+    いずれかのパターンに一致する場合にマッチする正規表現を返します。
+    同じパターンの組み合わせはキャッシュされ、再コンパイルされません。
+
+    Args:
+        patterns: パターンのタプル
+
+    Returns:
+        コンパイル済みの正規表現
+    """
+    return re.compile("|".join(f"(?:{pattern_to_regex(p)})" for p in patterns))
+
+
+def match_any(text: str, patterns: Iterable[str]) -> bool:
+    """テキストがいずれかのパターンに一致するかどうかを判定します。
+
+    Args:
+        text: マッチング対象のテキスト
+        patterns: パターンのリスト
+
+    Returns:
+        いずれかのパターンに一致する場合はTrue
+    """
+    patterns = tuple(patterns)
+    if not patterns:
+        return False
+    return compile_patterns(patterns).match(text) is not None
+
+
+def is_simple_pattern(pattern: str) -> bool:
+    """パターンが `*` 以外の正規表現の特殊文字を含まないかどうかを判定します。
+
+    Args:
+        pattern: パターン
+
+    Returns:
+        SQLのLIKE述語に変換できる場合はTrue
+    """
+    return not any(char in _REGEX_SPECIAL_CHARS for char in pattern)
+
+
+def pattern_to_like(pattern: str) -> str:
+    """特殊文字を含まないパターンをSQLのLIKEパターンに変換します。
+
+    LIKEで特別な意味を持つ `\\`、`%`、`_` はエスケープします。
+
+    Args:
+        pattern: is_simple_pattern を満たすパターン
+
+    Returns:
+        LIKEパターン
+    """
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%")
@@ -0,0 +1,167 @@
+"""処理時間の計測ユーティリティモジュール。
+
+インポートの各段階やAPI呼び出しを名前付きの区間（スパン）として計測し、
+区間ごとの回数、合計時間、p50/p95のレイテンシを集計します。
+計測は `profiler.enable()` を呼び出した場合のみ行い、無効な間はほぼ処理を追加しません。
+"""
+
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class SpanStats:
+    """1つの区間の集計結果。
+
+    Attributes:
+        name: 区間の名前
+        count: 計測した回数
+        total: 合計時間（秒）
+        p50: 50パーセンタイルの時間（秒）
+        p95: 95パーセンタイルの時間（秒）
+        max: 最大の時間（秒）
+    """
+
+    name: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    max: float
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """昇順に並んだ値の最近接順位法によるパーセンタイルを返します。"""
+    rank = max(1, math.ceil(len(sorted_values) * percent / 100))
+    return sorted_values[rank - 1]
+
+
+class Profiler:
+    """区間ごとの処理時間を記録するプロファイラー。
+
+    複数のスレッドから同時に記録できます。
+    """
+
+    def __init__(self) -> None:
+        """プロファイラーを初期化します（無効な状態で作成されます）。"""
+        self.enabled = False
+        self._durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """記録済みの計測結果を破棄し、計測を開始します。"""
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """計測を停止します（記録済みの計測結果は残ります）。"""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """記録済みの計測結果を破棄します。"""
+        with self._lock:
+            self._durations = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """区間の処理時間を記録します。
+
+        Args:
+            name: 区間の名前
+            seconds: 処理時間（秒）
+        """
+        with self._lock:
+            self._durations.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """with文で囲んだ処理の時間を記録します。
+
+        例外が発生した場合も、それまでの時間を記録します。
+
+        Args:
+            name: 区間の名前
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self) -> List[SpanStats]:
+        """区間ごとの集計結果を最初に記録した順に返します。"""
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+        stats = []
+        for name, values in durations.items():
+            values.sort()
+            stats.append(
+                SpanStats(
+                    name=name,
+                    count=len(values),
+                    total=sum(values),
+                    p50=_percentile(values, 50),
+                    p95=_percentile(values, 95),
+                    max=values[-1],
+                )
+            )
+        return stats
+
+    def write_report(self, path: Path, **extra: Any) -> None:
+        """集計結果をJSONファイルに保存します。
+
+        Args:
+            path: 保存先のパス
+            **extra: レポートに含める追加の情報
+        """
+        report = {**extra, "spans": [asdict(stats) for stats in self.summary()]}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logger.debug(f"処理時間のレポートを保存しました: {path}")
+
+
+# アプリケーション全体で共有するプロファイラー
+profiler = Profiler()
+
+
+def span(name: str) -> Any:
+    """共有のプロファイラーで with文で囲んだ処理の時間を記録します。
+
+    Args:
+        name: 区間の名前
+    """
+    return profiler.span(name)
+
+
+def profiled(name: str) -> Callable[[_F], _F]:
+    """関数の呼び出しごとの時間を共有のプロファイラーに記録するデコレーター。
+
+    Args:
+        name: 区間の名前
+    """
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
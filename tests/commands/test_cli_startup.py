@@ -0,0 +1,53 @@
+"""CLI起動時のインポートのテスト"""
+import subprocess
+import sys
+
+# CLIの起動時に読み込んではいけない重いモジュール
+HEAVY_MODULES = [
+    "google.cloud.bigquery",
+    "google.cloud.datacatalog_lineage_v1",
+    "grpc",
+    "jinja2",
+]
+
+
+def _imported_modules(code: str) -> list:
+    """`python -X importtime` で読み込まれたモジュール名の一覧を取得します。"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        modules.append(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def test_cli_import_does_not_load_google_clients():
+    """CLIの読み込みでGoogle CloudクライアントやJinjaが読み込まれないことをテスト"""
+    modules = _imported_modules("import bq2dbt.cli")
+
+    assert "bq2dbt.cli" in modules
+    for heavy in HEAVY_MODULES:
+        loaded = [m for m in modules if m == heavy or m.startswith(heavy + ".")]
+        assert not loaded, f"{heavy} がCLIの起動時に読み込まれています"
+
+
+def test_cli_help_does_not_load_google_clients():
+    """--helpの表示でGoogle CloudクライアントやJinjaが読み込まれないことをテスト"""
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from bq2dbt.cli import cli\n"
+        "for args in (['--help'], ['import', 'views', '--help'], ['logs', '--help']):\n"
+        "    assert CliRunner().invoke(cli, args).exit_code == 0\n"
+    )
+    modules = _imported_modules(code)
+
+    for heavy in HEAVY_MODULES:
+        loaded = [m for m in modules if m == heavy or m.startswith(heavy + ".")]
+        assert not loaded, f"{heavy} が--helpの表示で読み込まれています"
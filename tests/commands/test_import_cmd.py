@@ -1,8 +1,10 @@
 """import_cmdのテスト"""
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 from bq2dbt.commands.import_views import import_views
 from bq2dbt.commands.importer import import_cmd
+from bq2dbt.converter.bigquery import MetadataSource, ViewMetadata
+from bq2dbt.converter.clients import DEFAULT_POOL_SIZE, ClientFactory
 from click.testing import CliRunner
 
 
@@ -17,12 +19,17 @@ def test_import_cmd_group():
 @patch("bq2dbt.converter.importer.BigQueryClient")
 @patch("bq2dbt.converter.importer.ModelGenerator")
 @patch("bq2dbt.converter.importer.DependencyResolver")
-def test_import_views_command(mock_resolver, mock_generator, mock_bq_client):
+@patch("bq2dbt.converter.importer.LineageCache")
+def test_import_views_command(
+    mock_lineage_cache, mock_resolver, mock_generator, mock_bq_client
+):
     """インポートビューコマンドのテスト（基本機能と主要オプション）"""
     # モックの設定
     mock_bq_instance = MagicMock()
     mock_bq_client.return_value = mock_bq_instance
-    mock_bq_instance.get_table_type.return_value = "VIEW"
+    mock_bq_instance.get_view_metadata.side_effect = lambda view: ViewMetadata(
+        view, "VIEW", view_query="SELECT 1"
+    )
 
     mock_resolver_instance = MagicMock()
     mock_resolver.return_value = mock_resolver_instance
@@ -53,10 +60,10 @@ def test_import_views_command(mock_resolver, mock_generator, mock_bq_client):
     )
 
     with patch("os.path.exists", return_value=True), patch(
-        "bq2dbt.converter.importer.Confirm.ask", return_value=True
+        "bq2dbt.converter.importer.Prompt.ask", return_value="overwrite"
     ), patch("bq2dbt.converter.importer.Path.mkdir"), patch(
         "bq2dbt.converter.importer.Path.exists", return_value=False
-    ):
+    ), patch.object(ClientFactory, "close", autospec=True) as mock_close:
         runner = CliRunner()
         result = runner.invoke(
             import_views,
@@ -74,12 +81,24 @@ def test_import_views_command(mock_resolver, mock_generator, mock_bq_client):
 
     # 結果の検証
     assert result.exit_code == 0
-    mock_bq_client.assert_called_with("test-project", location="asia-northeast1")
+    mock_bq_client.assert_called_with(
+        "test-project",
+        location="asia-northeast1",
+        metadata_source=MetadataSource.INFORMATION_SCHEMA,
+        client_factory=ANY,
+    )
+    # コネクションプールは並列数（--lineage-concurrency の既定値 8）以上の既定のサイズ
+    client_factory = mock_bq_client.call_args.kwargs["client_factory"]
+    assert client_factory.pool_size == DEFAULT_POOL_SIZE
+    # 共有のセッションとチャネルは実行の終了時に閉じる
+    mock_close.assert_called_once_with(client_factory)
     mock_bq_instance.list_views.assert_called_with(
         "test_dataset", include_patterns=None, exclude_patterns=None
     )
     mock_resolver_instance.analyze_dependencies.assert_called_once()
-    assert mock_bq_instance.get_table_type.call_count >= 2
+    # Lineageキャッシュは解析後に閉じられる
+    mock_lineage_cache.return_value.close.assert_called_once()
+    assert mock_bq_instance.get_view_metadata.call_count == 2
     assert mock_generator_instance.generate_sql_model.call_count == 2
     assert mock_generator_instance.generate_yaml_model.call_count == 2
 
@@ -103,7 +122,7 @@ def test_import_views_command(mock_resolver, mock_generator, mock_bq_client):
     )
 
     with patch("os.path.exists", return_value=True), patch(
-        "bq2dbt.converter.importer.Confirm.ask", return_value=True
+        "bq2dbt.converter.importer.Prompt.ask", return_value="overwrite"
     ), patch("bq2dbt.converter.importer.Path.mkdir"), patch(
         "bq2dbt.converter.importer.Path.exists", return_value=False
     ):
@@ -146,7 +165,7 @@ def test_import_views_command(mock_resolver, mock_generator, mock_bq_client):
     ]
 
     with patch("os.path.exists", return_value=True), patch(
-        "bq2dbt.converter.importer.Confirm.ask", return_value=True
+        "bq2dbt.converter.importer.Prompt.ask", return_value="overwrite"
     ), patch("bq2dbt.converter.importer.Path.mkdir"), patch(
         "bq2dbt.converter.importer.Path.exists", return_value=False
     ):
@@ -168,3 +187,71 @@ def test_import_views_command(mock_resolver, mock_generator, mock_bq_client):
     assert result.exit_code == 0
     mock_resolver_instance.analyze_dependencies.assert_not_called()
     assert mock_generator_instance.generate_sql_model.call_count == 2
+
+
+def test_import_views_command_requires_project_without_snapshot():
+    """--from-snapshotなしでプロジェクトとデータセットが必須であることをテスト"""
+    runner = CliRunner()
+    result = runner.invoke(
+        import_views,
+        ["--output-dir", "output"],
+        obj={"VERBOSE": False},
+    )
+
+    assert result.exit_code != 0
+    assert "--project-id" in result.output
+
+
+@patch("bq2dbt.converter.importer.import_views")
+def test_import_views_command_datasets(mock_import_views):
+    """--datasetsで複数のデータセットを指定できることをテスト"""
+    runner = CliRunner()
+    result = runner.invoke(
+        import_views,
+        [
+            "--project-id",
+            "test-project",
+            "--datasets",
+            "dataset_a, dataset_b",
+            "--output-dir",
+            "output",
+        ],
+        obj={"VERBOSE": False},
+    )
+
+    assert result.exit_code == 0
+    assert mock_import_views.call_args[1]["datasets"] == ["dataset_a", "dataset_b"]
+
+    # --dataset との同時指定はエラー
+    result = runner.invoke(
+        import_views,
+        [
+            "--project-id",
+            "test-project",
+            "--dataset",
+            "dataset_a",
+            "--datasets",
+            "dataset_b",
+            "--output-dir",
+            "output",
+        ],
+        obj={"VERBOSE": False},
+    )
+    assert result.exit_code != 0
+    assert "--datasets" in result.output
+
+
+@patch("bq2dbt.converter.importer.apply_import_plan")
+def test_import_apply_command_shard(mock_apply, temp_output_dir):
+    """applyコマンドの--shardの解析をテスト"""
+    plan_file = temp_output_dir / "plan.json"
+    plan_file.write_text("{}")
+    runner = CliRunner()
+
+    result = runner.invoke(import_cmd, ["apply", str(plan_file), "--shard", "2/4"])
+    assert result.exit_code == 0
+    assert mock_apply.call_args[1]["shard"] == (2, 4)
+
+    result = runner.invoke(import_cmd, ["apply", str(plan_file), "--shard", "5/4"])
+    assert result.exit_code != 0
+    assert "--shard" in result.output
@@ -4,6 +4,8 @@ import tempfile
 from pathlib import Path
 
 import pytest
+from bq2dbt.converter.bigquery import DatasetCatalog
+from bq2dbt.converter.snapshot import MetadataSnapshot
 
 
 @pytest.fixture
@@ -13,6 +15,56 @@ def temp_output_dir():
         yield Path(tmpdirname)
 
 
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    """インポートのチェックポイントを一時ディレクトリに保存するフィクスチャ"""
+    monkeypatch.setattr("bq2dbt.utils.checkpoint.CHECKPOINT_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def anonymous_credentials(monkeypatch):
+    """アプリケーションのデフォルト認証情報の代わりに匿名の認証情報を使うフィクスチャ"""
+    from google.auth.credentials import AnonymousCredentials
+
+    monkeypatch.setattr(
+        "google.auth.default",
+        lambda scopes=None, **kwargs: (AnonymousCredentials(), None),
+    )
+
+
+@pytest.fixture
+def sample_snapshot():
+    """2つのビューとテーブルを含むメタデータスナップショットを提供するフィクスチャ"""
+    return MetadataSnapshot(
+        project_id="test-project",
+        location="asia-northeast1",
+        dataset_id="test_dataset",
+        views=["view1", "view2"],
+        catalogs=[
+            DatasetCatalog(
+                "test-project",
+                "test_dataset",
+                table_types={"view1": "VIEW", "view2": "VIEW", "table1": "BASE TABLE"},
+                view_definitions={
+                    "view1": "SELECT * FROM `test-project.test_dataset.view2`",
+                    "view2": "SELECT * FROM `test-project.test_dataset.table1`",
+                },
+                schemas={
+                    "view1": [{"name": "id", "type": "INT64", "mode": "NULLABLE"}],
+                    "view2": [{"name": "id", "type": "INT64", "mode": "NULLABLE"}],
+                },
+            )
+        ],
+        lineage={
+            "test-project.test_dataset.view1": ["test-project.test_dataset.view2"],
+            "test-project.test_dataset.view2": ["test-project.test_dataset.table1"],
+            "test-project.test_dataset.table1": [],
+        },
+        max_depth=3,
+    )
+
+
 @pytest.fixture
 def template_dir():
     """テンプレートディレクトリのパスを提供するフィクスチャ"""
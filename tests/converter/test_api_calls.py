@@ -0,0 +1,58 @@
+"""合成データセットに対するAPI呼び出し回数のテスト
+
+benchmarks の偽のAPIクライアントを使い、ビュー数に比例した問い合わせが
+増えていないことを確認します。
+"""
+import pytest
+from benchmarks.fakes import fake_backend
+from benchmarks.synthetic import generate_dataset
+from bq2dbt.converter.importer import import_views
+from bq2dbt.utils.api_metrics import api_metrics
+
+
+def _import(dataset, output_dir, **kwargs):
+    """合成データセットのビューを非インタラクティブにインポートします。"""
+    import_views(
+        project_id=dataset.project_id,
+        dataset=dataset.dataset_id,
+        output_dir=output_dir,
+        naming_preset="full",
+        non_interactive=True,
+        on_conflict="overwrite",
+        lineage_cache_ttl=0,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("topology", ["chain", "fan_in", "fan_out", "diamond"])
+def test_information_schema_queries_are_constant(topology, temp_output_dir):
+    """INFORMATION_SCHEMAの問い合わせ回数がビュー数によらないことをテスト"""
+    dataset = generate_dataset(40, topology, definition_size=0)
+
+    with fake_backend([dataset]) as backend:
+        _import(dataset, temp_output_dir, include_dependencies=True, jobs=4)
+
+    calls = backend.calls.snapshot()
+    # ビュー一覧 + テーブルタイプ、ビュー定義、スキーマ、説明とラベル
+    assert calls["bigquery.query"] == 5
+    assert "bigquery.get_table" not in calls
+    # Lineage APIはビューと参照先のテーブルごとに1回
+    referenced = set(dataset.lineage).union(*dataset.lineage.values())
+    assert calls["lineage.search_links"] == len(referenced)
+    # 実行結果の集計はLineage APIのページごとに数える
+    measured = {stats.name: stats.calls for stats in api_metrics.summary()[0]}
+    assert measured["lineage.search_links"] == calls["lineage.search_links_pages"]
+    assert len(list(temp_output_dir.glob("*.sql"))) == 40
+
+
+def test_api_metadata_source_calls(temp_output_dir):
+    """API経由のメタデータ取得ではビューごとに tables.get を1回だけ呼ぶことをテスト"""
+    dataset = generate_dataset(20, definition_size=0)
+
+    with fake_backend([dataset]) as backend:
+        _import(dataset, temp_output_dir, metadata_source="api", jobs=4)
+
+    assert backend.calls.snapshot() == {
+        "bigquery.get_table": 20,
+        "bigquery.list_tables": 1,
+    }
@@ -1,24 +1,36 @@
 """BigQueryClientのテスト"""
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
-from bq2dbt.converter.bigquery import BigQueryClient
+from bq2dbt.converter.bigquery import BigQueryClient, MetadataSource
+from google.api_core.exceptions import NotFound
 from bq2dbt.converter.lineage import LineageClient
+from bq2dbt.utils.api_metrics import api_metrics
 
 
 # モックを使用したテスト
 def test_bigquery_client_init():
     """BigQueryClientの初期化をテスト"""
-    with patch("bq2dbt.converter.bigquery.bigquery.Client") as mock_client:
+    with patch("google.cloud.bigquery.Client") as mock_client:
         client = BigQueryClient("test-project")
-        mock_client.assert_called_once_with(project="test-project")
         assert client.project_id == "test-project"
 
+        # REST APIの計測フックを付けた共有のセッションを使う
+        session = client.client_factory.http_session()
+        mock_client.assert_called_once_with(
+            project="test-project", credentials=session.credentials, _http=session
+        )
+        assert api_metrics.record_http_response in session.hooks["response"]
+
 
 def test_list_views():
     """ビュー一覧の取得をテスト（モック使用）"""
-    with patch("bq2dbt.converter.bigquery.bigquery.Client") as mock_bq_client:
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
         # モックのクエリ結果を設定
         mock_instance = mock_bq_client.return_value
 
@@ -60,7 +72,7 @@ def test_list_views():
 
 def test_get_view_definition():
     """ビュー定義の取得をテスト（モック使用）"""
-    with patch("bq2dbt.converter.bigquery.bigquery.Client") as mock_bq_client:
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
         # モックのクエリ結果を設定
         mock_instance = mock_bq_client.return_value
 
@@ -97,7 +109,7 @@ def test_get_view_definition():
 
 def test_get_view_schema():
     """ビューのスキーマ情報取得をテスト（モック使用）"""
-    with patch("bq2dbt.converter.bigquery.bigquery.Client") as mock_bq_client:
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
         # モックの設定
         mock_instance = mock_bq_client.return_value
 
@@ -153,6 +165,167 @@ def test_get_view_schema():
         mock_instance.get_table.assert_called_once_with(mock_table_ref)
 
 
+def test_list_views_pushes_patterns_into_query():
+    """include/excludeパターンがクエリパラメータとして渡されることをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        # BigQuery側で絞り込まれた結果のみが返る
+        mock_instance.query.return_value = [
+            MagicMock(table_name="stg_orders"),
+            MagicMock(table_name="stg_orders_tmp"),
+        ]
+
+        client = BigQueryClient("test-project")
+        views = client.list_views(
+            "test_dataset",
+            include_patterns=["stg_*", "dim.*"],
+            exclude_patterns=["*_tmp"],
+        )
+
+        assert views == ["test-project.test_dataset.stg_orders"]
+
+        query = mock_instance.query.call_args[0][0]
+        assert "table_name LIKE @include_0" in query
+        assert "REGEXP_CONTAINS(table_name, @include_1)" in query
+        assert "NOT (table_name LIKE @exclude_0)" in query
+
+        job_config = mock_instance.query.call_args[1]["job_config"]
+        parameters = {p.name: p.value for p in job_config.query_parameters}
+        assert parameters == {
+            "include_0": "stg\\_%",
+            "include_1": "^dim..*$",
+            "exclude_0": "%\\_tmp",
+        }
+
+
+def test_api_metadata_source_does_not_create_query_jobs():
+    """APIモードではtables.list/tables.getのみでメタデータを取得することをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        mock_instance.list_tables.return_value = [
+            MagicMock(table_id="view1", table_type="VIEW"),
+            MagicMock(table_id="view2", table_type="VIEW"),
+            MagicMock(table_id="table1", table_type="TABLE"),
+        ]
+        id_field = MagicMock(field_type="INT64", description=None, mode="REQUIRED")
+        id_field.name = "id"
+        mock_instance.get_table.return_value = MagicMock(
+            view_query="SELECT id FROM table1", schema=[id_field]
+        )
+
+        client = BigQueryClient("test-project", metadata_source=MetadataSource.API)
+
+        assert client.list_views("test_dataset", exclude_patterns=["view2"]) == [
+            "test-project.test_dataset.view1"
+        ]
+        assert client.get_table_type("test-project.test_dataset.view1") == "VIEW"
+        assert client.get_table_type("test-project.test_dataset.table1") == (
+            "BASE TABLE"
+        )
+        assert client.get_table_type("test-project.test_dataset.missing") == ""
+        assert (
+            client.get_view_definition("test-project.test_dataset.view1")
+            == "SELECT id FROM table1"
+        )
+        assert client.get_view_schema("test-project.test_dataset.view1") == [
+            {"name": "id", "type": "INT64", "description": "", "mode": "REQUIRED"}
+        ]
+
+        # テーブル一覧はデータセットごとに1回、tables.getはビューごとに1回のみ
+        mock_instance.list_tables.assert_called_once_with("test-project.test_dataset")
+        mock_instance.get_table.assert_called_once_with(
+            "test-project.test_dataset.view1"
+        )
+        mock_instance.query.assert_not_called()
+
+
+def test_load_catalog_serves_lookups_from_memory():
+    """カタログ読み込み後はビュー単位の問い合わせがクエリを発行しないことをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+
+        table_rows = [
+            {"table_name": "view1", "table_type": "VIEW"},
+            {"table_name": "table1", "table_type": "BASE TABLE"},
+        ]
+        view_rows = [{"table_name": "view1", "view_definition": "SELECT 1 AS id"}]
+        column_rows = [
+            {
+                "table_name": "view1",
+                "field_path": "id",
+                "data_type": "INT64",
+                "is_nullable": "YES",
+                "description": "ID column",
+            },
+            {
+                "table_name": "view1",
+                "field_path": "tags",
+                "data_type": "ARRAY<STRING>",
+                "is_nullable": "NO",
+                "description": None,
+            },
+        ]
+        option_rows = [
+            {
+                "table_name": "view1",
+                "option_name": "description",
+                "option_value": '"売上\\nビュー"',
+            },
+            {
+                "table_name": "view1",
+                "option_name": "labels",
+                "option_value": '[STRUCT("env", "prod"), STRUCT("team", "data")]',
+            },
+        ]
+        mock_instance.query.side_effect = [
+            table_rows,
+            view_rows,
+            column_rows,
+            option_rows,
+        ]
+
+        client = BigQueryClient("test-project")
+        catalog = client.load_catalog("test_dataset")
+
+        # データセットあたり4クエリのみ
+        assert mock_instance.query.call_count == 4
+        assert catalog.table_types == {"view1": "VIEW", "table1": "BASE TABLE"}
+        assert catalog.descriptions == {"view1": "売上\nビュー"}
+        assert catalog.labels == {"view1": {"env": "prod", "team": "data"}}
+
+        # 2回目の読み込みはキャッシュから返される
+        assert client.load_catalog("test_dataset") is catalog
+
+        assert client.get_table_type("test-project.test_dataset.view1") == "VIEW"
+        assert client.get_table_type("test-project.test_dataset.missing") == ""
+        assert (
+            client.get_view_definition("test-project.test_dataset.view1")
+            == "SELECT 1 AS id"
+        )
+        assert client.get_view_schema("test-project.test_dataset.view1") == [
+            {
+                "name": "id",
+                "type": "INT64",
+                "description": "ID column",
+                "mode": "NULLABLE",
+            },
+            {"name": "tags", "type": "STRING", "description": "", "mode": "REPEATED"},
+        ]
+        with pytest.raises(ValueError):
+            client.get_view_definition("test-project.test_dataset.table1")
+
+        metadata = client.get_view_metadata("test-project.test_dataset.view1")
+        assert metadata.table_type == "VIEW"
+        assert metadata.view_query == "SELECT 1 AS id"
+        assert len(metadata.schema) == 2
+        assert metadata.description == "売上\nビュー"
+        assert metadata.labels == {"env": "prod", "team": "data"}
+
+        # 追加のクエリやREST呼び出しは発生しない
+        assert mock_instance.query.call_count == 4
+        mock_instance.get_table.assert_not_called()
+
+
 @patch("google.cloud.datacatalog_lineage_v1.LineageClient")
 def test_get_table_dependencies(mock_lineage_client_class):
     """テーブル依存関係の取得をテスト"""
@@ -167,10 +340,11 @@ def test_get_table_dependencies(mock_lineage_client_class):
     mock_link2 = MagicMock()
     mock_link2.source.fully_qualified_name = "bigquery:project.dataset.source_view2"
 
-    # PagedIteratorのような動作をするモックを作成
-    mock_page_result = MagicMock()
-    mock_page_result.__iter__.return_value = [mock_link1, mock_link2]
-    mock_lineage_client.search_links.return_value = mock_page_result
+    # SearchLinksPagerと同じくページごとにリンクを返す（2ページ）
+    mock_lineage_client.search_links.return_value = SimpleNamespace(
+        pages=[SimpleNamespace(links=[mock_link1]), SimpleNamespace(links=[mock_link2])]
+    )
+    api_metrics.reset()
 
     # LineageClientを初期化
     client = LineageClient("project")
@@ -183,6 +357,10 @@ def test_get_table_dependencies(mock_lineage_client_class):
         "project.dataset.source_view1",
         "project.dataset.source_view2",
     ]
+    # Lineage APIの呼び出しはページごとに数える
+    assert [(stats.name, stats.calls) for stats in api_metrics.summary()[0]] == [
+        ("lineage.search_links", 2)
+    ]
 
     # search_linksが正しい引数で呼ばれたことを確認
     mock_lineage_client.search_links.assert_called_once()
@@ -194,6 +372,41 @@ def test_get_table_dependencies(mock_lineage_client_class):
     assert request.target.fully_qualified_name == "bigquery:project.dataset.view"
 
 
+@patch("google.cloud.datacatalog_lineage_v1.LineageClient")
+def test_get_table_dependencies_uses_cache(mock_lineage_client_class):
+    """キャッシュがある場合はLineage APIを呼び出さないことをテスト"""
+    mock_lineage_client = mock_lineage_client_class.return_value
+    mock_link = MagicMock()
+    mock_link.source.fully_qualified_name = "bigquery:project.dataset.source_view"
+    mock_lineage_client.search_links.return_value = SimpleNamespace(
+        pages=[SimpleNamespace(links=[mock_link])]
+    )
+
+    cache = MagicMock()
+    cache.get.return_value = ["project.dataset.cached_view"]
+
+    client = LineageClient("project", cache=cache)
+    assert client.get_table_dependencies("project.dataset.view") == [
+        "project.dataset.cached_view"
+    ]
+    cache.get.assert_called_once_with(
+        "bigquery:project.dataset.view", "asia-northeast1"
+    )
+    mock_lineage_client.search_links.assert_not_called()
+
+    # refresh_cache指定時はAPIから取得し直してキャッシュを更新する
+    client = LineageClient("project", cache=cache, refresh_cache=True)
+    assert client.get_table_dependencies("project.dataset.view") == [
+        "project.dataset.source_view"
+    ]
+    mock_lineage_client.search_links.assert_called_once()
+    cache.set.assert_called_once_with(
+        "bigquery:project.dataset.view",
+        "asia-northeast1",
+        ["project.dataset.source_view"],
+    )
+
+
 def test_get_table_dependencies_error_handling():
     """テーブル依存関係の取得時のエラーハンドリングをテスト"""
     with patch(
@@ -237,3 +450,243 @@ class TestBigQueryIntegration:
         # ビューが存在する場合は形式を確認
         if views:
             assert all(f"{bq_project_id}.{bq_dataset_id}." in view for view in views)
+
+
+def test_get_view_metadata_uses_single_get_table_call():
+    """カタログ未読み込みの場合はtables.getの1回でメタデータを取得することをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        id_field = MagicMock(field_type="INT64", description="ID", mode="NULLABLE")
+        id_field.name = "id"
+        modified = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        mock_instance.get_table.return_value = MagicMock(
+            table_type="VIEW",
+            view_query="SELECT id FROM table1",
+            schema=[id_field],
+            description="ビューの説明",
+            labels={"env": "prod"},
+            modified=modified,
+        )
+
+        client = BigQueryClient("test-project")
+        metadata = client.get_view_metadata("test-project.test_dataset.view1")
+
+        assert metadata.table_type == "VIEW"
+        assert metadata.view_query == "SELECT id FROM table1"
+        assert metadata.schema == (
+            {"name": "id", "type": "INT64", "description": "ID", "mode": "NULLABLE"},
+        )
+        assert metadata.description == "ビューの説明"
+        assert metadata.labels == {"env": "prod"}
+        assert metadata.modified == modified
+        mock_instance.get_table.assert_called_once_with(
+            "test-project.test_dataset.view1"
+        )
+        mock_instance.query.assert_not_called()
+
+        # 存在しないオブジェクトはテーブルタイプが空になる
+        mock_instance.get_table.side_effect = NotFound("not found")
+        missing = client.get_view_metadata("test-project.test_dataset.missing")
+        assert missing.table_type == ""
+
+        # その他のエラーはValueErrorになる
+        mock_instance.get_table.side_effect = RuntimeError("boom")
+        with pytest.raises(ValueError):
+            client.get_view_metadata("test-project.test_dataset.view1")
+
+
+def test_region_metadata_source_loads_all_datasets_in_one_pass():
+    """リージョンモードでは全データセットのメタデータを1回の問い合わせで取得することをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        table_rows = [
+            {"table_schema": "dataset_a", "table_name": "view1", "table_type": "VIEW"},
+            {"table_schema": "dataset_b", "table_name": "view2", "table_type": "VIEW"},
+            {
+                "table_schema": "dataset_b",
+                "table_name": "table1",
+                "table_type": "BASE TABLE",
+            },
+        ]
+        view_rows = [
+            {
+                "table_schema": "dataset_a",
+                "table_name": "view1",
+                "view_definition": "SELECT * FROM dataset_b.view2",
+            },
+            {
+                "table_schema": "dataset_b",
+                "table_name": "view2",
+                "view_definition": "SELECT * FROM dataset_b.table1",
+            },
+        ]
+        column_rows = [
+            {
+                "table_schema": "dataset_b",
+                "table_name": "view2",
+                "field_path": "id",
+                "data_type": "INT64",
+                "is_nullable": "YES",
+                "description": None,
+            },
+        ]
+        mock_instance.query.side_effect = [table_rows, view_rows, column_rows, []]
+
+        client = BigQueryClient("test-project", metadata_source=MetadataSource.REGION)
+
+        assert client.list_views("dataset_a") == ["test-project.dataset_a.view1"]
+        metadata = client.get_view_metadata("test-project.dataset_b.view2")
+        assert metadata.view_query == "SELECT * FROM dataset_b.table1"
+        assert metadata.schema[0]["name"] == "id"
+        assert client.get_table_type("test-project.dataset_b.table1") == "BASE TABLE"
+        # リージョン内にないデータセットは空として扱い、再問い合わせしない
+        assert client.get_table_type("test-project.dataset_c.view3") == ""
+
+        # 依存先のデータセットを含めて4クエリのみ
+        assert mock_instance.query.call_count == 4
+        query = mock_instance.query.call_args_list[0][0][0]
+        assert (
+            "`test-project.region-asia-northeast1.INFORMATION_SCHEMA.TABLES`" in query
+        )
+        mock_instance.get_table.assert_not_called()
+
+
+def test_load_region_catalogs_filters_datasets():
+    """指定したデータセットのみをリージョン単位で取得することをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        table_rows = [
+            {"table_schema": "dataset_a", "table_name": "view1", "table_type": "VIEW"},
+        ]
+        mock_instance.query.side_effect = [table_rows, [], [], []]
+
+        client = BigQueryClient("test-project")
+        catalogs = client.load_region_catalogs(["dataset_a", "dataset_b"])
+
+        assert [c.dataset_id for c in catalogs] == ["dataset_a", "dataset_b"]
+        assert catalogs[1].table_types == {}
+        job_config = mock_instance.query.call_args_list[0][1]["job_config"]
+        parameter = job_config.query_parameters[0]
+        assert parameter.name == "datasets"
+        assert parameter.values == ["dataset_a", "dataset_b"]
+
+        # 読み込み済みのカタログからビュー一覧を返し、追加のクエリは発行しない
+        assert client.list_views("dataset_a") == ["test-project.dataset_a.view1"]
+        assert client.load_region_catalogs(["dataset_a"]) == catalogs[:1]
+        assert mock_instance.query.call_count == 4
+
+
+
+def test_load_catalog_fetches_datasets_in_parallel():
+    """異なるデータセットのカタログを並列に、同じデータセットは1回だけ読み込むことをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        # 2つのデータセットの読み込みが同時に進まないとタイムアウトする
+        barrier = threading.Barrier(2, timeout=5)
+
+        def list_tables(dataset_ref):
+            barrier.wait()
+            return []
+
+        mock_instance.list_tables.side_effect = list_tables
+
+        client = BigQueryClient("test-project", metadata_source=MetadataSource.API)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            catalogs = list(
+                executor.map(client.load_catalog, ["dataset_a", "dataset_b"])
+            )
+
+        assert [c.dataset_id for c in catalogs] == ["dataset_a", "dataset_b"]
+        assert client.load_catalog("dataset_a") is catalogs[0]
+        assert mock_instance.list_tables.call_count == 2
+
+def test_load_catalog_includes_nested_fields():
+    """COLUMN_FIELD_PATHSからネストしたフィールドを宣言順に取得することをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+        address_type = "STRUCT<city STRING, geo STRUCT<lat FLOAT64, lng FLOAT64>>"
+
+        def field_row(field_path, data_type, is_nullable="YES", description=None):
+            return {
+                "table_name": "view1",
+                "field_path": field_path,
+                "data_type": data_type,
+                "description": description,
+                "is_nullable": is_nullable,
+            }
+
+        # ネストしたフィールドの行は宣言順に返されるとは限らない
+        column_rows = [
+            field_row("id", "INT64", is_nullable="NO"),
+            field_row("address.geo.lng", "FLOAT64"),
+            field_row("address", address_type),
+            field_row("address.geo", "STRUCT<lat FLOAT64, lng FLOAT64>"),
+            field_row("address.city", "STRING", description="市区町村"),
+            field_row("address.geo.lat", "FLOAT64"),
+            field_row("items", "ARRAY<STRUCT<sku STRING>>"),
+            field_row("items.sku", "STRING"),
+        ]
+        mock_instance.query.side_effect = [
+            [{"table_name": "view1", "table_type": "VIEW"}],
+            [{"table_name": "view1", "view_definition": "SELECT 1"}],
+            column_rows,
+            [],
+        ]
+
+        client = BigQueryClient("test-project")
+        client.load_catalog("test_dataset")
+        schema = client.get_view_schema("test-project.test_dataset.view1")
+
+        assert [(c["name"], c["type"], c["mode"]) for c in schema] == [
+            ("id", "INT64", "REQUIRED"),
+            ("address", "RECORD", "NULLABLE"),
+            ("address.city", "STRING", "NULLABLE"),
+            ("address.geo", "RECORD", "NULLABLE"),
+            ("address.geo.lat", "FLOAT64", "NULLABLE"),
+            ("address.geo.lng", "FLOAT64", "NULLABLE"),
+            ("items", "RECORD", "REPEATED"),
+            ("items.sku", "STRING", "NULLABLE"),
+        ]
+        assert schema[2]["description"] == "市区町村"
+        # スキーマはデータセットあたり1クエリで取得する
+        assert mock_instance.query.call_count == 4
+
+
+def test_get_view_schema_flattens_nested_record_fields():
+    """tables.get APIのRECORD型の子フィールドを展開することをテスト"""
+    with patch("google.cloud.bigquery.Client") as mock_bq_client:
+        mock_instance = mock_bq_client.return_value
+
+        def schema_field(name, field_type, mode="NULLABLE", fields=()):
+            field = MagicMock(
+                field_type=field_type, description=None, mode=mode, fields=fields
+            )
+            field.name = name
+            return field
+
+        mock_instance.get_table.return_value = MagicMock(
+            schema=[
+                schema_field(
+                    "address",
+                    "RECORD",
+                    fields=[
+                        schema_field("city", "STRING"),
+                        schema_field(
+                            "geo", "RECORD", fields=[schema_field("lat", "FLOAT64")]
+                        ),
+                    ],
+                ),
+                schema_field("id", "INT64", mode="REQUIRED"),
+            ]
+        )
+
+        client = BigQueryClient("test-project")
+        schema = client.get_view_schema("test-project.test_dataset.view1")
+
+        assert [c["name"] for c in schema] == [
+            "address",
+            "address.city",
+            "address.geo",
+            "address.geo.lat",
+            "id",
+        ]
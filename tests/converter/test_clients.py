@@ -0,0 +1,72 @@
+"""converter.clientsモジュールのテスト"""
+from unittest.mock import MagicMock
+
+import pytest
+from benchmarks.emulator import Emulator
+from benchmarks.synthetic import generate_dataset, to_snapshot
+from bq2dbt.converter import bigquery, lineage
+from bq2dbt.converter.bigquery import BigQueryClient, MetadataSource
+from bq2dbt.converter.clients import DEFAULT_POOL_SIZE, ClientFactory, default_pool_size
+from bq2dbt.converter.dependency import DependencyResolver
+
+
+@pytest.fixture
+def emulator(monkeypatch):
+    """接続先をローカルのエミュレーターに向けるフィクスチャ"""
+    dataset = generate_dataset(4, "chain", column_count=2, definition_size=0)
+    with Emulator(to_snapshot(dataset)) as running:
+        monkeypatch.setenv(bigquery.API_ENDPOINT_ENV, running.bigquery_endpoint)
+        monkeypatch.setenv(lineage.API_ENDPOINT_ENV, running.lineage_endpoint)
+        running.dataset = dataset
+        yield running
+
+
+def test_default_pool_size():
+    """並列数が既定値を超える場合のみプールを大きくすることをテスト"""
+    assert default_pool_size(1) == DEFAULT_POOL_SIZE
+    assert default_pool_size(4, 32) == 32
+
+
+def test_clients_share_session_and_channel(emulator):
+    """同じファクトリーのクライアントがセッションとチャネルを共有することをテスト"""
+    factory = ClientFactory(pool_size=24)
+    project_id = emulator.dataset.project_id
+    try:
+        first = BigQueryClient(project_id, client_factory=factory)
+        second = BigQueryClient(
+            project_id, metadata_source=MetadataSource.API, client_factory=factory
+        )
+        assert first.client is second.client
+        assert first.client._http is factory.http_session()
+        adapter = factory.http_session().get_adapter("http://localhost")
+        assert adapter._pool_maxsize == 24
+
+        # DependencyResolver はBigQueryクライアントのファクトリーを使い回す
+        resolver = DependencyResolver(first)
+        other = lineage.LineageClient(project_id, "US", client_factory=factory)
+        assert resolver.lineage_client.lineage_client is other.lineage_client
+
+        views = second.list_views(emulator.dataset.dataset_id)
+        assert len(views) == 4
+        dependencies = [
+            resolver.lineage_client.get_table_dependencies(view) for view in views
+        ]
+        assert any(dependencies)
+    finally:
+        factory.close()
+
+    assert emulator.stats()["bigquery.tables.list"] == 1
+
+
+def test_close_resets_clients():
+    """close後は新しいセッションとクライアントを作成することをテスト"""
+    factory = ClientFactory()
+    session = MagicMock()
+    factory._session = session
+    factory._bigquery_clients = {"p": MagicMock()}
+
+    factory.close()
+
+    session.close.assert_called_once()
+    assert factory._session is None
+    assert factory._bigquery_clients == {}
@@ -1,9 +1,12 @@
 """DependencyResolverのテスト"""
 from unittest.mock import MagicMock, patch
 
+import pytest
 from bq2dbt.converter.dependency import (
+    CircularDependencyError,
     DataCatalogDependencyResolver,
     DependencyResolver,
+    SqlParsingDependencyResolver,
 )
 from rich.console import Console
 from rich.table import Table
@@ -30,7 +33,11 @@ def test_dependency_resolver_init(mock_lineage_client_class):
 
     # LineageClientが正しく作成されたことを確認
     mock_lineage_client_class.assert_called_once_with(
-        mock_bq_client.project_id, mock_bq_client.location
+        mock_bq_client.project_id,
+        mock_bq_client.location,
+        cache=None,
+        refresh_cache=False,
+        client_factory=mock_bq_client.client_factory,
     )
 
 
@@ -101,6 +108,56 @@ def test_get_topological_order():
     ]
 
 
+def test_get_topological_order_deep_chain():
+    """グラフの挿入順に依存せず、深い依存チェーンを正しく並べることをテスト"""
+    resolver = DataCatalogDependencyResolver(MagicMock(), MagicMock())
+    resolver.dependency_graph = {
+        "p.d.b": ["p.d.c"],
+        "p.d.c": ["p.d.d"],
+        "p.d.a": ["p.d.b"],
+        "p.d.d": [],
+    }
+
+    assert resolver.get_topological_order() == ["p.d.d", "p.d.c", "p.d.b", "p.d.a"]
+
+
+def test_get_topological_levels():
+    """互いに独立なビューが同じレベルにまとめられることをテスト"""
+    resolver = DataCatalogDependencyResolver(MagicMock(), MagicMock())
+    resolver.dependency_graph = {
+        "p.d.top": ["p.d.left", "p.d.right"],
+        "p.d.left": ["p.d.base", "p.d.external"],
+        "p.d.right": ["p.d.base"],
+        "p.d.base": [],
+        "p.d.other": [],
+    }
+
+    # グラフ外の依存先（p.d.external）は順序付けに影響しない
+    assert resolver.get_topological_levels() == [
+        ["p.d.base", "p.d.other"],
+        ["p.d.left", "p.d.right"],
+        ["p.d.top"],
+    ]
+
+
+def test_get_topological_levels_detects_cycle():
+    """循環参照を検出して例外で報告することをテスト"""
+    resolver = DataCatalogDependencyResolver(MagicMock(), MagicMock())
+    resolver.dependency_graph = {
+        "p.d.root": ["p.d.a"],
+        "p.d.a": ["p.d.b"],
+        "p.d.b": ["p.d.c"],
+        "p.d.c": ["p.d.a"],
+        "p.d.leaf": [],
+    }
+
+    with pytest.raises(CircularDependencyError) as excinfo:
+        resolver.get_topological_order()
+
+    assert excinfo.value.cycle == ["p.d.a", "p.d.b", "p.d.c", "p.d.a"]
+    assert "p.d.a -> p.d.b -> p.d.c -> p.d.a" in str(excinfo.value)
+
+
 def test_get_dependent_views():
     """依存しているビューの取得をテスト"""
     mock_bq_client = MagicMock()
@@ -423,3 +480,110 @@ def test_analyze_dependencies_with_max_depth():
     # get_table_dependenciesの呼び出し回数を確認
     # view1, view2, view3の依存関係のみ取得される
     assert mock_lineage_client.get_table_dependencies.call_count == 3
+
+
+def test_analyze_dependencies_parallel_levels():
+    """同じ深さのビューを並列に解析し、同一FQNの呼び出しを重複させないことをテスト"""
+    mock_bq_client = MagicMock()
+    mock_lineage_client = MagicMock()
+    mock_bq_client.project_id = "project"
+
+    # ダイヤモンド型の依存関係: view1 -> (view2, view3) -> view4 -> view5
+    graph = {
+        "project.dataset.view1": ["project.dataset.view2", "project.dataset.view3"],
+        "project.dataset.view2": ["project.dataset.view4"],
+        "project.dataset.view3": ["project.dataset.view4"],
+        "project.dataset.view4": ["project.dataset.view5"],
+        "project.dataset.view5": [],
+    }
+    mock_lineage_client.get_table_dependencies.side_effect = lambda view: graph[view]
+
+    resolver = DataCatalogDependencyResolver(
+        mock_bq_client, mock_lineage_client, max_workers=4
+    )
+    status_callback = MagicMock()
+    all_views, dependency_graph = resolver.analyze_dependencies(
+        ["project.dataset.view1", "project.dataset.view2"],
+        "dataset",
+        max_depth=1,
+        status_callback=status_callback,
+    )
+
+    # view5は深さ2のため探索されないが、依存先としては含まれる
+    assert set(all_views) == set(graph)
+    assert list(dependency_graph) == [
+        "project.dataset.view1",
+        "project.dataset.view2",
+        "project.dataset.view3",
+        "project.dataset.view4",
+    ]
+    assert resolver.reverse_graph["project.dataset.view4"] == [
+        "project.dataset.view2",
+        "project.dataset.view3",
+    ]
+
+    # 各ビューは1回だけ問い合わせられる
+    called = [c.args[0] for c in mock_lineage_client.get_table_dependencies.call_args_list]
+    assert sorted(called) == sorted(dependency_graph)
+
+    # 各ビューの進捗と完了が通知される
+    assert status_callback.call_count == len(dependency_graph) + 1
+    status_callback.assert_called_with("完了", 4, 4)
+
+
+def test_sql_parsing_resolver_uses_view_definitions():
+    """ビュー定義のSQLから依存関係グラフを構築することをテスト"""
+    mock_bq_client = MagicMock()
+    table_types = {
+        "project.dataset.view1": "VIEW",
+        "project.dataset.view2": "VIEW",
+        "project.dataset.table1": "BASE TABLE",
+    }
+    definitions = {
+        "project.dataset.view1": "SELECT * FROM dataset.view2 JOIN dataset.table1 USING (id)",
+        "project.dataset.view2": "SELECT * FROM `project.dataset.table1`",
+    }
+    mock_bq_client.get_table_type.side_effect = lambda view: table_types.get(view, "")
+    mock_bq_client.get_view_definition.side_effect = lambda view: definitions[view]
+
+    resolver = SqlParsingDependencyResolver(mock_bq_client)
+    all_views, dependency_graph = resolver.analyze_dependencies(
+        ["project.dataset.view1"], "dataset"
+    )
+
+    assert set(all_views) == set(table_types)
+    assert dependency_graph == {
+        "project.dataset.view1": ["project.dataset.view2", "project.dataset.table1"],
+        "project.dataset.view2": ["project.dataset.table1"],
+        "project.dataset.table1": [],
+    }
+    # データセット単位のカタログを読み込む
+    mock_bq_client.load_catalog.assert_called_with("dataset", project_id="project")
+
+
+def test_sql_parsing_resolver_hybrid_fallback():
+    """ビュー定義がないオブジェクトはLineage APIで補完することをテスト"""
+    mock_bq_client = MagicMock()
+    mock_bq_client.get_table_type.side_effect = lambda view: (
+        "VIEW" if view == "project.dataset.view1" else "BASE TABLE"
+    )
+    mock_bq_client.get_view_definition.return_value = "SELECT * FROM dataset.table1"
+
+    mock_lineage_client = MagicMock()
+    mock_lineage_client.get_table_dependencies.return_value = ["project.dataset.view0"]
+
+    resolver = SqlParsingDependencyResolver(
+        mock_bq_client, fallback_lineage_client=mock_lineage_client
+    )
+    _, dependency_graph = resolver.analyze_dependencies(
+        ["project.dataset.view1"], "dataset", max_depth=1
+    )
+
+    assert dependency_graph == {
+        "project.dataset.view1": ["project.dataset.table1"],
+        "project.dataset.table1": ["project.dataset.view0"],
+    }
+    # ビューに対してはLineage APIを呼び出さない
+    mock_lineage_client.get_table_dependencies.assert_called_once_with(
+        "project.dataset.table1"
+    )
@@ -0,0 +1,88 @@
+"""BigQuery/Lineage APIのエミュレーターを使ったエンドツーエンドのテスト
+
+実際のAPIクライアントを接続先の上書きでローカルのエミュレーターに向け、
+HTTP/gRPCを経由してインポートできることを確認します。
+"""
+import pytest
+from benchmarks.emulator import Emulator
+from benchmarks.synthetic import generate_dataset, to_snapshot
+from bq2dbt.converter import bigquery, lineage
+from bq2dbt.converter.importer import import_views
+from bq2dbt.utils.api_metrics import api_metrics
+
+
+@pytest.fixture
+def dataset():
+    """合成データセットのフィクスチャ"""
+    return generate_dataset(12, "diamond", column_count=3, definition_size=0)
+
+
+def _import(dataset, emulator, monkeypatch, output_dir, **kwargs):
+    """エミュレーターに接続して合成データセットのビューをインポートします。"""
+    monkeypatch.setenv(bigquery.API_ENDPOINT_ENV, emulator.bigquery_endpoint)
+    monkeypatch.setenv(lineage.API_ENDPOINT_ENV, emulator.lineage_endpoint)
+    import_views(
+        project_id=dataset.project_id,
+        dataset=dataset.dataset_id,
+        output_dir=output_dir,
+        naming_preset="full",
+        non_interactive=True,
+        include_dependencies=True,
+        on_conflict="overwrite",
+        lineage_cache_ttl=0,
+        jobs=2,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("metadata_source", ["information-schema", "api"])
+def test_import_through_emulator(
+    dataset, metadata_source, monkeypatch, temp_output_dir
+):
+    """エミュレーター経由でスキーマと依存関係を含めてインポートできることをテスト"""
+    with Emulator(to_snapshot(dataset)) as emulator:
+        _import(
+            dataset,
+            emulator,
+            monkeypatch,
+            temp_output_dir,
+            metadata_source=metadata_source,
+        )
+        stats = emulator.stats()
+
+    assert len(list(temp_output_dir.glob("*.sql"))) == 12
+    yml = (temp_output_dir / "bench_dataset__v_diamond_00003.yml").read_text()
+    assert "attributes.score" in yml
+    assert "スコア" in yml
+    referenced = set(dataset.lineage).union(*dataset.lineage.values())
+    assert stats["lineage.search_links"] == len(referenced)
+    if metadata_source == "api":
+        assert stats["bigquery.tables.list"] == 1
+    else:
+        assert stats["bigquery.jobs.insert"] == 5
+
+
+def test_bigquery_transient_errors_are_retried(dataset, monkeypatch, temp_output_dir):
+    """BigQuery APIの一時的なエラーがクライアントのリトライで回復することをテスト"""
+    with Emulator(to_snapshot(dataset), fail_every=4) as emulator:
+        _import(dataset, emulator, monkeypatch, temp_output_dir)
+        stats = emulator.stats()
+
+    assert len(list(temp_output_dir.glob("*.sql"))) == 12
+    # 5回のクエリジョブのうち4回目の呼び出しが失敗し、リトライされる
+    assert stats["bigquery.jobs.insert"] == 6
+
+
+def test_api_metrics_match_emulator(dataset, monkeypatch, temp_output_dir):
+    """クライアント側のAPI呼び出しの計測がエミュレーターの受け付けた件数と一致することをテスト"""
+    with Emulator(to_snapshot(dataset), fail_every=4) as emulator:
+        _import(dataset, emulator, monkeypatch, temp_output_dir)
+        stats = emulator.stats()
+
+    calls, query_jobs = api_metrics.summary()
+    assert {s.name: s.calls for s in calls} == stats
+    retries = {s.name: s.retries for s in calls}
+    assert retries["bigquery.jobs.insert"] == 1
+    assert retries["lineage.search_links"] > 0
+    assert query_jobs.jobs == 5
+    assert query_jobs.bytes_processed > 0
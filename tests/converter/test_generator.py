@@ -1,8 +1,9 @@
 """ModelGeneratorのテスト"""
 
+import os
 from unittest.mock import patch
 
-from bq2dbt.converter.generator import ModelGenerator
+from bq2dbt.converter.generator import ModelGenerator, WriteMode, WriteStatus
 from bq2dbt.utils.naming import NamingPreset
 
 
@@ -74,3 +75,111 @@ def test_generate_yaml_model(mock_exists, temp_output_dir, yml_template_path):
     assert "ID field" in content
     assert "Name field" in content
     assert "Test description" in content
+
+
+def test_load_template_compiles_once(temp_output_dir, sql_template_path):
+    """テンプレートがインスタンス内で一度だけコンパイルされることをテスト"""
+    generator = ModelGenerator(temp_output_dir, sql_template_path)
+
+    with patch.object(
+        generator.env, "get_template", wraps=generator.env.get_template
+    ) as mock_get_template:
+        for i in range(3):
+            generator.generate_sql_model(
+                f"test-project.test_dataset.view{i}",
+                "SELECT 1",
+                dry_run=True,
+            )
+
+    mock_get_template.assert_called_once()
+
+
+def test_template_bytecode_cache(temp_output_dir, sql_template_path):
+    """バイトコードキャッシュがディスクに保存され、出力が変わらないことをテスト"""
+    cache_dir = temp_output_dir / "jinja"
+    plain = ModelGenerator(temp_output_dir, sql_template_path)
+    cached = ModelGenerator(
+        temp_output_dir, sql_template_path, bytecode_cache_dir=cache_dir
+    )
+
+    expected, _ = plain.generate_sql_model(
+        "test-project.test_dataset.test_view", "SELECT 1", dry_run=True
+    )
+    content, _ = cached.generate_sql_model(
+        "test-project.test_dataset.test_view", "SELECT 1", dry_run=True
+    )
+
+    # タイムスタンプ行以外は同一
+    def strip_timestamp(text):
+        return [line for line in text.splitlines() if "Generated" not in line]
+
+    assert strip_timestamp(content) == strip_timestamp(expected)
+    assert any(cache_dir.iterdir())
+
+
+def test_write_mode_changed_skips_unchanged_files(
+    temp_output_dir, sql_template_path, yml_template_path
+):
+    """内容が変わらないファイルは書き込まず、更新日時を維持することをテスト"""
+    generator = ModelGenerator(
+        temp_output_dir,
+        sql_template_path,
+        yml_template_path,
+        write_mode=WriteMode.CHANGED,
+    )
+    name = "test-project.test_dataset.test_view"
+    columns = [{"name": "id", "type": "INT64", "mode": "NULLABLE"}]
+
+    _, sql_path = generator.generate_sql_model(name, "SELECT 1")
+    _, yml_path = generator.generate_yaml_model(name, columns)
+    os.utime(sql_path, (0, 0))
+    os.utime(yml_path, (0, 0))
+
+    # タイムスタンプが変わっても内容が同じなら書き込まない
+    with patch("bq2dbt.converter.generator.datetime") as mock_datetime:
+        mock_datetime.now.return_value.strftime.return_value = "2099-01-01 00:00:00"
+        generator.generate_sql_model(name, "SELECT 1")
+    generator.generate_yaml_model(name, columns)
+
+    assert sql_path.stat().st_mtime == 0
+    assert yml_path.stat().st_mtime == 0
+
+    # 内容が変わった場合は書き込む
+    generator.generate_sql_model(name, "SELECT 2")
+    assert "SELECT 2" in sql_path.read_text()
+
+    assert generator.write_counts == {
+        WriteStatus.NEW: 2,
+        WriteStatus.WRITTEN: 1,
+        WriteStatus.UNCHANGED: 2,
+    }
+
+
+def test_write_mode_changed_detects_edited_lines(temp_output_dir, sql_template_path):
+    """タイムスタンプ行以外を編集したファイルは上書きすることをテスト"""
+    generator = ModelGenerator(
+        temp_output_dir, sql_template_path, write_mode=WriteMode.CHANGED
+    )
+    name = "test-project.test_dataset.test_view"
+
+    content, sql_path = generator.generate_sql_model(name, "SELECT 1")
+    sql_path.write_text(content.replace("SELECT 1", "SELECT 1 -- edited"))
+
+    generator.generate_sql_model(name, "SELECT 1")
+
+    assert "edited" not in sql_path.read_text()
+    assert generator.write_counts[WriteStatus.WRITTEN] == 1
+    assert generator.write_counts[WriteStatus.UNCHANGED] == 0
+
+
+def test_write_mode_always_rewrites_files(temp_output_dir, sql_template_path):
+    """デフォルトでは内容が同じでも書き込むことをテスト"""
+    generator = ModelGenerator(temp_output_dir, sql_template_path)
+    name = "test-project.test_dataset.test_view"
+
+    generator.generate_sql_model(name, "SELECT 1")
+    generator.generate_sql_model(name, "SELECT 1")
+
+    assert generator.write_counts[WriteStatus.NEW] == 1
+    assert generator.write_counts[WriteStatus.WRITTEN] == 1
+    assert generator.write_counts[WriteStatus.UNCHANGED] == 0
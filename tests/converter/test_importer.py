@@ -1,19 +1,31 @@
 """converter.importerモジュールのテスト"""
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from bq2dbt.converter.bigquery import MetadataSource, ViewMetadata
+from bq2dbt.converter.dependency import CircularDependencyError
+from bq2dbt.converter.generator import ConflictPolicy, ModelGenerator, WriteStatus
 from bq2dbt.converter.importer import (
     _match_pattern,
+    _parse_selection,
     analyze_dependencies,
     check_file_exists,
-    confirm_view_import,
     convert_view,
+    convert_views,
+    fetch_view_metadata,
     fetch_views,
     filter_views,
+    import_views,
     initialize_bigquery_client,
+    prefetch_metadata,
+    resolve_conflicts,
+    stream_convert_views,
 )
+from bq2dbt.converter.snapshot import save_snapshot
 from bq2dbt.utils.naming import NamingPreset
+from bq2dbt.utils.output_index import OutputIndex
 from rich.console import Console
 
 
@@ -29,7 +41,10 @@ def test_initialize_bigquery_client():
 
         assert result is mock_bq_instance
         mock_bq_client.assert_called_once_with(
-            "test-project", location="asia-northeast1"
+            "test-project",
+            location="asia-northeast1",
+            metadata_source=MetadataSource.INFORMATION_SCHEMA,
+            client_factory=None,
         )
 
 
@@ -126,6 +141,41 @@ def test_analyze_dependencies_with_dependencies():
         mock_resolver.get_topological_order.assert_called_once()
 
 
+def test_analyze_dependencies_with_circular_dependency():
+    """循環参照がある場合は警告を出して分析順のまま変換することをテスト"""
+    console = Console()
+    logger = MagicMock()
+    mock_bq_client = MagicMock()
+
+    mock_resolver = MagicMock()
+    with patch(
+        "bq2dbt.converter.importer.DependencyResolver", return_value=mock_resolver
+    ):
+        mock_resolver.analyze_dependencies.return_value = (
+            ["test-project.test_dataset.view1", "test-project.test_dataset.view2"],
+            {},
+        )
+        mock_resolver.get_topological_order.side_effect = CircularDependencyError(
+            [
+                "test-project.test_dataset.view1",
+                "test-project.test_dataset.view2",
+                "test-project.test_dataset.view1",
+            ]
+        )
+
+        views = ["test-project.test_dataset.view1"]
+        all_views, ordered_views = analyze_dependencies(
+            views, "test_dataset", True, mock_bq_client, console, logger
+        )
+
+        assert all_views == [
+            "test-project.test_dataset.view1",
+            "test-project.test_dataset.view2",
+        ]
+        assert ordered_views == all_views
+        logger.warning.assert_called_once()
+
+
 def test_analyze_dependencies_without_dependencies():
     """依存関係分析なしのテスト"""
     console = Console()
@@ -143,18 +193,59 @@ def test_analyze_dependencies_without_dependencies():
         mock_resolver_class.assert_not_called()
 
 
+def test_prefetch_metadata():
+    """データセット単位のメタデータ一括取得のテスト"""
+    console = Console()
+    logger = MagicMock()
+    mock_bq_client = MagicMock()
+    # 2つ目のデータセットは読み込みに失敗する
+    mock_bq_client.load_catalog.side_effect = [MagicMock(), Exception("denied")]
+
+    views = [
+        "project.dataset1.view1",
+        "project.dataset1.view2",
+        "other.dataset2.view3",
+    ]
+    prefetch_metadata(views, mock_bq_client, console, logger)
+
+    # データセットごとに1回だけ呼ばれる
+    assert mock_bq_client.load_catalog.call_count == 2
+    mock_bq_client.load_catalog.assert_any_call("dataset1", project_id="project")
+    mock_bq_client.load_catalog.assert_any_call("dataset2", project_id="other")
+    # 失敗は警告として記録され、例外は送出されない
+    logger.warning.assert_called_once()
+
+
+
+def test_fetch_view_metadata_in_parallel():
+    """ビューのメタデータを並列に取得し、失敗したビューの例外を返すことをテスト"""
+    mock_bq_client = MagicMock()
+    # 2つのビューの取得が同時に進まないとタイムアウトする
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_view_metadata(view):
+        barrier.wait()
+        if view.endswith("missing"):
+            raise Exception("not found")
+        return ViewMetadata(view, "VIEW")
+
+    mock_bq_client.get_view_metadata.side_effect = get_view_metadata
+
+    metadata, errors = fetch_view_metadata(
+        ["p.d.view1", "p.d.missing"], mock_bq_client, jobs=2
+    )
+
+    assert list(metadata) == ["p.d.view1"]
+    assert metadata["p.d.view1"].table_type == "VIEW"
+    assert str(errors["p.d.missing"]) == "not found"
+
 def test_check_file_exists():
     """ファイル存在確認のテスト"""
     view = "test-project.test_dataset.view1"
     naming_preset = NamingPreset.FULL
     output_path = Path("/tmp/output")
 
-    with patch(
-        "bq2dbt.converter.importer.Path.exists", side_effect=[True, False]
-    ), patch(
-        "bq2dbt.converter.importer.generate_model_name",
-        return_value="test_dataset__view1",
-    ):
+    with patch("bq2dbt.converter.importer.Path.exists", side_effect=[True, False]):
         sql_exists, yml_exists, sql_path, yml_path = check_file_exists(
             view, naming_preset, output_path
         )
@@ -165,19 +256,89 @@ def test_check_file_exists():
         assert str(yml_path).endswith("test_dataset__view1.yml")
 
 
-def test_confirm_view_import_non_interactive():
-    """非インタラクティブモードでのインポート確認テスト"""
-    view = "test-project.test_dataset.view1"
-    files_exist = True
-    existing_files = ["SQL: test_dataset__view1.sql"]
-    non_interactive = True
+def test_check_file_exists_uses_output_index(temp_output_dir):
+    """出力ディレクトリの索引とYAMLの接頭辞を使ってファイルを確認することをテスト"""
+    (temp_output_dir / "test_dataset__view1.sql").touch()
+    (temp_output_dir / "_test_dataset__view1.yml").touch()
+    output_index = OutputIndex(temp_output_dir)
 
-    import_this_view, overwrite = confirm_view_import(
-        view, files_exist, existing_files, non_interactive
+    with patch("bq2dbt.converter.importer.Path.exists") as mock_exists:
+        sql_exists, yml_exists, _, yml_path = check_file_exists(
+            "test-project.test_dataset.view1",
+            NamingPreset.FULL,
+            temp_output_dir,
+            yml_prefix="_",
+            output_index=output_index,
+        )
+
+    assert sql_exists is True
+    assert yml_exists is True
+    assert yml_path.name == "_test_dataset__view1.yml"
+    # ビューごとのファイルシステムの確認は行わない
+    mock_exists.assert_not_called()
+
+
+def test_resolve_conflicts_non_interactive():
+    """非インタラクティブモードでは既存ファイルを確認せずに上書きすることをテスト"""
+    conflicts = {"test-project.test_dataset.view1": ["SQL: test_dataset__view1.sql"]}
+
+    with patch("bq2dbt.converter.importer.Prompt.ask") as mock_ask:
+        skipped, policy = resolve_conflicts(
+            conflicts, ConflictPolicy.ASK, True, Console()
+        )
+
+    assert skipped == {}
+    assert policy == ConflictPolicy.OVERWRITE
+    mock_ask.assert_not_called()
+
+
+def test_resolve_conflicts_bulk_policies():
+    """skip/changedの一括指定をテスト"""
+    conflicts = {
+        "test-project.test_dataset.view1": ["SQL: test_dataset__view1.sql"],
+        "test-project.test_dataset.view2": ["YAML: test_dataset__view2.yml"],
+    }
+
+    skipped, policy = resolve_conflicts(
+        conflicts, ConflictPolicy.SKIP, False, Console()
     )
+    assert list(skipped) == list(conflicts)
+    assert policy == ConflictPolicy.SKIP
+
+    skipped, policy = resolve_conflicts(
+        conflicts, ConflictPolicy.CHANGED, False, Console()
+    )
+    assert skipped == {}
+    assert policy == ConflictPolicy.CHANGED
 
-    assert import_this_view is True
-    assert overwrite is True
+
+def test_resolve_conflicts_asks_once_for_all_views():
+    """askでは全ビューの扱いを1回の確認でまとめて選択することをテスト"""
+    views = [f"test-project.test_dataset.view{i}" for i in range(1, 4)]
+    conflicts = {view: ["SQL: file.sql"] for view in views}
+
+    with patch(
+        "bq2dbt.converter.importer.Prompt.ask", side_effect=["select", "1,3"]
+    ) as mock_ask:
+        skipped, policy = resolve_conflicts(
+            conflicts, ConflictPolicy.ASK, False, Console()
+        )
+
+    # 一括の扱いと個別の選択の2回のみ尋ねる
+    assert mock_ask.call_count == 2
+    assert skipped == {views[1]: "ユーザーによりスキップ"}
+    assert policy == ConflictPolicy.OVERWRITE
+
+
+def test_parse_selection():
+    """番号の指定の解析をテスト"""
+    assert _parse_selection("1,3-4", 5) == [0, 2, 3]
+    assert _parse_selection("all", 3) == [0, 1, 2]
+    assert _parse_selection("none", 3) == []
+    with pytest.raises(ValueError):
+        _parse_selection("0", 3)
+    with pytest.raises(ValueError):
+        _parse_selection("a", 3)
 
 
 def test_convert_view():
@@ -185,11 +346,13 @@ def test_convert_view():
     view = "test-project.test_dataset.view1"
     mock_bq_client = MagicMock()
     # テーブルタイプをVIEWに設定
-    mock_bq_client.get_table_type.return_value = "VIEW"
-    mock_bq_client.get_view_definition.return_value = "SELECT * FROM table"
-    mock_bq_client.get_view_schema.return_value = [
-        {"name": "column1", "type": "STRING"}
-    ]
+    mock_bq_client.get_view_metadata.return_value = ViewMetadata(
+        view,
+        "VIEW",
+        view_query="SELECT * FROM table",
+        schema=({"name": "column1", "type": "STRING"},),
+        description="ビューの説明",
+    )
 
     mock_generator = MagicMock()
     mock_generator.generate_sql_model.return_value = (
@@ -211,11 +374,46 @@ def test_convert_view():
     )
 
     assert result == (view, Path("/tmp/model.sql"), Path("/tmp/model.yml"))
-    mock_bq_client.get_table_type.assert_called_once_with(view)
-    mock_bq_client.get_view_definition.assert_called_once_with(view)
-    mock_bq_client.get_view_schema.assert_called_once_with(view)
-    mock_generator.generate_sql_model.assert_called_once()
-    mock_generator.generate_yaml_model.assert_called_once()
+    # メタデータは1回の呼び出しで取得する
+    mock_bq_client.get_view_metadata.assert_called_once_with(view)
+    mock_bq_client.get_table_type.assert_not_called()
+    mock_bq_client.get_view_definition.assert_not_called()
+    mock_bq_client.get_view_schema.assert_not_called()
+    mock_generator.generate_sql_model.assert_called_once_with(
+        view, "SELECT * FROM table", naming_preset_enum, dry_run
+    )
+    # ビューの説明がモデルの説明になる
+    mock_generator.generate_yaml_model.assert_called_once_with(
+        view,
+        [{"name": "column1", "type": "STRING"}],
+        "ビューの説明",
+        naming_preset_enum,
+        dry_run,
+        None,
+    )
+
+
+def test_convert_view_reuses_fetched_metadata():
+    """取得済みのメタデータを渡した場合は再取得しないことをテスト"""
+    view = "test-project.test_dataset.view1"
+    mock_bq_client = MagicMock()
+    mock_generator = MagicMock()
+    mock_generator.generate_sql_model.return_value = ("sql", Path("/tmp/model.sql"))
+    mock_generator.generate_yaml_model.return_value = ("yml", Path("/tmp/model.yml"))
+    metadata = ViewMetadata(view, "VIEW", view_query="SELECT 1")
+
+    convert_view(
+        view,
+        mock_bq_client,
+        mock_generator,
+        NamingPreset.FULL,
+        False,
+        False,
+        MagicMock(),
+        metadata=metadata,
+    )
+
+    mock_bq_client.get_view_metadata.assert_not_called()
 
 
 def test_convert_view_not_a_view():
@@ -223,7 +421,7 @@ def test_convert_view_not_a_view():
     view = "test-project.test_dataset.table1"
     mock_bq_client = MagicMock()
     # テーブルタイプをTABLEに設定
-    mock_bq_client.get_table_type.return_value = "TABLE"
+    mock_bq_client.get_view_metadata.return_value = ViewMetadata(view, "TABLE")
 
     # モックジェネレーターを作成
     mock_generator = MagicMock()
@@ -246,8 +444,47 @@ def test_convert_view_not_a_view():
         )
 
     assert "オブジェクトはビューではありません" in str(excinfo.value)
-    mock_bq_client.get_table_type.assert_called_once_with(view)
-    mock_bq_client.get_view_definition.assert_not_called()
+    mock_bq_client.get_view_metadata.assert_called_once_with(view)
+    mock_generator.generate_sql_model.assert_not_called()
+
+
+def test_convert_views_parallel_keeps_order():
+    """並列変換でも入力順に結果が返り、エラーが報告されることをテスト"""
+    views = [f"test-project.test_dataset.view{i}" for i in range(6)]
+    mock_bq_client = MagicMock()
+    mock_bq_client.get_view_metadata.side_effect = lambda view: ViewMetadata(
+        view, "VIEW", view_query="SELECT 1"
+    )
+
+    def generate_sql_model(view, *args, **kwargs):
+        if view.endswith("view3"):
+            raise RuntimeError("render failed")
+        return "sql", Path(f"/tmp/{view}.sql")
+
+    mock_generator = MagicMock()
+    mock_generator.generate_sql_model.side_effect = generate_sql_model
+    mock_generator.generate_yaml_model.side_effect = lambda view, *a, **k: (
+        "yml",
+        Path(f"/tmp/{view}.yml"),
+    )
+    logger = MagicMock()
+
+    converted, failed = convert_views(
+        views,
+        mock_bq_client,
+        mock_generator,
+        NamingPreset.FULL,
+        False,
+        False,
+        logger,
+        jobs=4,
+    )
+
+    assert [view for view, _, _ in converted] == [
+        view for view in views if not view.endswith("view3")
+    ]
+    assert list(failed) == ["test-project.test_dataset.view3"]
+    assert "render failed" in failed["test-project.test_dataset.view3"]
 
 
 def test_match_pattern():
@@ -525,3 +762,111 @@ def test_filter_views_fqn_include_and_exclude():
         "project1.dataset1.view2",
         "project2.sample_dataset_foo.sample_view_01",
     ]
+
+
+def test_stream_convert_views_writes_models(temp_output_dir):
+    """ストリーミング変換でビューのみが書き込まれ、入力順で結果が返ることをテスト"""
+    views = [f"test-project.test_dataset.view{i}" for i in range(4)]
+    mock_bq_client = MagicMock()
+
+    def get_view_metadata(view):
+        if view.endswith("view2"):
+            return ViewMetadata(view, "BASE TABLE")
+        if view.endswith("view3"):
+            # get_view_metadata は tables.get の失敗をValueErrorとして送出する
+            raise ValueError(f"メタデータを取得できません: {view} - 503")
+        return ViewMetadata(
+            view,
+            "VIEW",
+            view_query="SELECT 1 AS id",
+            schema=({"name": "id", "type": "INT64", "description": "", "mode": ""},),
+        )
+
+    mock_bq_client.get_view_metadata.side_effect = get_view_metadata
+    generator = ModelGenerator(temp_output_dir)
+
+    converted, skipped = stream_convert_views(
+        iter(views),
+        mock_bq_client,
+        generator,
+        NamingPreset.FULL,
+        False,
+        MagicMock(),
+        jobs=2,
+    )
+
+    assert [view for view, _, _ in converted] == views[:2]
+    assert "ビューではありません" in skipped["test-project.test_dataset.view2"]
+    # メタデータの取得の失敗はスキップではなくエラーとして報告する
+    assert skipped["test-project.test_dataset.view3"].startswith("エラー:")
+    for _, sql_path, yml_path in converted:
+        assert "SELECT 1 AS id" in sql_path.read_text()
+        assert yml_path.exists()
+    assert generator.write_counts[WriteStatus.NEW] == 4
+
+
+def test_import_views_skips_existing_files(temp_output_dir, sample_snapshot):
+    """--on-conflict skipで既存ファイルがあるビューを変換しないことをテスト"""
+    snapshot_path = temp_output_dir / "snapshot.json.gz"
+    save_snapshot(sample_snapshot, snapshot_path)
+    output_dir = temp_output_dir / "models"
+    output_dir.mkdir()
+    (output_dir / "view1.sql").write_text("existing")
+
+    import_views(
+        None,
+        None,
+        output_dir,
+        "table_only",
+        from_snapshot=snapshot_path,
+        on_conflict="skip",
+    )
+
+    assert (output_dir / "view1.sql").read_text() == "existing"
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "view1.sql",
+        "view2.sql",
+        "view2.yml",
+    ]
+
+
+def test_import_views_resume_from_checkpoint(
+    temp_output_dir, checkpoint_dir, sample_snapshot
+):
+    """中断したインポートを完了済みのビューを除いて再開できることをテスト"""
+    snapshot_path = temp_output_dir / "snapshot.json.gz"
+    save_snapshot(sample_snapshot, snapshot_path)
+    output_dir = temp_output_dir / "models"
+    output_dir.mkdir()
+    # view2.sqlをディレクトリにして書き込みを失敗させる
+    (output_dir / "view2.sql").mkdir()
+
+    import_views(
+        None,
+        None,
+        output_dir,
+        "table_only",
+        non_interactive=True,
+        from_snapshot=snapshot_path,
+    )
+
+    assert (output_dir / "view1.sql").exists()
+    assert len(list(checkpoint_dir.iterdir())) == 1
+    (output_dir / "view1.sql").write_text("converted before the interruption")
+    (output_dir / "view2.sql").rmdir()
+
+    import_views(
+        None,
+        None,
+        output_dir,
+        "table_only",
+        non_interactive=True,
+        from_snapshot=snapshot_path,
+        resume=True,
+    )
+
+    # 完了済みのview1は変換し直さない
+    assert (output_dir / "view1.sql").read_text() == "converted before the interruption"
+    assert (output_dir / "view2.sql").exists()
+    # 全てのビューを変換するとチェックポイントは削除される
+    assert list(checkpoint_dir.iterdir()) == []
@@ -0,0 +1,58 @@
+"""converter.pipelineモジュールのテスト"""
+import threading
+
+import pytest
+from bq2dbt.converter.pipeline import Stage, run_pipeline
+
+
+def test_run_pipeline_passes_items_through_stages():
+    """各段階の結果が次の段階に渡され、エラーは以降の段階を飛ばすことをテスト"""
+
+    def parse(value):
+        if value == "x":
+            raise ValueError("not a number")
+        return int(value)
+
+    stages = [Stage("parse", parse, workers=3), Stage("double", lambda v: v * 2)]
+    results = sorted(run_pipeline(["1", "x", "3"], stages), key=lambda r: r.index)
+
+    assert [r.value for r in results if r.error is None] == [2, 6]
+    assert results[1].item == "x"
+    assert isinstance(results[1].error, ValueError)
+    assert results[1].stage == "parse"
+
+
+def test_run_pipeline_streams_with_bounded_queues():
+    """入力を全て読み込む前に最初の結果が返されることをテスト"""
+    produced = []
+
+    def source():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    results = run_pipeline(source(), [Stage("identity", lambda v: v)], queue_size=2)
+    first = next(results)
+
+    assert first.value == 0
+    # キューのサイズを超えて先読みしない
+    assert len(produced) < 10
+
+    # 途中で終了してもスレッドが残らない
+    results.close()
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+
+
+def test_run_pipeline_reraises_source_error():
+    """入力のイテレーターの例外が処理済みの結果の後に送出されることをテスト"""
+
+    def source():
+        yield 1
+        raise RuntimeError("listing failed")
+
+    collected = []
+    with pytest.raises(RuntimeError, match="listing failed"):
+        for result in run_pipeline(source(), [Stage("identity", lambda v: v)]):
+            collected.append(result.value)
+
+    assert collected == [1]
@@ -0,0 +1,152 @@
+"""converter.planモジュールのテスト"""
+from unittest.mock import patch
+
+import pytest
+from bq2dbt.converter.bigquery import ViewMetadata
+from bq2dbt.converter.importer import apply_import_plan, plan_import
+from bq2dbt.converter.plan import (
+    ImportPlan,
+    PlannedView,
+    load_plan,
+    metadata_fingerprint,
+    save_plan,
+    select_shard,
+)
+
+
+def _metadata(view, query="SELECT 1"):
+    """テスト用のビューのメタデータを作成します。"""
+    return ViewMetadata(
+        view,
+        "VIEW",
+        view_query=query,
+        schema=({"name": "id", "type": "INT64", "description": "", "mode": ""},),
+    )
+
+
+def test_save_and_load_plan(temp_output_dir):
+    """計画の保存と読み込みをテスト"""
+    path = temp_output_dir / "plan.json"
+    plan = ImportPlan(
+        project_id="test-project",
+        location="asia-northeast1",
+        metadata_source="information-schema",
+        output_dir="models",
+        naming_preset="full",
+        yml_prefix="_",
+        views=[
+            PlannedView(
+                "test-project.test_dataset.view1",
+                "test_dataset__view1.sql",
+                "_test_dataset__view1.yml",
+                "abc",
+            )
+        ],
+        skipped={"test-project.test_dataset.table1": "ビューではありません"},
+    )
+
+    save_plan(plan, path)
+
+    assert load_plan(path) == plan
+
+
+def test_load_plan_rejects_invalid_file(temp_output_dir):
+    """計画ではないファイルを読み込むとエラーになることをテスト"""
+    path = temp_output_dir / "plan.json"
+    path.write_text('{"format": "other"}')
+
+    with pytest.raises(ValueError):
+        load_plan(path)
+
+
+def test_metadata_fingerprint_tracks_definition():
+    """フィンガープリントがビュー定義の変更で変わることをテスト"""
+    view = "test-project.test_dataset.view1"
+
+    assert metadata_fingerprint(_metadata(view)) == metadata_fingerprint(
+        _metadata(view)
+    )
+    assert metadata_fingerprint(_metadata(view)) != metadata_fingerprint(
+        _metadata(view, "SELECT 2")
+    )
+
+
+def test_select_shard():
+    """計画のビューの分割をテスト"""
+    views = [PlannedView(f"view{i}", "", "", "") for i in range(5)]
+
+    shards = [select_shard(views, index, 2) for index in (1, 2)]
+
+    assert [v.view for v in shards[0]] == ["view0", "view2", "view4"]
+    assert [v.view for v in shards[1]] == ["view1", "view3"]
+    with pytest.raises(ValueError):
+        select_shard(views, 3, 2)
+
+
+@patch("bq2dbt.converter.importer.BigQueryClient")
+def test_plan_and_apply(mock_bq_client, temp_output_dir):
+    """計画の作成と、依存関係を解決し直さない分割実行をテスト"""
+    views = [f"test-project.test_dataset.view{i}" for i in range(1, 4)]
+    mock_bq_instance = mock_bq_client.return_value
+    mock_bq_instance.list_views.return_value = views
+    mock_bq_instance.get_view_metadata.side_effect = _metadata
+    plan_file = temp_output_dir / "plan.json"
+    output_dir = temp_output_dir / "models"
+
+    plan = plan_import(
+        "test-project",
+        "test_dataset",
+        output_dir,
+        plan_file,
+        "table_only",
+        non_interactive=True,
+    )
+
+    assert [planned.view for planned in plan.views] == views
+    assert plan.views[0].sql_file == "view1.sql"
+
+    mock_bq_instance.reset_mock()
+    apply_import_plan(plan_file, shard=(1, 2))
+
+    # ビュー一覧は取得し直さない
+    mock_bq_instance.list_views.assert_not_called()
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "view1.sql",
+        "view1.yml",
+        "view3.sql",
+        "view3.yml",
+    ]
+
+
+@patch("bq2dbt.converter.importer.BigQueryClient")
+def test_apply_skips_views_with_mismatched_files(mock_bq_client, temp_output_dir):
+    """出力ファイル名が計画と一致しないビューは書き込まないことをテスト"""
+    views = [f"test-project.test_dataset.view{i}" for i in range(1, 3)]
+    mock_bq_instance = mock_bq_client.return_value
+    mock_bq_instance.list_views.return_value = views
+    mock_bq_instance.get_view_metadata.side_effect = _metadata
+    plan_file = temp_output_dir / "plan.json"
+    output_dir = temp_output_dir / "models"
+
+    plan = plan_import(
+        "test-project",
+        "test_dataset",
+        output_dir,
+        plan_file,
+        "table_only",
+        non_interactive=True,
+    )
+    plan.views[0].sql_file = "renamed.sql"
+    save_plan(plan, plan_file)
+
+    mock_bq_instance.reset_mock()
+    apply_import_plan(plan_file)
+
+    # 一致しないビューはメタデータも取得しない
+    calls = mock_bq_instance.get_view_metadata.call_args_list
+    fetched = [call.args[0] for call in calls]
+    assert views[0] not in fetched
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "view2.sql",
+        "view2.yml",
+    ]
@@ -0,0 +1,135 @@
+"""converter.snapshotモジュールのテスト"""
+from unittest.mock import patch
+
+import pytest
+from bq2dbt.converter.importer import import_views, snapshot_dataset
+from bq2dbt.converter.snapshot import (
+    SnapshotBigQueryClient,
+    SnapshotLineageClient,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+def test_save_and_load_snapshot(temp_output_dir, sample_snapshot):
+    """スナップショットの保存と読み込みをテスト"""
+    path = temp_output_dir / "snapshot.json.gz"
+    snapshot = sample_snapshot
+
+    save_snapshot(snapshot, path)
+
+    assert load_snapshot(path) == snapshot
+
+
+def test_load_snapshot_rejects_invalid_file(temp_output_dir):
+    """スナップショットではないファイルを読み込むとエラーになることをテスト"""
+    path = temp_output_dir / "invalid.json.gz"
+    path.write_text("not a snapshot")
+
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+
+def test_snapshot_clients_do_not_use_network(sample_snapshot):
+    """スナップショットのクライアントがAPIに接続せずに結果を返すことをテスト"""
+    snapshot = sample_snapshot
+
+    with patch("google.cloud.bigquery.Client") as mock_bq_client, patch(
+        "google.cloud.datacatalog_lineage_v1.LineageClient"
+    ) as mock_lineage_client:
+        bq_client = SnapshotBigQueryClient(snapshot)
+        lineage_client = SnapshotLineageClient(snapshot)
+
+        assert bq_client.list_views("test_dataset", exclude_patterns=["view2"]) == [
+            "test-project.test_dataset.view1"
+        ]
+        assert bq_client.get_table_type("test-project.test_dataset.table1") == (
+            "BASE TABLE"
+        )
+        assert "view2" in bq_client.get_view_definition(
+            "test-project.test_dataset.view1"
+        )
+        assert bq_client.get_view_schema("test-project.test_dataset.view1")[0][
+            "name"
+        ] == ("id")
+        # スナップショットにないデータセットは空のデータセットとして扱う
+        assert bq_client.get_table_type("other-project.other.table") == ""
+        assert lineage_client.get_table_dependencies(
+            "test-project.test_dataset.view1"
+        ) == ["test-project.test_dataset.view2"]
+
+    mock_bq_client.assert_not_called()
+    mock_lineage_client.assert_not_called()
+
+
+def test_import_views_from_snapshot(temp_output_dir, sample_snapshot):
+    """スナップショットからネットワークに接続せずにインポートできることをテスト"""
+    snapshot_path = temp_output_dir / "snapshot.json.gz"
+    save_snapshot(sample_snapshot, snapshot_path)
+    output_dir = temp_output_dir / "models"
+
+    with patch("google.cloud.bigquery.Client") as mock_bq_client, patch(
+        "google.cloud.datacatalog_lineage_v1.LineageClient"
+    ) as mock_lineage_client:
+        import_views(
+            None,
+            None,
+            output_dir,
+            "table_only",
+            non_interactive=True,
+            include_dependencies=True,
+            from_snapshot=snapshot_path,
+        )
+
+    mock_bq_client.assert_not_called()
+    mock_lineage_client.assert_not_called()
+    # テーブル（table1）は変換されない
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "view1.sql",
+        "view1.yml",
+        "view2.sql",
+        "view2.yml",
+    ]
+
+
+def test_import_views_from_snapshot_rejects_other_dataset(
+    temp_output_dir, sample_snapshot
+):
+    """スナップショットと異なるデータセットを指定するとエラーになることをテスト"""
+    snapshot_path = temp_output_dir / "snapshot.json.gz"
+    save_snapshot(sample_snapshot, snapshot_path)
+
+    with pytest.raises(ValueError):
+        import_views(
+            "test-project",
+            "other_dataset",
+            temp_output_dir,
+            "full",
+            from_snapshot=snapshot_path,
+        )
+
+
+def test_snapshot_dataset(temp_output_dir, sample_snapshot):
+    """データセットのメタデータと依存関係がスナップショットに保存されることをテスト"""
+    source = sample_snapshot
+    output_file = temp_output_dir / "snapshot.json.gz"
+
+    # スナップショットのクライアントをBigQueryの代わりに使用し、SQL解析で依存関係を取得する
+    with patch(
+        "bq2dbt.converter.importer.BigQueryClient",
+        side_effect=lambda *args, **kwargs: SnapshotBigQueryClient(source),
+    ):
+        snapshot = snapshot_dataset(
+            "test-project",
+            "test_dataset",
+            output_file,
+            include_dependencies=True,
+            dependency_backend="sql",
+        )
+
+    loaded = load_snapshot(output_file)
+    assert loaded == snapshot
+    assert loaded.views == ["view1", "view2"]
+    assert loaded.lineage == source.lineage
+    assert loaded.catalogs == source.catalogs
+    assert loaded.max_depth == 3
@@ -0,0 +1,80 @@
+"""sql_parserモジュールのテスト"""
+from bq2dbt.converter.sql_parser import extract_table_references
+
+
+def test_extract_table_references_name_formats():
+    """さまざまな形式のテーブル名を抽出できることをテスト"""
+    sql = """
+        SELECT *
+        FROM `proj-a.sales.orders` AS o
+        JOIN `proj-b`.mart.customers c ON c.id = o.customer_id
+        LEFT JOIN my-project.raw.events ev USING (id)
+        JOIN sales.order_items i ON i.order_id = o.id
+    """
+
+    assert extract_table_references(sql, "default-project") == [
+        "proj-a.sales.orders",
+        "proj-b.mart.customers",
+        "my-project.raw.events",
+        "default-project.sales.order_items",
+    ]
+
+
+def test_extract_table_references_ignores_ctes_and_comments():
+    """CTE名、コメント、文字列中の参照を無視することをテスト"""
+    sql = """
+        -- FROM commented.line_comment
+        # FROM commented.hash_comment
+        WITH recent AS (
+          SELECT * FROM ds.orders /* JOIN commented.block */
+          WHERE note != 'FROM strings.ignored'
+        ),
+        totals AS (SELECT id FROM ds.order_items)
+        SELECT * FROM recent JOIN totals USING (id)
+    """
+
+    assert extract_table_references(sql, "p") == ["p.ds.orders", "p.ds.order_items"]
+
+
+def test_extract_table_references_ignores_non_table_sources():
+    """UNNEST、相関参照、ワイルドカード、INFORMATION_SCHEMAを除外することをテスト"""
+    sql = """
+        SELECT EXTRACT(DAY FROM o.created_at) AS day, tag
+        FROM ds.orders o
+        CROSS JOIN UNNEST(o.tags) AS tag, o.items AS item
+        , `p.ds.shards_*` s
+        , p.ds.INFORMATION_SCHEMA.TABLES
+        WHERE o.id IN (SELECT id FROM `p.other.allowed`)
+    """
+
+    assert extract_table_references(sql, "p") == ["p.ds.orders", "p.other.allowed"]
+
+
+def test_extract_table_references_deduplicates():
+    """同じ参照は一度だけ返すことをテスト"""
+    sql = "SELECT * FROM ds.t a UNION ALL SELECT * FROM `p.ds.t` b"
+
+    assert extract_table_references(sql, "p") == ["p.ds.t"]
+
+
+def test_extract_table_references_alias_matching_dataset():
+    """データセット名と同じエイリアスがあっても参照を落とさないことをテスト"""
+    sql = "SELECT * FROM sales.orders sales JOIN sales.items i USING(id)"
+
+    assert extract_table_references(sql, "p") == ["p.sales.orders", "p.sales.items"]
+
+
+def test_extract_table_references_comma_join_after_condition():
+    """結合条件の後に続くカンマ区切りの結合を抽出することをテスト"""
+    sql = """
+        SELECT *
+        FROM ds.t1 a LEFT JOIN ds.t2 b ON a.id = b.id, ds.t3
+        JOIN ds.t4 d USING (id), a.items AS item
+    """
+
+    assert extract_table_references(sql, "p") == [
+        "p.ds.t1",
+        "p.ds.t2",
+        "p.ds.t3",
+        "p.ds.t4",
+    ]
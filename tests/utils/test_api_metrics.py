@@ -0,0 +1,94 @@
+"""utils.api_metricsモジュールのテスト"""
+from datetime import timedelta
+from types import SimpleNamespace
+
+from bq2dbt.utils.api_metrics import ApiMetrics, format_bytes
+
+
+def _response(method, url, status_code=200, milliseconds=30):
+    """requests.Response と同じ属性を持つ値を作成します。"""
+    return SimpleNamespace(
+        request=SimpleNamespace(method=method, path_url=url),
+        status_code=status_code,
+        elapsed=timedelta(milliseconds=milliseconds),
+    )
+
+
+def test_record_call_histogram():
+    """回数、エラー、レイテンシのヒストグラムとパーセンタイルの集計をテスト"""
+    target = ApiMetrics()
+    for milliseconds in range(1, 21):
+        target.record_call("bigquery.tables.get", milliseconds / 100)
+    target.record_call("bigquery.tables.get", error=True)
+
+    calls, _ = target.summary()
+
+    assert len(calls) == 1
+    stats = calls[0]
+    assert stats.calls == 21
+    assert stats.errors == 1
+    # 0.01-0.2秒の20件（≤0.01: 1件, ≤0.025: 1件, ≤0.05: 3件, ≤0.1: 5件, ≤0.25: 10件）
+    assert stats.histogram[:5] == [1, 1, 3, 5, 10]
+    assert sum(stats.histogram) == 20
+    assert stats.percentile(50) == 0.1
+    assert stats.percentile(95) == 0.25
+    assert stats.max == 0.2
+
+
+def test_record_http_response():
+    """BigQuery REST APIの応答をAPIごとに分類し、一時的なエラーをリトライとして数えることをテスト"""
+    target = ApiMetrics()
+    base = "/bigquery/v2/projects/p"
+    target.record_http_response(_response("POST", f"{base}/jobs?prettyPrint=false"))
+    target.record_http_response(_response("GET", f"{base}/queries/job_1", 503))
+    target.record_http_response(_response("GET", f"{base}/queries/job_1?pageToken=x"))
+    target.record_http_response(_response("GET", f"{base}/datasets/d/tables"))
+    target.record_http_response(_response("GET", f"{base}/datasets/d/tables/v", 404))
+
+    calls = {stats.name: stats for stats in target.summary()[0]}
+
+    assert {name: stats.calls for name, stats in calls.items()} == {
+        "bigquery.jobs.getQueryResults": 2,
+        "bigquery.jobs.insert": 1,
+        "bigquery.tables.get": 1,
+        "bigquery.tables.list": 1,
+    }
+    assert calls["bigquery.jobs.getQueryResults"].errors == 1
+    assert calls["bigquery.jobs.getQueryResults"].retries == 1
+    # 404はリトライされないエラー
+    assert calls["bigquery.tables.get"].errors == 1
+    assert calls["bigquery.tables.get"].retries == 0
+
+
+def test_record_query_job():
+    """クエリジョブの処理バイト数、課金バイト数、スロット時間の集計をテスト"""
+    target = ApiMetrics()
+    target.record_query_job(
+        SimpleNamespace(
+            total_bytes_processed=1024,
+            total_bytes_billed=10 * 1024 * 1024,
+            slot_millis=1500,
+            cache_hit=False,
+        )
+    )
+    # キャッシュヒット時は統計の一部が返されない
+    target.record_query_job(
+        SimpleNamespace(
+            total_bytes_processed=0,
+            total_bytes_billed=None,
+            slot_millis=None,
+            cache_hit=True,
+        )
+    )
+
+    _, query_jobs = target.summary()
+
+    assert query_jobs.jobs == 2
+    assert query_jobs.bytes_processed == 1024
+    assert query_jobs.bytes_billed == 10 * 1024 * 1024
+    assert query_jobs.slot_millis == 1500
+    assert query_jobs.cache_hits == 1
+    assert format_bytes(query_jobs.bytes_billed) == "10.0MiB"
+
+    target.reset()
+    assert target.summary() == ([], type(query_jobs)())
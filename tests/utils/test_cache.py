@@ -0,0 +1,42 @@
+"""LineageCacheのテスト"""
+from unittest.mock import patch
+
+from bq2dbt.utils.cache import LineageCache
+
+
+def test_lineage_cache_roundtrip(temp_output_dir):
+    """保存した依存関係が取得できることをテスト"""
+    cache = LineageCache(temp_output_dir / "lineage.sqlite3")
+    fqn = "bigquery:project.dataset.view1"
+
+    assert cache.get(fqn, "asia-northeast1") is None
+
+    cache.set(fqn, "asia-northeast1", ["project.dataset.table1"])
+    assert cache.get(fqn, "asia-northeast1") == ["project.dataset.table1"]
+    # ロケーションもキーに含まれる
+    assert cache.get(fqn, "us") is None
+    cache.close()
+
+    # 別の接続からも読み出せる（永続化されている）
+    cache = LineageCache(temp_output_dir / "lineage.sqlite3")
+    assert cache.get(fqn, "asia-northeast1") == ["project.dataset.table1"]
+    cache.close()
+
+
+def test_lineage_cache_ttl_and_purge(temp_output_dir):
+    """TTLを過ぎたエントリが無視され、purgeで削除されることをテスト"""
+    cache = LineageCache(temp_output_dir / "lineage.sqlite3", ttl=60)
+
+    with patch("bq2dbt.utils.cache.time.time", return_value=1000.0):
+        cache.set("bigquery:p.d.old", "us", [])
+    with patch("bq2dbt.utils.cache.time.time", return_value=1050.0):
+        cache.set("bigquery:p.d.new", "us", ["p.d.t"])
+
+    with patch("bq2dbt.utils.cache.time.time", return_value=1070.0):
+        assert cache.get("bigquery:p.d.old", "us") is None
+        assert cache.get("bigquery:p.d.new", "us") == ["p.d.t"]
+        assert cache.purge(expired_only=True) == 1
+
+    assert cache.purge() == 1
+    assert cache.get("bigquery:p.d.new", "us") is None
+    cache.close()
@@ -0,0 +1,39 @@
+"""utils.checkpointモジュールのテスト"""
+from bq2dbt.utils.checkpoint import ImportCheckpoint
+
+
+def test_checkpoint_records_progress(temp_output_dir):
+    """チェックポイントの記録と読み込みをテスト"""
+    checkpoint = ImportCheckpoint.for_run({"dataset": "a"}, temp_output_dir)
+    checkpoint.start(["view1", "view2", "view3"], {"view1": ["view2"]})
+    checkpoint.record_completed("view1")
+    checkpoint.record_failed("view2", "エラー: quota")
+    checkpoint.close()
+    # 書き込み途中で終了した行は読み込み時に切り詰められる
+    with open(checkpoint.path, "a") as f:
+        f.write('{"type": "completed", "vi')
+
+    loaded = ImportCheckpoint.for_run({"dataset": "a"}, temp_output_dir)
+
+    assert loaded.path == checkpoint.path
+    assert loaded.load() is True
+    assert loaded.dependency_graph == {"view1": ["view2"]}
+    assert loaded.failed == {"view2": "エラー: quota"}
+    # 失敗したビューは再開時に変換し直す
+    assert loaded.remaining() == ["view2", "view3"]
+
+    # 再開後の追記は切り詰めた行に連結されない
+    loaded.record_completed("view2")
+    loaded.close()
+    resumed = ImportCheckpoint(checkpoint.path)
+    assert resumed.load() is True
+    assert resumed.remaining() == ["view3"]
+
+
+def test_checkpoint_key_depends_on_options(temp_output_dir):
+    """条件が異なるインポートは別のチェックポイントを使うことをテスト"""
+    first = ImportCheckpoint.for_run({"dataset": "a"}, temp_output_dir)
+    second = ImportCheckpoint.for_run({"dataset": "b"}, temp_output_dir)
+
+    assert first.path != second.path
+    assert first.load() is False
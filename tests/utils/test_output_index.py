@@ -0,0 +1,28 @@
+"""utils.output_indexモジュールのテスト"""
+from bq2dbt.utils.output_index import OutputIndex
+
+
+def test_output_index_answers_from_memory(temp_output_dir):
+    """走査結果と追加したファイルから存在を判定することをテスト"""
+    (temp_output_dir / "model_a.sql").touch()
+    output_index = OutputIndex(temp_output_dir)
+
+    assert len(output_index) == 1
+    assert output_index.exists(temp_output_dir / "model_a.sql")
+    assert not output_index.exists(temp_output_dir / "model_b.sql")
+
+    # 走査後に作成されたファイルは add するまで索引に含まれない
+    (temp_output_dir / "model_b.sql").touch()
+    assert not output_index.exists(temp_output_dir / "model_b.sql")
+    output_index.add("model_b.sql")
+    assert output_index.exists(temp_output_dir / "model_b.sql")
+
+
+def test_output_index_claim_detects_conflicts(temp_output_dir):
+    """同じファイル名に出力する別のビューを検出することをテスト"""
+    output_index = OutputIndex(temp_output_dir / "missing")
+
+    assert len(output_index) == 0
+    assert output_index.claim("view1.sql", "a.sales.view1") is None
+    assert output_index.claim("view1.sql", "a.sales.view1") is None
+    assert output_index.claim("view1.sql", "a.finance.view1") == "a.sales.view1"
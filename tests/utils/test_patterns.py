@@ -0,0 +1,38 @@
+"""ビュー名パターンユーティリティのテスト"""
+import re
+
+from bq2dbt.utils.patterns import (
+    compile_patterns,
+    is_simple_pattern,
+    match_any,
+    pattern_to_like,
+)
+
+
+def test_match_any_matches_each_pattern_like_single_match():
+    """まとめてコンパイルしたパターンが個別のマッチングと同じ結果になることをテスト"""
+    patterns = ("stg_*", "*_tmp", "dim.*", "fact_order|fact_item")
+    names = ["stg_orders", "orders_tmp", "dim_users", "fact_order", "fact_item", "x"]
+
+    for name in names:
+        expected = any(
+            re.match(f"^{p.replace('*', '.*')}$", name) is not None for p in patterns
+        )
+        assert match_any(name, patterns) is expected
+
+    assert match_any("anything", ()) is False
+
+
+def test_compile_patterns_is_cached():
+    """同じパターンの組み合わせは再コンパイルされないことをテスト"""
+    patterns = ("view_a*", "view_b*")
+
+    assert compile_patterns(patterns) is compile_patterns(patterns)
+
+
+def test_pattern_to_like():
+    """LIKEパターンへの変換とエスケープをテスト"""
+    assert is_simple_pattern("stg_*")
+    assert not is_simple_pattern("stg.*")
+    assert pattern_to_like("stg_*") == "stg\\_%"
+    assert pattern_to_like("*100%*") == "%100\\%%"
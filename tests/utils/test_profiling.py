@@ -0,0 +1,61 @@
+"""utils.profilingモジュールのテスト"""
+import json
+import logging
+
+from rich.console import Console
+
+from bq2dbt.converter.importer import report_profile
+from bq2dbt.utils.profiling import Profiler, profiled, profiler
+
+
+def test_profiler_summary():
+    """区間ごとの回数、合計、パーセンタイルの集計をテスト"""
+    target = Profiler()
+    target.enable()
+    for seconds in range(1, 21):
+        target.record("bigquery.get_table", seconds / 100)
+    target.record("generator.write", 0.5)
+
+    stats = {s.name: s for s in target.summary()}
+
+    assert list(stats) == ["bigquery.get_table", "generator.write"]
+    get_table = stats["bigquery.get_table"]
+    assert get_table.count == 20
+    assert round(get_table.total, 2) == 2.1
+    assert get_table.p50 == 0.1
+    assert get_table.p95 == 0.19
+    assert get_table.max == 0.2
+    assert stats["generator.write"].p95 == 0.5
+
+
+def test_profiler_disabled_records_nothing():
+    """無効なプロファイラーは区間を記録しないことをテスト"""
+    target = Profiler()
+
+    with target.span("import.list_views"):
+        pass
+
+    assert target.summary() == []
+
+
+def test_profiled_decorator_and_report(tmp_path):
+    """デコレーターで計測した区間がレポートに保存されることをテスト"""
+
+    @profiled("test.call")
+    def call(value):
+        return value * 2
+
+    profiler.enable()
+    try:
+        assert call(2) == 4
+        assert call(3) == 6
+    finally:
+        report_path = report_profile(
+            Console(quiet=True),
+            logging.getLogger("bq2dbt"),
+            tmp_path / "run.profile.json",
+        )
+
+    assert profiler.enabled is False
+    report = json.loads(report_path.read_text())
+    assert [(s["name"], s["count"]) for s in report["spans"]] == [("test.call", 2)]